@@ -3,14 +3,49 @@
 FastAPI server for Kotogram Japanese morphological analysis and grammar matching
 """
 
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any, Literal
 
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, WebSocket
+from fastapi.responses import JSONResponse, PlainTextResponse
+from loguru import logger
+from pydantic import BaseModel, ValidationError
+from pydantic_core import to_json
+from starlette.concurrency import run_in_threadpool
+from starlette.websockets import WebSocketDisconnect
 
 from kotogram.analyzer import KotogramAnalyzer
-from kotogram.grammar import GrammarMatchResult, RuleRegistry
+from kotogram.cache import TokenCache
+from kotogram.codec import CompactTokens
+from kotogram.grammar import (
+    GrammarMatchResult,
+    QueryMode,
+    RuleQueryResult,
+    RuleRegistry,
+)
+from kotogram.incremental import DocumentDiff, IncrementalDocument
+from kotogram.profiling import DEFAULT_INTERVAL, StackSampler
 from kotogram.token import KotogramToken
+from kotogram.tracing import InMemoryTracer, JsonLinesExporter, get_tracer, use_tracer
+
+
+class TracedJSONResponse(JSONResponse):
+    """JSON response that reports its rendering as a ``serialize`` span
+
+    Rendering uses pydantic's serializer, which is faster than the json module.
+    """
+
+    def render(self, content: Any) -> bytes:
+        with get_tracer().span("serialize", format="json"):
+            return to_json(content)
+
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -19,23 +54,231 @@ app = FastAPI(
     version="1.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=TracedJSONResponse,
 )
 
+# Directory rules are loaded from at startup and on reload
+RULES_DIR = "rules"
+
+# Environment variable holding the token that enables admin endpoints
+ADMIN_TOKEN_ENV = "KOTOGRAM_ADMIN_TOKEN"
+
+# Environment variable naming an SQLite file to cache tokenizations in, shared
+# by all workers and kept across restarts
+TOKEN_CACHE_ENV = "KOTOGRAM_TOKEN_CACHE"
+
+# Environment variable naming a JSON-lines file to append a trace of each
+# request's pipeline stages and rules to
+TRACE_FILE_ENV = "KOTOGRAM_TRACE_FILE"
+
+# Environment variables configuring the slow-request log: the threshold in
+# milliseconds, how many of the slowest rules and patterns to name, and a
+# JSON-lines file to capture slow inputs in for ``benchmark.py replay``
+SLOW_REQUEST_MS_ENV = "KOTOGRAM_SLOW_REQUEST_MS"
+SLOW_REQUEST_TOP_ENV = "KOTOGRAM_SLOW_REQUEST_TOP"
+REPLAY_FILE_ENV = "KOTOGRAM_REPLAY_FILE"
+
+# Longest profile /debug/profile takes
+MAX_PROFILE_SECONDS = 60.0
+
 # Initialize analyzer and rule registry
-analyzer = KotogramAnalyzer()
+token_cache_path = os.environ.get(TOKEN_CACHE_ENV)
+analyzer = KotogramAnalyzer(
+    cache=TokenCache(token_cache_path) if token_cache_path else None
+)
 rule_registry = RuleRegistry()
 
+# Incremented whenever a new rule set is swapped in
+rules_version = 1
+
 # Try to load rules from the rules directory if it exists
-rules_dir = Path("rules")
+rules_dir = Path(RULES_DIR)
 if rules_dir.exists() and rules_dir.is_dir():
     try:
-        rule_registry.load_rules_from_directory("rules")
+        rule_registry.load_rules_from_directory(RULES_DIR)
         print(f"Loaded {len(rule_registry.rules)} grammar rules")
     except Exception as e:
         print(f"Warning: Could not load grammar rules: {e}")
 else:
     print("Warning: No rules directory found. Grammar matching will not work.")
 
+# Requests match against the registry from worker threads concurrently
+rule_registry.freeze()
+
+
+class RequestTracer(InMemoryTracer):
+    """Tracer of one HTTP request, also holding the request's input
+
+    ``tokens`` and ``registry`` are what the request matched, if anything.
+    """
+
+    text: str | None = None
+    tokens: list[KotogramToken] | None = None
+    registry: RuleRegistry | None = None
+
+
+def capture_input(text: str):
+    """Remember the input of the current request for the slow-request log"""
+    tracer = get_tracer()
+    if isinstance(tracer, RequestTracer):
+        tracer.text = text
+
+
+def capture_match(tokens: list[KotogramToken], registry: RuleRegistry):
+    """Remember what the current request matched for the slow-request log"""
+    tracer = get_tracer()
+    if isinstance(tracer, RequestTracer):
+        tracer.tokens = tokens
+        tracer.registry = registry
+
+
+trace_file = os.environ.get(TRACE_FILE_ENV)
+trace_exporter = JsonLinesExporter(trace_file) if trace_file else None
+
+slow_request_ms = os.environ.get(SLOW_REQUEST_MS_ENV)
+slow_request_seconds = float(slow_request_ms) / 1000 if slow_request_ms else None
+slow_request_top = int(os.environ.get(SLOW_REQUEST_TOP_ENV, "5"))
+replay_file = os.environ.get(REPLAY_FILE_ENV)
+
+# Writes trace exports and slow-request logs, in order, off the event loop
+trace_output = ThreadPoolExecutor(
+    max_workers=1, thread_name_prefix="kotogram-trace-output"
+)
+
+
+def flush_trace_output():
+    """Wait until queued trace exports and slow-request logs are written"""
+    trace_output.submit(lambda: None).result()
+
+
+def profile_match(request_tracer: RequestTracer) -> InMemoryTracer:
+    """Match a request's tokens again, timing every rule and pattern
+
+    The tokens are matched against the same (possibly restricted) registry
+    the request used. Requests that matched nothing get an empty profile.
+    """
+    tracer = InMemoryTracer(pattern_spans=True)
+    if request_tracer.tokens is not None and request_tracer.registry is not None:
+        with use_tracer(tracer):
+            request_tracer.registry.find_all_matches(request_tracer.tokens)
+    return tracer
+
+
+def log_slow_request(
+    tracer: RequestTracer, method: str, path: str, status: int, seconds: float
+):
+    """Log where a slow request spent its time and capture its input
+
+    Requests are traced by stage only, so the rule and pattern breakdown
+    comes from matching the request's tokens again with per-rule spans.
+    """
+    text = tracer.text
+    input_hash = (
+        hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+        if text is not None
+        else None
+    )
+    counted = tracer.find("match") or tracer.find("convert")
+    token_count = counted[0].attributes.get("tokens") if counted else None
+    (request_span,) = tracer.find("request")
+    stages = [
+        f"{span.name}={span.duration * 1000:.2f}ms"
+        for span in tracer.children(request_span)
+    ]
+    profile = profile_match(tracer)
+    rules = [
+        f"{span.attributes['rule_id']}={span.duration * 1000:.2f}ms"
+        for span in profile.slowest("rule", slow_request_top)
+    ]
+    patterns = [
+        f"{span.attributes['rule_id']}#{span.attributes['index']}"
+        f"={span.duration * 1000:.2f}ms"
+        for span in profile.slowest("pattern", slow_request_top)
+    ]
+    logger.bind(
+        input_hash=input_hash,
+        stages=stages,
+        rules=rules,
+        patterns=patterns,
+        status=status,
+    ).warning(
+        "Slow request {} {}: {:.1f} ms, input {} ({} chars, {} tokens), "
+        "stages [{}], slowest rules [{}], slowest patterns [{}]",
+        method,
+        path,
+        seconds * 1000,
+        input_hash,
+        None if text is None else len(text),
+        token_count,
+        ", ".join(stages),
+        ", ".join(rules),
+        ", ".join(patterns),
+    )
+
+    if replay_file and text is not None:
+        record = {
+            "input_hash": input_hash,
+            "path": path,
+            "text": text,
+            "duration_ms": round(seconds * 1000, 3),
+            "time": time.time(),
+        }
+        with open(replay_file, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+class RequestTracingMiddleware:
+    """Traces HTTP requests when trace export or slow-request logging is on"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or (
+            trace_exporter is None and slow_request_seconds is None
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        # Per-rule spans slow matching down, so they are only collected for
+        # exported traces; the slow-request log times stages
+        tracer = RequestTracer(rule_spans=trace_exporter is not None)
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        with use_tracer(tracer):
+            with tracer.span("request") as span:
+                try:
+                    await self.app(scope, receive, send_with_status)
+                finally:
+                    span["status"] = status
+
+        (request_span,) = tracer.find("request")
+        method, path = scope["method"], scope["path"]
+        if trace_exporter is not None:
+            trace_output.submit(
+                trace_exporter.export,
+                tracer,
+                method=method,
+                path=path,
+                time=time.time(),
+            )
+        if (
+            slow_request_seconds is not None
+            and request_span.duration >= slow_request_seconds
+        ):
+            trace_output.submit(
+                log_slow_request, tracer, method, path, status, request_span.duration
+            )
+
+
+app.add_middleware(RequestTracingMiddleware)
+
 
 # Pydantic models for API requests and responses
 class ParseRequest(BaseModel):
@@ -47,16 +290,27 @@ class ParseResponse(BaseModel):
     tokens: list[KotogramToken]
 
 
-class MatchRequest(BaseModel):
+class RuleSelection(BaseModel):
+    """Optional restriction of matching to some categories or rules"""
+
+    categories: list[str] | None = None
+    rule_ids: list[str] | None = None
+
+
+class MatchRequest(RuleSelection):
     tokens: list[KotogramToken]
 
 
+class CompactMatchRequest(RuleSelection, CompactTokens):
+    pass
+
+
 class MatchResponse(BaseModel):
     tokens: list[KotogramToken]
     matches: list[GrammarMatchResult]
 
 
-class ParseAndMatchRequest(BaseModel):
+class ParseAndMatchRequest(RuleSelection):
     text: str
 
 
@@ -66,21 +320,114 @@ class ParseAndMatchResponse(BaseModel):
     matches: list[GrammarMatchResult]
 
 
+class QueryRequest(RuleSelection):
+    text: str
+    mode: QueryMode = "any"
+
+
+class QueryResponse(BaseModel):
+    text: str
+    mode: QueryMode
+    results: list[RuleQueryResult]
+
+
+class LiveEdit(BaseModel):
+    """Text edit sent over the live-analysis WebSocket"""
+
+    type: Literal["edit"] = "edit"
+    offset: int
+    delete_length: int = 0
+    insert_text: str = ""
+
+
+class LiveSetText(BaseModel):
+    """Full text replacement sent over the live-analysis WebSocket"""
+
+    type: Literal["set"]
+    text: str
+
+
+class LiveUpdate(BaseModel):
+    """Changes pushed back over the live-analysis WebSocket"""
+
+    type: Literal["update"] = "update"
+    version: int
+    rules_version: int
+    diff: DocumentDiff
+
+
+# Quiet period before queued live edits are analyzed together
+LIVE_DEBOUNCE_SECONDS = 0.05
+
+# Longest an edit waits for analysis while further edits keep arriving
+LIVE_MAX_LATENCY_SECONDS = 0.3
+
+
 class HealthResponse(BaseModel):
     status: str
     rules_loaded: int
+    rules_version: int
     available_rules: list[str]
 
 
+class ReloadResponse(BaseModel):
+    rules_loaded: int
+    rules_version: int
+
+
+class ProfileFunction(BaseModel):
+    function: str
+    own_samples: int
+    total_samples: int
+
+
+class ProfileResponse(BaseModel):
+    seconds: float
+    samples: int
+    functions: list[ProfileFunction]
+
+
+# Serializes reloads so rule sets are swapped in the order they were built
+reload_lock = asyncio.Lock()
+
+
+def require_admin(x_admin_token: str | None = Header(None)):
+    """Reject requests without the configured admin token"""
+    expected = os.environ.get(ADMIN_TOKEN_ENV)
+    if not expected:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled")
+    if x_admin_token is None or not hmac.compare_digest(x_admin_token, expected):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+def build_registry(directory: str) -> RuleRegistry:
+    """Load a rule set and check it against its examples"""
+    registry = RuleRegistry()
+    registry.load_rules_from_directory(directory)
+    failures = registry.validate_examples(analyzer)
+    if failures:
+        raise ValueError(f"Rule examples failed validation: {'; '.join(failures)}")
+    return registry.freeze()
+
+
+def select_rules(selection: RuleSelection) -> RuleRegistry:
+    """Get the registry restricted to a request's categories and rule IDs"""
+    try:
+        return rule_registry.subset(selection.categories, selection.rule_ids)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @app.post("/parse", response_model=ParseResponse)
 async def parse_text(request: ParseRequest):
     """Parse Japanese text into tokens"""
     try:
         if not request.text or not request.text.strip():
             raise HTTPException(status_code=400, detail="Text cannot be empty")
+        capture_input(request.text)
 
-        # Parse the text
-        tokens = analyzer.parse_text(request.text)
+        # Parse in a worker thread, keeping cache lookups off the event loop
+        tokens = await run_in_threadpool(analyzer.parse_text, request.text)
 
         return ParseResponse(text=request.text, tokens=tokens)
 
@@ -94,16 +441,55 @@ async def match_grammar(request: MatchRequest):
     try:
         if not request.tokens:
             raise HTTPException(status_code=400, detail="Tokens list cannot be empty")
+        capture_input("".join(token.surface for token in request.tokens))
 
-        # Match against grammar rules
-        matches = rule_registry.find_all_matches(request.tokens)
+        # Match against the selected grammar rules
+        registry = select_rules(request)
+        capture_match(request.tokens, registry)
+        matches = registry.find_all_matches(request.tokens)
 
         return MatchResponse(tokens=request.tokens, matches=matches)
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/match/compact", response_model=MatchResponse)
+async def match_grammar_compact(request: CompactMatchRequest):
+    """Match columnar-encoded tokens against grammar rules"""
+    try:
+        if not len(request):
+            raise HTTPException(status_code=400, detail="Tokens list cannot be empty")
+
+        # Decode straight into tokens without per-token validation
+        tokens = request.to_tokens()
+        capture_input("".join(token.surface for token in tokens))
+
+        # Match against the selected grammar rules
+        registry = select_rules(request)
+        capture_match(tokens, registry)
+        matches = registry.find_all_matches(tokens)
+
+        return MatchResponse(tokens=tokens, matches=matches)
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def parse_and_match_text(
+    text: str, registry: RuleRegistry
+) -> tuple[list[KotogramToken], list[GrammarMatchResult]]:
+    """Parse text and match it against a registry (thread-safe)"""
+    tokens = analyzer.parse_text(text)
+    return tokens, registry.find_all_matches(tokens)
+
+
 @app.post("/parse-and-match", response_model=ParseAndMatchResponse)
 async def parse_and_match(request: ParseAndMatchRequest):
     """Parse Japanese text into tokens and match against grammar rules"""
@@ -111,25 +497,252 @@ async def parse_and_match(request: ParseAndMatchRequest):
         if not request.text or not request.text.strip():
             raise HTTPException(status_code=400, detail="Text cannot be empty")
 
-        # Parse the text
-        tokens = analyzer.parse_text(request.text)
+        registry = select_rules(request)
+        capture_input(request.text)
 
-        # Match against grammar rules
-        matches = rule_registry.find_all_matches(tokens)
+        # Parse and match in a worker thread, keeping the event loop free
+        tokens, matches = await run_in_threadpool(
+            parse_and_match_text, request.text, registry
+        )
+        capture_match(tokens, registry)
 
         return ParseAndMatchResponse(text=request.text, tokens=tokens, matches=matches)
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/query", response_model=QueryResponse)
+async def query_grammar(request: QueryRequest):
+    """Check which grammar rules occur in text without building full matches"""
+    try:
+        if not request.text or not request.text.strip():
+            raise HTTPException(status_code=400, detail="Text cannot be empty")
+        registry = select_rules(request)
+        capture_input(request.text)
+
+        # Parse in a worker thread, keeping cache lookups off the event loop
+        tokens = await run_in_threadpool(analyzer.parse_text, request.text)
+
+        # Query the selected grammar rules
+        results = registry.query(tokens, request.mode)
+
+        return QueryResponse(text=request.text, mode=request.mode, results=results)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def rebuild_document(
+    previous: IncrementalDocument, registry: RuleRegistry, text: str
+) -> tuple[IncrementalDocument, DocumentDiff]:
+    """Analyze a live document from scratch against a reloaded rule set
+
+    The returned diff replaces every token and match of ``previous``.
+    """
+    document = IncrementalDocument(analyzer, registry, text)
+    return document, DocumentDiff(
+        token_start=0,
+        removed_token_count=len(previous.tokens),
+        added_tokens=document.tokens,
+        removed_matches=previous.matches,
+        added_matches=document.matches,
+    )
+
+
+@app.websocket("/ws/analyze")
+async def live_analysis(websocket: WebSocket):
+    """Analyze a document incrementally as edits arrive
+
+    Clients send ``edit`` messages (offset, delete_length, insert_text) or a
+    ``set`` message with the full text. Edits are applied to the pending text
+    immediately, while re-analysis waits until no edit has arrived for
+    ``LIVE_DEBOUNCE_SECONDS``, so a burst of keystrokes is coalesced into one
+    update containing only the changed tokens and matches. Continuous typing
+    still gets an update at least every ``LIVE_MAX_LATENCY_SECONDS``.
+
+    After the rules are reloaded, the next update replaces every token and
+    match the client holds with those of the new rule set.
+    """
+    await websocket.accept()
+    document = IncrementalDocument(analyzer, rule_registry)
+    document_rules_version = rules_version
+    pending_text = ""
+    version = 0
+    changed = asyncio.Event()
+
+    async def analyze():
+        nonlocal document, document_rules_version
+        loop = asyncio.get_running_loop()
+        analyzed_version = 0
+        while True:
+            await changed.wait()
+            # Wait until no edit has arrived for a quiet period, or until the
+            # first edit of the burst has waited the maximum latency
+            deadline = loop.time() + LIVE_MAX_LATENCY_SECONDS
+            while changed.is_set():
+                changed.clear()
+                timeout = min(LIVE_DEBOUNCE_SECONDS, deadline - loop.time())
+                if timeout <= 0:
+                    break
+                try:
+                    await asyncio.wait_for(changed.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+            if version == analyzed_version:
+                continue
+            analyzed_version = version
+            registry, registry_version = rule_registry, rules_version
+            try:
+                if registry_version != document_rules_version:
+                    document, diff = await run_in_threadpool(
+                        rebuild_document, document, registry, pending_text
+                    )
+                    document_rules_version = registry_version
+                else:
+                    diff = await run_in_threadpool(document.set_text, pending_text)
+            except Exception as e:
+                await websocket.send_json({"type": "error", "detail": str(e)})
+                continue
+            if diff.removed_token_count or diff.added_tokens:
+                update = LiveUpdate(
+                    version=analyzed_version,
+                    rules_version=document_rules_version,
+                    diff=diff,
+                )
+                await websocket.send_text(update.model_dump_json())
+
+    def report_failure(task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.opt(exception=task.exception()).error("Live analysis worker failed")
+
+    worker = asyncio.create_task(analyze())
+    worker.add_done_callback(report_failure)
+    try:
+        while True:
+            try:
+                message = json.loads(await websocket.receive_text())
+                if message.get("type") == "set":
+                    pending_text = LiveSetText.model_validate(message).text
+                else:
+                    edit = LiveEdit.model_validate(message)
+                    end = edit.offset + edit.delete_length
+                    if (
+                        edit.offset < 0
+                        or edit.delete_length < 0
+                        or end > len(pending_text)
+                    ):
+                        raise ValueError(
+                            f"Edit range {edit.offset}+{edit.delete_length} is "
+                            f"outside the document (length {len(pending_text)})"
+                        )
+                    pending_text = (
+                        pending_text[: edit.offset]
+                        + edit.insert_text
+                        + pending_text[end:]
+                    )
+            except (ValidationError, ValueError, AttributeError) as e:
+                # Also covers malformed JSON and JSON other than objects
+                await websocket.send_json({"type": "error", "detail": str(e)})
+                continue
+            except (KeyError, TypeError):
+                await websocket.send_json(
+                    {"type": "error", "detail": "Expected a JSON text frame"}
+                )
+                continue
+            version += 1
+            changed.set()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        worker.cancel()
+
+
+@app.post(
+    "/admin/reload-rules",
+    response_model=ReloadResponse,
+    dependencies=[Depends(require_admin)],
+)
+async def reload_rules():
+    """Load, validate and atomically swap in the rule set from disk
+
+    The new registry is built off the event loop while requests keep being
+    served. Requests already running finish with the registry they started
+    with, and the analyzer stays warm. A rule set that fails to load or to
+    match its own examples is rejected and the current one stays active.
+    """
+    global rule_registry, rules_version
+
+    async with reload_lock:
+        try:
+            registry = await run_in_threadpool(build_registry, RULES_DIR)
+        except (OSError, ValueError) as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        rule_registry = registry
+        rules_version += 1
+        return ReloadResponse(
+            rules_loaded=len(registry.rules), rules_version=rules_version
+        )
+
+
+# Only one profile runs at a time, since each one samples every thread
+profile_lock = asyncio.Lock()
+
+
+@app.get("/debug/profile", dependencies=[Depends(require_admin)])
+async def profile_worker(
+    seconds: float = Query(5.0, gt=0, le=MAX_PROFILE_SECONDS),
+    interval: float = Query(DEFAULT_INTERVAL, ge=0.001, le=1.0),
+    format: Literal["collapsed", "functions"] = "collapsed",
+    module: str = "kotogram",
+):
+    """Sample the stacks of this worker for a while and return the profile
+
+    Sampling runs in a background thread while requests keep being served.
+    Only stacks running code from modules under ``module`` are kept (all
+    stacks if empty). The default output is collapsed stacks for flame
+    graph tools.
+    """
+    if profile_lock.locked():
+        raise HTTPException(status_code=409, detail="A profile is already running")
+
+    async with profile_lock:
+        sampler = StackSampler(interval=interval, module_prefix=module)
+        sampler.start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            await run_in_threadpool(sampler.stop)
+
+    if format == "collapsed":
+        return PlainTextResponse(
+            sampler.collapsed(),
+            headers={"X-Profile-Samples": str(sampler.sample_count)},
+        )
+    return ProfileResponse(
+        seconds=seconds,
+        samples=sampler.sample_count,
+        functions=[
+            ProfileFunction(function=name, own_samples=own, total_samples=total)
+            for name, own, total in sampler.functions()
+        ],
+    )
+
+
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
     """Health check endpoint"""
+    registry = rule_registry
     return HealthResponse(
         status="healthy",
-        rules_loaded=len(rule_registry.rules),
-        available_rules=rule_registry.get_rule_names(),
+        rules_loaded=len(registry.rules),
+        rules_version=rules_version,
+        available_rules=registry.get_rule_names(),
     )
 
 
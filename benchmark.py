@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""Benchmark harness for Kotogram tokenization and matching"""
+
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from kotogram import (
+    InMemoryTracer,
+    IpadicTextBackend,
+    JanomeBackend,
+    KotogramAnalyzer,
+    MeCabBackend,
+    RegexMatcher,
+    RuleRegistry,
+    use_tracer,
+)
+from kotogram.backends import format_ipadic_line
+
+
+def load_sentences(input_path: str | None, rules_dir: str) -> list[str]:
+    """Load benchmark sentences from a file, or from the rules' examples"""
+    if input_path:
+        with open(input_path, "r", encoding="utf-8") as f:
+            return [line.strip() for line in f if line.strip()]
+
+    registry = RuleRegistry()
+    registry.load_rules_from_directory(rules_dir)
+    return [example for rule in registry.rules for example in rule.examples]
+
+
+def time_parse(analyzer: KotogramAnalyzer, inputs: list[str], repeat: int) -> dict:
+    """Parse every input ``repeat`` times and report throughput"""
+    token_count = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in inputs:
+            token_count += len(analyzer.parse_text(text))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "seconds": round(elapsed, 4),
+        "sentences_per_second": round(len(inputs) * repeat / elapsed, 1),
+        "tokens_per_second": round(token_count / elapsed, 1),
+    }
+
+
+def benchmark_backends(sentences: list[str], repeat: int) -> list[dict]:
+    """Compare tokenization throughput of the available backends"""
+    janome = JanomeBackend()
+    results = [
+        {
+            "backend": janome.name,
+            **time_parse(KotogramAnalyzer(janome), sentences, repeat),
+        }
+    ]
+
+    # Pre-tokenized input is prepared up front, as an external tokenizer would
+    pretokenized = [
+        "\n".join(format_ipadic_line(token) for token in janome.tokenize(sentence))
+        for sentence in sentences
+    ]
+    ipadic = IpadicTextBackend()
+    results.append(
+        {
+            "backend": ipadic.name,
+            **time_parse(KotogramAnalyzer(ipadic), pretokenized, repeat),
+        }
+    )
+
+    try:
+        mecab = MeCabBackend()
+    except ImportError:
+        print("Skipping mecab backend: mecab-python3 is not installed", file=sys.stderr)
+    else:
+        results.append(
+            {
+                "backend": mecab.name,
+                **time_parse(KotogramAnalyzer(mecab), sentences, repeat),
+            }
+        )
+
+    return results
+
+
+def gil_enabled() -> bool:
+    """Whether the interpreter runs with the GIL (always, before 3.13)"""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled() if is_gil_enabled is not None else True
+
+
+def benchmark_threads(
+    sentences: list[str], rules_dir: str, repeat: int, thread_counts: list[int]
+) -> list[dict]:
+    """Measure parse-and-match throughput with a shared analyzer and registry"""
+    analyzer = KotogramAnalyzer()
+    registry = RuleRegistry()
+    registry.load_rules_from_directory(rules_dir)
+    registry.freeze()
+
+    def parse_and_match(text: str) -> int:
+        return len(registry.find_all_matches(analyzer.parse_text(text)))
+
+    inputs = sentences * repeat
+    results = []
+    baseline = None
+    for threads in thread_counts:
+        # Each worker creates its tokenizer before the clock starts
+        with ThreadPoolExecutor(
+            max_workers=threads, initializer=analyzer.parse_text, initargs=("",)
+        ) as executor:
+            list(executor.map(parse_and_match, sentences[:threads]))
+            start = time.perf_counter()
+            list(executor.map(parse_and_match, inputs))
+            elapsed = time.perf_counter() - start
+
+        rate = len(inputs) / elapsed
+        baseline = baseline or rate
+        results.append(
+            {
+                "threads": threads,
+                "gil": gil_enabled(),
+                "seconds": round(elapsed, 4),
+                "sentences_per_second": round(rate, 1),
+                "speedup": round(rate / baseline, 2),
+            }
+        )
+
+    return results
+
+
+def benchmark_matchers(sentences: list[str], rules_dir: str, repeat: int) -> list[dict]:
+    """Compare the reference matcher with the regex matcher on tokenized input"""
+    analyzer = KotogramAnalyzer()
+    registry = RuleRegistry()
+    registry.load_rules_from_directory(rules_dir)
+    token_lists = [analyzer.parse_text(sentence) for sentence in sentences]
+
+    start = time.perf_counter()
+    regex_matcher = RegexMatcher(registry)
+    compile_seconds = time.perf_counter() - start
+
+    results = []
+    for name, matcher, setup in (
+        ("reference", registry, 0.0),
+        ("regex", regex_matcher, compile_seconds),
+    ):
+        match_count = 0
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for tokens in token_lists:
+                match_count += len(matcher.find_all_spans(tokens))
+        elapsed = time.perf_counter() - start
+        results.append(
+            {
+                "matcher": name,
+                "setup_seconds": round(setup, 4),
+                "seconds": round(elapsed, 4),
+                "sentences_per_second": round(len(token_lists) * repeat / elapsed, 1),
+                "matches": match_count // repeat,
+            }
+        )
+
+    return results
+
+
+def load_replay(replay_path: str) -> list[dict]:
+    """Load the inputs captured in a slow-request replay file"""
+    with open(replay_path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def benchmark_replay(records: list[dict], rules_dir: str, repeat: int) -> list[dict]:
+    """Re-run captured slow inputs and name their slowest rule and pattern"""
+    analyzer = KotogramAnalyzer()
+    registry = RuleRegistry()
+    registry.load_rules_from_directory(rules_dir)
+
+    results = []
+    for record in records:
+        # Time untraced runs, keeping the fastest
+        parse_seconds = match_seconds = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            tokens = analyzer.parse_text(record["text"])
+            parsed = time.perf_counter()
+            registry.find_all_matches(tokens)
+            matched = time.perf_counter()
+            parse_seconds = min(parse_seconds, parsed - start)
+            match_seconds = min(match_seconds, matched - parsed)
+
+        # One traced run attributes the matching time to rules and patterns
+        tracer = InMemoryTracer(pattern_spans=True)
+        with use_tracer(tracer):
+            registry.find_all_matches(tokens)
+        rule = next(iter(tracer.slowest("rule", 1)), None)
+        pattern = next(iter(tracer.slowest("pattern", 1)), None)
+        results.append(
+            {
+                "input_hash": record.get("input_hash"),
+                "chars": len(record["text"]),
+                "tokens": len(tokens),
+                "recorded_ms": record.get("duration_ms"),
+                "parse_ms": round(parse_seconds * 1000, 3),
+                "match_ms": round(match_seconds * 1000, 3),
+                "slowest_rule": rule and rule.attributes["rule_id"],
+                "slowest_pattern": pattern
+                and f"{pattern.attributes['rule_id']}#{pattern.attributes['index']}",
+            }
+        )
+
+    return results
+
+
+def print_table(results: list[dict]):
+    """Print benchmark results as an aligned table"""
+    columns = list(results[0])
+    widths = [
+        max(len(column), *(len(str(row[column])) for row in results))
+        for column in columns
+    ]
+    print("  ".join(c.ljust(w) for c, w in zip(columns, widths)).rstrip())
+    for row in results:
+        print("  ".join(str(row[c]).ljust(w) for c, w in zip(columns, widths)).rstrip())
+
+
+def main():
+    """Main function to run benchmarks"""
+    parser = argparse.ArgumentParser(description="Benchmark Kotogram throughput")
+    parser.add_argument(
+        "mode",
+        choices=["backends", "threads", "matchers", "replay"],
+        help="What to benchmark (backends: tokenizers, "
+        "threads: parse-and-match scaling with thread count, "
+        "matchers: reference and regex rule matching, "
+        "replay: inputs captured by the slow-request log)",
+    )
+    parser.add_argument(
+        "--input",
+        help="File with one sentence per line (default: rule examples), "
+        "or the replay file for replay mode",
+    )
+    parser.add_argument(
+        "--rules-dir", default="rules", help="Rules directory (default: rules)"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Passes over the sentences (default: 5)"
+    )
+    parser.add_argument(
+        "--threads",
+        default="1,2,4,8",
+        help="Comma-separated thread counts for threads mode (default: 1,2,4,8)",
+    )
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+
+    args = parser.parse_args()
+
+    if args.repeat < 1:
+        parser.error(f"--repeat must be at least 1: {args.repeat}")
+    needs_rules = args.mode in ("threads", "matchers", "replay") or not args.input
+    if needs_rules and not Path(args.rules_dir).is_dir():
+        parser.error(f"Rules directory not found: {args.rules_dir}")
+
+    records: list[dict] = []
+    sentences: list[str] = []
+    if args.mode == "replay":
+        if not args.input:
+            parser.error("Replay mode needs --input with a replay file")
+        records = load_replay(args.input)
+        if not records:
+            parser.error(f"No inputs in replay file: {args.input}")
+    else:
+        sentences = load_sentences(args.input, args.rules_dir)
+
+    if args.mode == "backends":
+        results = benchmark_backends(sentences, args.repeat)
+    elif args.mode == "threads":
+        try:
+            thread_counts = [int(count) for count in args.threads.split(",")]
+        except ValueError:
+            parser.error(f"Invalid thread counts: {args.threads}")
+        results = benchmark_threads(
+            sentences, args.rules_dir, args.repeat, thread_counts
+        )
+    elif args.mode == "matchers":
+        results = benchmark_matchers(sentences, args.rules_dir, args.repeat)
+    elif args.mode == "replay":
+        results = benchmark_replay(records, args.rules_dir, args.repeat)
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        if records:
+            print(f"{len(records)} replayed inputs x {args.repeat} passes")
+        else:
+            print(f"{len(sentences)} sentences x {args.repeat} passes")
+        print_table(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,50 @@
 #!/usr/bin/env python3
-"""Script to generate and save grammar rules to files"""
+"""Script to generate and save grammar rules to files
 
+Generation is incremental: ``rules/_manifest.json`` records a content hash of
+each rule's source and generated file, so unchanged rules are skipped and
+changed ones are rebuilt in parallel.
+"""
+
+import argparse
+import hashlib
 import importlib
 import json
 import pkgutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-from kotogram.grammar import RuleRegistry
+import kotogram
+from kotogram.analysis import RuleAnalysis, analyze_rule
+from kotogram.files import write_atomic
+from kotogram.grammar import (
+    PATTERN_LIBRARY_FILE,
+    GrammarRule,
+    TokenPattern,
+    dump_rule_with_refs,
+)
+from kotogram.patterns import CommonPatterns
+
+# Token count used for the worst-case cost column of the report
+REPORT_TOKEN_COUNT = 50
+
+# Hashes of rule sources and generated files, kept alongside the rules
+MANIFEST_FILE = "_manifest.json"
+MANIFEST_VERSION = 2
 
+# Besides a rule's own module, these sources shape every generated file
+TOOLCHAIN_SOURCES = [
+    Path(__file__),
+    *(
+        Path(kotogram.__file__).parent / name
+        for name in ("analysis.py", "grammar.py", "patterns.py", "types.py")
+    ),
+]
 
-def load_rules_from_files() -> RuleRegistry:
-    """Load all grammar rules from individual rule definition files"""
-    registry = RuleRegistry()
 
+def find_rule_modules() -> list[str]:
+    """Find the names of all rule definition modules"""
     # Import the rule_definitions package
     import rule_definitions
 
@@ -26,56 +58,313 @@ def load_rules_from_files() -> RuleRegistry:
 
     # Sort modules to ensure consistent loading order
     rule_modules.sort()
+    return rule_modules
 
-    print(f"Found {len(rule_modules)} rule definition files:")
 
-    for module_name in rule_modules:
-        try:
-            # Import the module
-            module = importlib.import_module(f"rule_definitions.{module_name}")
+def hash_bytes(data: bytes) -> str:
+    """Get the SHA-256 hex digest of some bytes"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def toolchain_hash() -> str:
+    """Hash the generator and the library code rule definitions build on"""
+    return hash_bytes(b"".join(path.read_bytes() for path in TOOLCHAIN_SOURCES))
+
+
+def source_hash(module_name: str, toolchain: str) -> str:
+    """Hash a rule definition module together with the toolchain"""
+    source = Path("rule_definitions") / f"{module_name}.py"
+    return hash_bytes(toolchain.encode("ascii") + source.read_bytes())
+
+
+def load_manifest(rules_dir: Path) -> dict:
+    """Load the manifest of the previous run, or an empty one"""
+    try:
+        with open(rules_dir / MANIFEST_FILE, "r", encoding="utf-8") as f:
+            manifest: dict = json.load(f)
+    except (OSError, ValueError):
+        return {"rules": {}}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {"rules": {}}
+    return manifest
+
+
+def is_current(path: Path, output_hash: str) -> bool:
+    """Check that a generated file exists and is unmodified"""
+    try:
+        return hash_bytes(path.read_bytes()) == output_hash
+    except OSError:
+        return False
+
+
+def build_pattern_library() -> dict[str, list[TokenPattern]]:
+    """Collect the named fragments defined on CommonPatterns"""
+    return {
+        name: value
+        for name, value in vars(CommonPatterns).items()
+        if isinstance(value, list)
+        and value
+        and all(isinstance(pattern, TokenPattern) for pattern in value)
+    }
+
+
+def save_pattern_library(
+    library: dict[str, list[TokenPattern]], rules_dir: Path
+) -> str:
+    """Save the shared fragments that rule files reference by name
+
+    Returns the hash of the library file.
+    """
+    library_data = {
+        name: [pattern.model_dump(mode="json") for pattern in patterns]
+        for name, patterns in library.items()
+    }
+    content = json.dumps(library_data, ensure_ascii=False, indent=2)
+    filepath = rules_dir / PATTERN_LIBRARY_FILE
+    output_hash = hash_bytes(content.encode("utf-8"))
+
+    if is_current(filepath, output_hash):
+        print(f"  Unchanged: {filepath} ({len(library)} fragments)")
+    else:
+        write_atomic(filepath, content)
+        print(f"  Saved: {filepath} ({len(library)} fragments)")
+    return output_hash
+
+
+def rule_filename(rule: GrammarRule) -> str:
+    """Get the JSON filename for a rule (category_index)"""
+    category = rule.category or "unknown"
+    return f"{category.lower()}_{rule.index:03d}.json"
+
+
+def build_rule(module_name: str) -> dict:
+    """Import a rule definition module, analyze the rule and render its file
+
+    Runs in worker processes, so failures are returned rather than raised.
+    """
+    try:
+        # Import the module
+        module = importlib.import_module(f"rule_definitions.{module_name}")
 
-            # Call the create_rule function
-            if hasattr(module, "create_rule"):
-                rule = module.create_rule()
-                registry.add_rule(rule)
-                print(f"  Loaded: {module_name} -> {rule.name}")
-            else:
-                print(f"  Warning: {module_name} does not have create_rule function")
+        # Call the create_rule function
+        if not hasattr(module, "create_rule"):
+            return {"error": f"{module_name} does not have create_rule function"}
+        rule = module.create_rule()
 
-        except Exception as e:
-            print(f"  Error loading {module_name}: {e}")
+        # Serialize rule, keeping CommonPatterns fragments as references
+        rule_data = dump_rule_with_refs(rule, build_pattern_library())
+        analysis = analyze_rule(rule)
+        return {
+            "rule": rule,
+            "analysis": analysis,
+            "report": summarize_analysis(rule, analysis),
+            "content": json.dumps(rule_data, ensure_ascii=False, indent=2),
+        }
 
-    return registry
+    except Exception as e:
+        return {"error": f"Error loading {module_name}: {e}"}
 
 
-def save_rules_to_files():
-    """Load all rules from definition files and save each to a separate JSON file"""
+def summarize_analysis(rule: GrammarRule, analysis: RuleAnalysis) -> dict:
+    """Condense a rule's analysis into its cost report entry
+
+    The entry is kept in the manifest, so unchanged rules are reported
+    without being rebuilt.
+    """
+    return {
+        "rule": f"{rule.category}_{rule.index:03d} {rule.name}",
+        "spans": [
+            f"{p.min_span}-{'*' if p.max_span is None else p.max_span}"
+            for p in analysis.patterns
+        ],
+        "cost": analysis.estimate_cost(REPORT_TOKEN_COUNT),
+        "errors": analysis.errors,
+        "warnings": analysis.warnings,
+    }
+
+
+def print_cost_report(reports: list[dict]):
+    """Print span bounds, worst-case cost and problems for every rule"""
+    print(f"\nRule cost report (worst case for {REPORT_TOKEN_COUNT} tokens):")
+    for report in reports:
+        print(
+            f"  {report['rule']}: spans [{', '.join(report['spans'])}], "
+            f"cost {report['cost']}"
+        )
+        for error in report["errors"]:
+            print(f"    Error: {error}")
+        for warning in report["warnings"]:
+            print(f"    Warning: {warning}")
+
+
+def check_builds(
+    pending: list[tuple[str, str]], builds: list[dict]
+) -> tuple[dict[str, dict], dict[str, str]]:
+    """Turn built rules into manifest entries, holding back failed ones
+
+    Returns the entries, with the rendered file under ``content``, and the
+    generated filename of each rule rejected by static analysis.
+    """
+    built: dict[str, dict] = {}
+    rejected: dict[str, str] = {}
+    for (module_name, module_hash), build in zip(pending, builds):
+        if "error" in build:
+            print(f"  {build['error']}")
+            continue
+        rule = build["rule"]
+        if build["analysis"].errors:
+            print(f"  Skipped: {rule.name} (failed static analysis)")
+            rejected[module_name] = rule_filename(rule)
+            continue
+        built[module_name] = {
+            "file": rule_filename(rule),
+            "source": module_hash,
+            "output": hash_bytes(build["content"].encode("utf-8")),
+            "report": build["report"],
+            "content": build["content"],
+        }
+    return built, rejected
+
+
+def save_rules_to_files(force: bool = False, workers: int | None = None):
+    """Rebuild the JSON files of changed rule definitions"""
     # Create rules directory
     rules_dir = Path("rules")
     rules_dir.mkdir(exist_ok=True)
 
-    # Load rules from definition files
-    registry = load_rules_from_files()
+    manifest = load_manifest(rules_dir)
+    previous = manifest["rules"]
+    toolchain = toolchain_hash()
 
-    print(f"\nGenerating {len(registry.rules)} rules...")
+    rule_modules = find_rule_modules()
+    print(f"Found {len(rule_modules)} rule definition files:")
 
-    for rule in registry.rules:
-        # Serialize rule
-        rule_data = rule.model_dump(mode="json")
+    library_hash = save_pattern_library(build_pattern_library(), rules_dir)
 
-        # Use category_index as filename
-        category = rule.category or "unknown"
-        filename = f"{category.lower()}_{rule.index:03d}.json"
-        filepath = rules_dir / filename
+    # Reuse entries whose source and generated file are both unchanged; a
+    # shadowed module's entry has no output, as its file belongs to another
+    entries: dict[str, dict] = {}
+    pending: list[tuple[str, str]] = []
+    for module_name in rule_modules:
+        module_hash = source_hash(module_name, toolchain)
+        entry = previous.get(module_name)
+        if (
+            not force
+            and entry is not None
+            and entry["source"] == module_hash
+            and (
+                entry["output"] is None
+                or is_current(rules_dir / entry["file"], entry["output"])
+            )
+        ):
+            entries[module_name] = entry
+        else:
+            pending.append((module_name, module_hash))
 
-        # Save to file
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(rule_data, f, ensure_ascii=False, indent=2)
+    print(f"\nRebuilding {len(pending)} changed rule(s), {len(entries)} unchanged...")
+    pending_names = [module_name for module_name, _ in pending]
+    if len(pending) > 1 and (workers is None or workers > 1):
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            builds = list(executor.map(build_rule, pending_names))
+    else:
+        builds = [build_rule(module_name) for module_name in pending_names]
 
+    # Report every rule, unchanged ones from their manifest entry, and
+    # refuse to ship pathological ones
+    reports = {module_name: entry["report"] for module_name, entry in entries.items()}
+    for (module_name, _), build in zip(pending, builds):
+        if "report" in build:
+            reports[module_name] = build["report"]
+    print_cost_report(
+        [reports[module_name] for module_name in rule_modules if module_name in reports]
+    )
+    built, rejected = check_builds(pending, builds)
+
+    # When two modules produce the same file, the later module's rule wins
+    owners: dict[str, str] = {}
+    for module_name in rule_modules:
+        entry = entries.get(module_name) or built.get(module_name)
+        if entry is not None:
+            owners[entry["file"]] = module_name
+
+    # Unchanged modules that lost their file to another are shadowed now
+    for module_name, entry in entries.items():
+        if owners[entry["file"]] != module_name and entry["output"] is not None:
+            print(f"  Shadowed: {module_name} (overridden by {owners[entry['file']]})")
+            entries[module_name] = {**entry, "output": None}
+
+    # A module shadowed last time whose file is now free has no file to reuse
+    promoted = [
+        (module_name, entries.pop(module_name)["source"])
+        for module_name in owners.values()
+        if module_name in entries and entries[module_name]["output"] is None
+    ]
+    if promoted:
+        promoted_built, promoted_rejected = check_builds(
+            promoted, [build_rule(module_name) for module_name, _ in promoted]
+        )
+        built.update(promoted_built)
+        rejected.update(promoted_rejected)
+
+    for module_name, entry in built.items():
+        filepath = rules_dir / entry["file"]
+        content = entry.pop("content")
+        if owners[entry["file"]] != module_name:
+            print(f"  Shadowed: {module_name} (overridden by {owners[entry['file']]})")
+            entries[module_name] = {**entry, "output": None}
+            continue
+        write_atomic(filepath, content)
+        entries[module_name] = entry
         print(f"  Saved: {filepath}")
 
+    # Remove files no module ships any more: those of deleted modules, and
+    # earlier versions of rules that now fail to build or are rejected
+    stale_files = {
+        entry["file"]
+        for module_name, entry in previous.items()
+        if module_name not in entries
+    } | set(rejected.values())
+    for filename in sorted(stale_files - set(owners)):
+        filepath = rules_dir / filename
+        if filepath.exists():
+            filepath.unlink()
+            print(f"  Removed: {filepath}")
+
+    write_atomic(
+        rules_dir / MANIFEST_FILE,
+        json.dumps(
+            {
+                "version": MANIFEST_VERSION,
+                "library": library_hash,
+                "rules": dict(sorted(entries.items())),
+            },
+            indent=2,
+        ),
+    )
+
     print(f"\nAll rules saved to {rules_dir}/ directory")
+    if rejected:
+        print(f"{len(rejected)} rule(s) rejected by static analysis")
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate rule JSON files from rule definitions"
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="Rebuild every rule, changed or not"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for rebuilding (default: one per CPU)",
+    )
+
+    args = parser.parse_args()
+    save_rules_to_files(force=args.force, workers=args.workers)
 
 
 if __name__ == "__main__":
-    save_rules_to_files()
+    main()
@@ -1,16 +1,38 @@
 """Kotogram - Japanese Morphological Analysis Package"""
 
 from .analyzer import KotogramAnalyzer
+from .backends import IpadicTextBackend, JanomeBackend, MeCabBackend, TokenizerBackend
+from .cache import TokenCache
+from .codec import CompactTokens
+from .corpus import Corpus, CorpusWriter
 from .grammar import (
     GrammarMatchResult,
     GrammarRule,
     GrammarRulePattern,
+    LiteralPositions,
+    MatchSpan,
+    MatchSpans,
+    PatternInterner,
     PatternMatchResult,
+    RuleQueryResult,
     RuleRegistry,
     TokenPattern,
 )
+from .incremental import DocumentDiff, DocumentMatch, IncrementalDocument
+from .index import CorpusIndex
 from .patterns import CommonPatterns
+from .profiling import StackSampler
+from .regex_backend import RegexMatcher
+from .regression import RegressionRunner
 from .token import KotogramToken
+from .tracing import (
+    InMemoryTracer,
+    JsonLinesExporter,
+    NullTracer,
+    TraceSpan,
+    get_tracer,
+    use_tracer,
+)
 from .types import InflectionForm, InflectionType, PartOfSpeech, POSDetailType
 
 __version__ = "0.1.0"
@@ -21,11 +43,37 @@ __all__ = [
     "InflectionType",
     "KotogramToken",
     "KotogramAnalyzer",
+    "TokenizerBackend",
+    "JanomeBackend",
+    "MeCabBackend",
+    "IpadicTextBackend",
+    "TokenCache",
     "TokenPattern",
     "GrammarRule",
     "GrammarRulePattern",
     "PatternMatchResult",
+    "PatternInterner",
     "GrammarMatchResult",
+    "LiteralPositions",
+    "MatchSpan",
+    "MatchSpans",
     "RuleRegistry",
+    "RuleQueryResult",
+    "RegexMatcher",
     "CommonPatterns",
+    "RegressionRunner",
+    "CompactTokens",
+    "Corpus",
+    "CorpusWriter",
+    "CorpusIndex",
+    "IncrementalDocument",
+    "DocumentMatch",
+    "DocumentDiff",
+    "NullTracer",
+    "InMemoryTracer",
+    "JsonLinesExporter",
+    "TraceSpan",
+    "get_tracer",
+    "use_tracer",
+    "StackSampler",
 ]
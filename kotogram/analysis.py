@@ -0,0 +1,156 @@
+"""Static analysis of grammar rules: span bounds, first-sets and cost estimates"""
+
+from pydantic import BaseModel, Field
+
+from .grammar import GrammarRule, GrammarRulePattern, TokenPattern
+
+
+class PatternAnalysis(BaseModel):
+    """Static properties of a single GrammarRulePattern"""
+
+    min_span: int = Field(..., description="Fewest tokens a match can span")
+    max_span: int | None = Field(
+        ..., description="Most tokens a match can span (None if unbounded)"
+    )
+    first_set: list[TokenPattern] = Field(
+        ..., description="Token patterns that can match the first token"
+    )
+    required_literals: list[list[str]] = Field(
+        ...,
+        description="Literal groups every match contains one value of, in order",
+    )
+    has_unbounded_wildcard: bool = Field(
+        ..., description="Whether the pattern contains an unbounded gap"
+    )
+    cost_per_position: int = Field(
+        ..., description="Worst-case predicate checks per start position"
+    )
+    wildcard_suffix_cost: int = Field(
+        0, description="Predicate checks repeated for every token a wildcard skips"
+    )
+
+    def estimate_cost(self, token_count: int) -> int:
+        """Estimate worst-case predicate checks over a sequence of tokens"""
+        cost = token_count * self.cost_per_position
+        if self.has_unbounded_wildcard:
+            # Every start position may retry the suffix at every later position
+            cost += token_count * (token_count + 1) // 2 * self.wildcard_suffix_cost
+        return cost
+
+
+class RuleAnalysis(BaseModel):
+    """Static properties of a GrammarRule and any problems found"""
+
+    rule_name: str = Field(..., description="Name of the analyzed rule")
+    patterns: list[PatternAnalysis] = Field(..., description="Per-pattern analysis")
+    errors: list[str] = Field(
+        default_factory=list, description="Problems that make the rule unusable"
+    )
+    warnings: list[str] = Field(
+        default_factory=list, description="Problems that make the rule expensive"
+    )
+
+    def estimate_cost(self, token_count: int) -> int:
+        """Estimate worst-case predicate checks for all patterns of the rule"""
+        return sum(pattern.estimate_cost(token_count) for pattern in self.patterns)
+
+
+def predicate_count(pattern: TokenPattern) -> int:
+    """Count the predicates evaluated to test one token against a pattern"""
+    return 1 + sum(predicate_count(alt) for alt in pattern.alternatives or [])
+
+
+def literal_values(pattern: TokenPattern) -> list[str] | None:
+    """Get the literal values a pattern accepts, or None if any branch has none"""
+    values = pattern._literal_values()
+    return None if values is None else list(values)
+
+
+def analyze_pattern(pattern: GrammarRulePattern) -> PatternAnalysis:
+    """Compute static properties of a pattern sequence"""
+    min_span, max_span = pattern.span_bounds()
+
+    first_set: list[TokenPattern] = []
+    for token_pattern in pattern.patterns:
+        first_set.append(token_pattern)
+        if token_pattern._is_gap():
+            # The pattern after an empty gap may also start the match
+            if token_pattern.span_bounds()[0] == 0:
+                continue
+            break
+        if not token_pattern.optional:
+            break
+
+    required_literals = []
+    for token_pattern in pattern.patterns:
+        if token_pattern.optional or token_pattern._is_gap():
+            continue
+        values = literal_values(token_pattern)
+        if values is not None:
+            required_literals.append(values)
+
+    has_wildcard = False
+    cost_per_position = 0
+    wildcard_suffix_cost = 0
+    # Patterns after a bounded gap are retried once per length the gap can take
+    retries = 1
+    for token_pattern in pattern.patterns:
+        if token_pattern._is_gap():
+            min_tokens, max_tokens = token_pattern.span_bounds()
+            stop_cost = sum(predicate_count(stop) for stop in token_pattern.stop or ())
+            if max_tokens is None:
+                has_wildcard = True
+                wildcard_suffix_cost += retries * stop_cost
+            else:
+                cost = retries * max_tokens * stop_cost
+                if has_wildcard:
+                    wildcard_suffix_cost += cost
+                else:
+                    cost_per_position += cost
+                retries *= max_tokens - min_tokens + 1
+        elif has_wildcard:
+            wildcard_suffix_cost += retries * predicate_count(token_pattern)
+        else:
+            cost_per_position += retries * predicate_count(token_pattern)
+
+    return PatternAnalysis(
+        min_span=min_span,
+        max_span=max_span,
+        first_set=first_set,
+        required_literals=required_literals,
+        has_unbounded_wildcard=has_wildcard,
+        cost_per_position=cost_per_position,
+        wildcard_suffix_cost=wildcard_suffix_cost,
+    )
+
+
+def analyze_rule(rule: GrammarRule) -> RuleAnalysis:
+    """Analyze every pattern of a rule and flag pathological ones"""
+    analyses = [analyze_pattern(pattern) for pattern in rule.patterns]
+    errors = []
+    warnings = []
+
+    if not rule.patterns:
+        errors.append("rule has no patterns")
+
+    for i, analysis in enumerate(analyses, 1):
+        if analysis.min_span == 0:
+            errors.append(f"pattern {i} can match zero tokens")
+        if not analysis.required_literals:
+            warnings.append(
+                f"pattern {i} has no required literal and may match broadly"
+            )
+        if analysis.has_unbounded_wildcard:
+            last = rule.patterns[i - 1].patterns[-1]
+            if last._is_multi_wildcard() and not last.stop:
+                errors.append(
+                    f"pattern {i} ends with a wildcard that consumes all tokens"
+                )
+            else:
+                warnings.append(
+                    f"pattern {i} has an unbounded wildcard (quadratic cost)"
+                )
+
+    return RuleAnalysis(
+        rule_name=rule.name, patterns=analyses, errors=errors, warnings=warnings
+    )
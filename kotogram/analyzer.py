@@ -1,16 +1,29 @@
 """Analyzers for Japanese morphological analysis"""
 
-from janome.tokenizer import Token, Tokenizer
-
+from .backends import JanomeBackend, RawToken, TokenizerBackend
+from .cache import TokenCache, tokenizer_version
 from .token import KotogramToken
+from .tracing import get_tracer
 from .types import InflectionForm, InflectionType, PartOfSpeech, POSDetailType
 
 
 class KotogramAnalyzer:
-    """Japanese morphological analysis class using Janome"""
+    """Japanese morphological analysis class using Janome by default
+
+    Any ``TokenizerBackend`` producing IPADIC-style tokens can be used
+    instead, e.g. MeCab or pre-tokenized MeCab output. With a ``TokenCache``,
+    texts tokenized before, by any process sharing the cache, are not
+    tokenized again.
+    """
 
-    def __init__(self):
-        self.tokenizer = Tokenizer()
+    def __init__(
+        self,
+        backend: TokenizerBackend | None = None,
+        cache: TokenCache | None = None,
+    ):
+        self.backend = backend if backend is not None else JanomeBackend()
+        self.cache = cache
+        self.tokenizer_version = tokenizer_version(self.backend)
 
     @staticmethod
     def parse_detail_type(value: str) -> POSDetailType:
@@ -44,8 +57,8 @@ class KotogramAnalyzer:
         except ValueError:
             raise ValueError(f"Unknown part of speech: '{value}'")
 
-    def _parse_token(self, token: Token) -> KotogramToken:
-        """Parse a Janome token directly into a KotogramToken"""
+    def _parse_token(self, token: RawToken) -> KotogramToken:
+        """Parse a backend token (or Janome token) directly into a KotogramToken"""
         # Parse part of speech and details from the comma-separated string
         pos_parts = token.part_of_speech.split(",")
 
@@ -64,16 +77,32 @@ class KotogramAnalyzer:
 
     def parse_text(self, text: str) -> list[KotogramToken]:
         """Analyze text and return list of tokens"""
-        tokens = []
-        for token in self.tokenizer.tokenize(text):
-            # Skip whitespace tokens
-            if token.surface.strip() == "":
-                continue
+        tracer = get_tracer()
+        if self.cache is not None:
+            with tracer.span("cache_lookup") as span:
+                cached = self.cache.get(self.tokenizer_version, text)
+                span["hit"] = cached is not None
+            if cached is not None:
+                return cached
+
+        with tracer.span("tokenize", backend=self.backend.name):
+            raw_tokens = list(self.backend.tokenize(text))
+
+        with tracer.span("convert") as span:
+            tokens = []
+            for token in raw_tokens:
+                # Skip whitespace tokens
+                if token.surface.strip() == "":
+                    continue
 
-            # Parse Janome token directly into KotogramToken
-            parsed_token = self._parse_token(token)
-            tokens.append(parsed_token)
+                # Parse backend token directly into KotogramToken
+                parsed_token = self._parse_token(token)
+                tokens.append(parsed_token)
+            span["tokens"] = len(tokens)
 
+        if self.cache is not None:
+            with tracer.span("cache_store"):
+                self.cache.put(self.tokenizer_version, text, tokens)
         return tokens
 
     def print_tokens(self, tokens: list[KotogramToken]):
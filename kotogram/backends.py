@@ -0,0 +1,162 @@
+"""Tokenizer backends producing IPADIC-style tokens for KotogramAnalyzer
+
+Backends may be shared between threads: tokenizers that are not safe for
+concurrent use are created per thread.
+"""
+
+import threading
+from collections.abc import Iterable, Iterator
+from typing import NamedTuple, Protocol, runtime_checkable
+
+import janome
+from janome.tokenizer import Tokenizer
+
+# Placeholder IPADIC uses for features that do not apply
+IPADIC_EMPTY = "*"
+
+
+class RawToken(NamedTuple):
+    """Token as IPADIC features, with the attribute names of a Janome token"""
+
+    surface: str
+    part_of_speech: str  # Four comma-separated fields, e.g. "名詞,一般,*,*"
+    infl_type: str
+    infl_form: str
+    base_form: str
+    reading: str
+    phonetic: str
+
+
+@runtime_checkable
+class TokenizerBackend(Protocol):
+    """Source of IPADIC-style tokens for text
+
+    Tokens only need the attributes of ``RawToken``, so Janome tokens can be
+    passed through without copying.
+    """
+
+    name: str
+
+    # Backends may also set ``dictionary_version``, identifying the dictionary
+    # that determines their output, so cached tokenizations are invalidated
+
+    def tokenize(self, text: str) -> Iterable[RawToken]:
+        """Split text into tokens"""
+        ...
+
+
+def parse_ipadic_line(line: str) -> RawToken:
+    """Parse one ``surface<TAB>features`` line of MeCab/IPADIC output"""
+    surface, separator, features = line.partition("\t")
+    if not separator:
+        raise ValueError(f"Expected a tab-separated IPADIC line: '{line}'")
+
+    fields = features.split(",")
+    if len(fields) < 7:
+        raise ValueError(f"Expected at least 7 IPADIC features: '{line}'")
+    # Unknown words have no reading or pronunciation
+    fields += [IPADIC_EMPTY] * (9 - len(fields))
+
+    return RawToken(
+        surface=surface,
+        part_of_speech=",".join(fields[:4]),
+        infl_type=fields[4],
+        infl_form=fields[5],
+        # Unknown words have no base form; Janome uses the surface instead
+        base_form=surface if fields[6] == IPADIC_EMPTY else fields[6],
+        reading=fields[7],
+        phonetic=fields[8],
+    )
+
+
+def parse_ipadic_output(output: str) -> Iterator[RawToken]:
+    """Parse MeCab/IPADIC output, skipping EOS markers and blank lines"""
+    for line in output.splitlines():
+        if line and line != "EOS":
+            yield parse_ipadic_line(line)
+
+
+def format_ipadic_line(token: RawToken) -> str:
+    """Format a token as one line of MeCab/IPADIC output"""
+    # A comma cannot appear in a feature; such words are unknown words whose
+    # base form is their surface, which the parser restores from "*"
+    base_form = IPADIC_EMPTY if "," in token.base_form else token.base_form
+    return (
+        f"{token.surface}\t{token.part_of_speech},{token.infl_type},"
+        f"{token.infl_form},{base_form},{token.reading},{token.phonetic}"
+    )
+
+
+class JanomeBackend:
+    """Pure-Python tokenizer backed by Janome (the default)"""
+
+    name = "janome"
+    # Janome bundles its IPADIC build
+    dictionary_version = janome.__version__
+
+    def __init__(self):
+        self._local = threading.local()
+        # Load the dictionary up front for the creating thread
+        self._local.tokenizer = Tokenizer()
+
+    @property
+    def tokenizer(self) -> Tokenizer:
+        """The calling thread's Janome tokenizer, created on first use"""
+        tokenizer = getattr(self._local, "tokenizer", None)
+        if tokenizer is None:
+            tokenizer = self._local.tokenizer = Tokenizer()
+        return tokenizer
+
+    def tokenize(self, text: str) -> Iterable[RawToken]:
+        tokens: Iterable[RawToken] = self.tokenizer.tokenize(text)
+        return tokens
+
+
+class MeCabBackend:
+    """Tokenizer backed by MeCab with an IPADIC dictionary
+
+    Requires the optional ``mecab-python3`` package and a system IPADIC
+    dictionary.
+    """
+
+    name = "mecab"
+
+    def __init__(self, tagger_args: str = ""):
+        try:
+            import MeCab
+        except ImportError as e:
+            raise ImportError(
+                "MeCabBackend requires mecab-python3: pip install mecab-python3"
+            ) from e
+        self._tagger_class = MeCab.Tagger
+        self._tagger_args = tagger_args
+        self._local = threading.local()
+        self._local.tagger = MeCab.Tagger(tagger_args)
+        dictionary = self._local.tagger.dictionary_info()
+        self.dictionary_version = (
+            f"{MeCab.VERSION}-{dictionary.filename}-{dictionary.version}"
+        )
+
+    @property
+    def tagger(self):
+        """The calling thread's MeCab tagger, created on first use"""
+        tagger = getattr(self._local, "tagger", None)
+        if tagger is None:
+            tagger = self._local.tagger = self._tagger_class(self._tagger_args)
+        return tagger
+
+    def tokenize(self, text: str) -> Iterable[RawToken]:
+        return parse_ipadic_output(self.tagger.parse(text))
+
+
+class IpadicTextBackend:
+    """Backend for pre-tokenized input in MeCab/IPADIC text format
+
+    The "text" passed to ``tokenize`` is the output of an external
+    tokenizer, one ``surface<TAB>features`` line per token.
+    """
+
+    name = "ipadic-text"
+
+    def tokenize(self, text: str) -> Iterable[RawToken]:
+        return parse_ipadic_output(text)
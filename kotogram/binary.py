@@ -0,0 +1,288 @@
+"""MessagePack-compatible binary encoding implemented with the standard library
+
+Used to store token cache entries. Only the subset of MessagePack needed
+for JSON-like payloads is supported: nil,
+booleans, integers (up to 64 bits), float64, str, bin, arrays and maps.
+Anything produced here can be read by any MessagePack implementation, and
+``unpackb`` additionally accepts float32 values written by other encoders.
+"""
+
+import struct
+from collections.abc import Callable
+from typing import Any
+
+# Deepest nesting of arrays and maps unpackb accepts
+MAX_DEPTH = 64
+
+_pack_uint16 = struct.Struct(">BH").pack
+_pack_uint32 = struct.Struct(">BI").pack
+_pack_uint64 = struct.Struct(">BQ").pack
+_pack_int8 = struct.Struct(">Bb").pack
+_pack_int16 = struct.Struct(">Bh").pack
+_pack_int32 = struct.Struct(">Bi").pack
+_pack_int64 = struct.Struct(">Bq").pack
+_pack_float64 = struct.Struct(">Bd").pack
+
+# Decoders of the fixed-size values following a type code: (unpack_from, size)
+_FIXED_VALUES = {
+    code: (struct.Struct(fmt).unpack_from, struct.calcsize(fmt))
+    for code, fmt in {
+        0xCA: ">f",
+        0xCB: ">d",
+        0xCC: ">B",
+        0xCD: ">H",
+        0xCE: ">I",
+        0xCF: ">Q",
+        0xD0: ">b",
+        0xD1: ">h",
+        0xD2: ">i",
+        0xD3: ">q",
+    }.items()
+}
+_unpack_uint8 = _FIXED_VALUES[0xCC][0]
+_unpack_uint16 = _FIXED_VALUES[0xCD][0]
+_unpack_uint32 = _FIXED_VALUES[0xCE][0]
+
+# Strings shorter than this are encoded and decoded once per call, since
+# payloads repeat the same keys and enum labels for every token
+_CACHED_STR_LENGTH = 32
+
+
+def _header(length: int, fix: int, fix_limit: int, wide: int) -> bytes:
+    """Encode a str/array/map header: fix form, then 16/32-bit length forms
+
+    ``wide`` is the 16-bit type code; the 32-bit code always follows it.
+    """
+    if length < fix_limit:
+        return bytes((fix | length,))
+    if length < 0x10000:
+        return _pack_uint16(wide, length)
+    if length < 0x100000000:
+        return _pack_uint32(wide + 1, length)
+    raise ValueError(f"Object too large to encode: {length}")
+
+
+def _pack_int(obj: int) -> bytes:
+    if 0 <= obj < 0x80:
+        return bytes((obj,))
+    if -32 <= obj < 0:
+        return bytes((obj & 0xFF,))
+    if obj >= 0:
+        if obj < 0x100:
+            return bytes((0xCC, obj))
+        if obj < 0x10000:
+            return _pack_uint16(0xCD, obj)
+        if obj < 0x100000000:
+            return _pack_uint32(0xCE, obj)
+        if obj < 0x10000000000000000:
+            return _pack_uint64(0xCF, obj)
+        raise ValueError(f"Integer too large to encode: {obj}")
+    if obj >= -0x80:
+        return _pack_int8(0xD0, obj)
+    if obj >= -0x8000:
+        return _pack_int16(0xD1, obj)
+    if obj >= -0x80000000:
+        return _pack_int32(0xD2, obj)
+    if obj >= -0x8000000000000000:
+        return _pack_int64(0xD3, obj)
+    raise ValueError(f"Integer too small to encode: {obj}")
+
+
+def _pack_str(obj: str) -> bytes:
+    data = obj.encode("utf-8")
+    if 32 <= len(data) < 0x100:
+        return bytes((0xD9, len(data))) + data
+    return _header(len(data), 0xA0, 32, 0xDA) + data
+
+
+class _Packer:
+    """Single-pass encoder into a bytearray"""
+
+    def __init__(self):
+        self.out = bytearray()
+        self._strings: dict[str, bytes] = {}
+
+    def pack(self, obj: Any) -> None:
+        # Exact type checks first: they are the common case and cheaper than
+        # isinstance, and bool is not mistaken for int
+        kind = type(obj)
+        if kind is str:
+            encoded = self._strings.get(obj)
+            if encoded is None:
+                encoded = _pack_str(obj)
+                if len(obj) < _CACHED_STR_LENGTH:
+                    self._strings[obj] = encoded
+            self.out += encoded
+        elif kind is dict:
+            self._map(obj)
+        elif kind is list or kind is tuple:
+            self._array(obj)
+        elif kind is int:
+            self.out += _pack_int(obj)
+        elif obj is None:
+            self.out.append(0xC0)
+        elif obj is True:
+            self.out.append(0xC3)
+        elif obj is False:
+            self.out.append(0xC2)
+        elif isinstance(obj, float):
+            self.out += _pack_float64(0xCB, obj)
+        elif isinstance(obj, (bytes, bytearray, memoryview)):
+            data = bytes(obj)
+            if len(data) < 0x100:
+                self.out += bytes((0xC4, len(data)))
+            else:
+                self.out += _header(len(data), 0, 0, 0xC5)
+            self.out += data
+        # Subclasses, such as str enums, take the slower path
+        elif isinstance(obj, str):
+            self.out += _pack_str(obj)
+        elif isinstance(obj, int):
+            self.out += _pack_int(obj)
+        elif isinstance(obj, (list, tuple)):
+            self._array(obj)
+        elif isinstance(obj, dict):
+            self._map(obj)
+        else:
+            raise TypeError(f"Cannot encode object of type {type(obj).__name__}")
+
+    def _array(self, obj: list | tuple) -> None:
+        self.out += _header(len(obj), 0x90, 16, 0xDC)
+        pack = self.pack
+        for item in obj:
+            pack(item)
+
+    def _map(self, obj: dict) -> None:
+        self.out += _header(len(obj), 0x80, 16, 0xDE)
+        pack = self.pack
+        for key, value in obj.items():
+            pack(key)
+            pack(value)
+
+
+def packb(obj: Any) -> bytes:
+    """Encode a JSON-compatible object (plus bytes) as MessagePack"""
+    packer = _Packer()
+    packer.pack(obj)
+    return bytes(packer.out)
+
+
+class _Unpacker:
+    """Single-pass decoder over a bytes buffer"""
+
+    def __init__(self, data: bytes, max_depth: int = MAX_DEPTH):
+        self.data = bytes(data)
+        self.pos = 0
+        self.depth = 0
+        self.max_depth = max_depth
+        self._strings: dict[bytes, str] = {}
+
+    def _take(self, size: int) -> bytes:
+        start = self.pos
+        end = start + size
+        if end > len(self.data):
+            raise ValueError("Truncated MessagePack data")
+        self.pos = end
+        return self.data[start:end]
+
+    def _fixed(self, code: int) -> Any:
+        unpack_from, size = _FIXED_VALUES[code]
+        return self._unpack_from(unpack_from, size)
+
+    def _unpack_from(self, unpack_from: Callable, size: int) -> Any:
+        start = self.pos
+        if start + size > len(self.data):
+            raise ValueError("Truncated MessagePack data")
+        self.pos = start + size
+        return unpack_from(self.data, start)[0]
+
+    def _str(self, length: int) -> str:
+        raw = self._take(length)
+        if length >= _CACHED_STR_LENGTH:
+            return raw.decode("utf-8")
+        text = self._strings.get(raw)
+        if text is None:
+            text = self._strings[raw] = raw.decode("utf-8")
+        return text
+
+    def _enter(self):
+        self.depth += 1
+        if self.depth > self.max_depth:
+            raise ValueError(f"MessagePack data nested deeper than {self.max_depth}")
+
+    def _array(self, length: int) -> list:
+        self._enter()
+        unpack = self.unpack
+        result = [unpack() for _ in range(length)]
+        self.depth -= 1
+        return result
+
+    def _map(self, length: int) -> dict:
+        self._enter()
+        unpack = self.unpack
+        # Keys are evaluated before their values
+        result = {unpack(): unpack() for _ in range(length)}
+        self.depth -= 1
+        return result
+
+    def unpack(self) -> Any:
+        pos = self.pos
+        if pos >= len(self.data):
+            raise ValueError("Truncated MessagePack data")
+        code = self.data[pos]
+        self.pos = pos + 1
+        # Fix forms, by far the most common, are decoded first
+        if code < 0x80:
+            return code
+        if code >= 0xE0:
+            return code - 0x100
+        if code >= 0xA0:
+            if code <= 0xBF:
+                return self._str(code & 0x1F)
+        elif code >= 0x90:
+            return self._array(code & 0x0F)
+        else:
+            return self._map(code & 0x0F)
+        if code == 0xC0:
+            return None
+        if code == 0xC2:
+            return False
+        if code == 0xC3:
+            return True
+        if code in _FIXED_VALUES:
+            return self._fixed(code)
+        if code == 0xD9:
+            return self._str(self._unpack_from(_unpack_uint8, 1))
+        if code == 0xDA:
+            return self._str(self._unpack_from(_unpack_uint16, 2))
+        if code == 0xDB:
+            return self._str(self._unpack_from(_unpack_uint32, 4))
+        if code == 0xC4:
+            return self._take(self._unpack_from(_unpack_uint8, 1))
+        if code == 0xC5:
+            return self._take(self._unpack_from(_unpack_uint16, 2))
+        if code == 0xC6:
+            return self._take(self._unpack_from(_unpack_uint32, 4))
+        if code == 0xDC:
+            return self._array(self._unpack_from(_unpack_uint16, 2))
+        if code == 0xDD:
+            return self._array(self._unpack_from(_unpack_uint32, 4))
+        if code == 0xDE:
+            return self._map(self._unpack_from(_unpack_uint16, 2))
+        if code == 0xDF:
+            return self._map(self._unpack_from(_unpack_uint32, 4))
+        raise ValueError(f"Unsupported MessagePack type code: 0x{code:02x}")
+
+
+def unpackb(data: bytes) -> Any:
+    """Decode a single MessagePack object"""
+    unpacker = _Unpacker(data)
+    try:
+        result = unpacker.unpack()
+    except UnicodeDecodeError as e:
+        raise ValueError(f"Invalid UTF-8 in MessagePack string: {e}")
+    except TypeError as e:
+        raise ValueError(f"Invalid MessagePack map key: {e}")
+    if unpacker.pos != len(unpacker.data):
+        raise ValueError("Trailing data after MessagePack object")
+    return result
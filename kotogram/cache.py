@@ -0,0 +1,152 @@
+"""Persistent tokenization cache shared between processes
+
+Tokenized texts are stored in an SQLite database in WAL mode, so any number
+of processes (e.g. uvicorn workers) can read and write the same cache file
+concurrently, and hits survive restarts. Entries are keyed by a hash of the
+text and the tokenizer version, and hold the MessagePack encoding of their
+``CompactTokens``.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+from .backends import TokenizerBackend
+from .binary import packb, unpackb
+from .codec import CompactTokens
+from .token import KotogramToken
+
+PACKAGE_DIR = Path(__file__).parent
+
+# Modules that determine how backend output becomes tokens
+TOKENIZER_SOURCES = ("analyzer.py", "backends.py", "codec.py", "token.py", "types.py")
+
+# Seconds to wait for another process's write to finish. Lookups run on the
+# request path, so the wait is short and a busy database counts as a miss
+DEFAULT_TIMEOUT = 0.1
+
+
+def tokenizer_version(backend: TokenizerBackend | type[TokenizerBackend]) -> str:
+    """Identify a backend, its dictionary and the token conversion code
+
+    A backend class can stand in for an instance when its dictionary version
+    is a class attribute, as for ``JanomeBackend``.
+    """
+    digest = hashlib.sha256()
+    for name in TOKENIZER_SOURCES:
+        digest.update((PACKAGE_DIR / name).read_bytes())
+    dictionary = getattr(backend, "dictionary_version", "")
+    return f"{backend.name}-{dictionary}-{digest.hexdigest()[:12]}"
+
+
+class TokenCache:
+    """SQLite cache of tokenized texts, safe for concurrent processes and threads
+
+    Each thread uses its own connection. Caching is best effort: a lookup or
+    write that cannot get the database lock within ``timeout`` seconds is
+    treated as a miss or dropped, and an entry that cannot be decoded is
+    deleted and reported as a miss.
+    """
+
+    def __init__(self, path: str | os.PathLike, timeout: float = DEFAULT_TIMEOUT):
+        self.path = Path(path)
+        self.timeout = timeout
+        self._local = threading.local()
+        # Connections of all threads, so close() can reach every one; closing
+        # starts a new generation, making threads reconnect on next use
+        self._connections: list[sqlite3.Connection] = []
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # WAL mode is stored in the database, so setting it once is enough
+        connection = self.connection
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS tokens "
+            "(key BLOB PRIMARY KEY, tokens BLOB NOT NULL) WITHOUT ROWID"
+        )
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """The calling thread's connection, opened on first use"""
+        connection: sqlite3.Connection
+        if getattr(self._local, "generation", None) != self._generation:
+            # Only this thread uses the connection, but close() may be called
+            # from another
+            connection = sqlite3.connect(
+                self.path,
+                timeout=self.timeout,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            # Commits in WAL mode stay durable against crashes of the process
+            connection.execute("PRAGMA synchronous=NORMAL")
+            with self._lock:
+                self._connections.append(connection)
+                self._local.generation = self._generation
+            self._local.connection = connection
+            return connection
+        connection = self._local.connection
+        return connection
+
+    def __enter__(self) -> "TokenCache":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+    def __len__(self) -> int:
+        (count,) = self.connection.execute("SELECT COUNT(*) FROM tokens").fetchone()
+        return int(count)
+
+    @staticmethod
+    def _key(version: str, text: str) -> bytes:
+        return hashlib.sha256(f"{version}\0{text}".encode("utf-8")).digest()
+
+    def get(self, version: str, text: str) -> list[KotogramToken] | None:
+        """Get the cached tokens of a text, if present"""
+        key = self._key(version, text)
+        try:
+            row = self.connection.execute(
+                "SELECT tokens FROM tokens WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.OperationalError:
+            # The database stayed locked; tokenize instead of waiting longer
+            return None
+        if row is None:
+            return None
+        try:
+            return CompactTokens.model_construct(**unpackb(row[0])).to_tokens()
+        except (ValueError, TypeError, KeyError, IndexError):
+            # A corrupt entry is dropped, so the text is cached again
+            try:
+                self.connection.execute("DELETE FROM tokens WHERE key = ?", (key,))
+            except sqlite3.OperationalError:
+                pass
+            return None
+
+    def put(self, version: str, text: str, tokens: list[KotogramToken]):
+        """Cache the tokens of a text"""
+        data = packb(CompactTokens.from_tokens(tokens).model_dump())
+        try:
+            self.connection.execute(
+                "INSERT OR IGNORE INTO tokens (key, tokens) VALUES (?, ?)",
+                (self._key(version, text), data),
+            )
+        except sqlite3.OperationalError:
+            # The database stayed locked by other writers; skip this entry
+            pass
+
+    def clear(self):
+        """Remove all cached tokens"""
+        self.connection.execute("DELETE FROM tokens")
+
+    def close(self):
+        """Close the connections of all threads"""
+        with self._lock:
+            connections, self._connections = self._connections, []
+            self._generation += 1
+        for connection in connections:
+            connection.close()
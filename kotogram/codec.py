@@ -0,0 +1,116 @@
+"""Compact columnar encoding for token sequences"""
+
+from pydantic import BaseModel, Field
+
+from .token import KotogramToken
+from .types import InflectionForm, InflectionType, PartOfSpeech, POSDetailType
+
+# Ordinal tables (position in the enum definition, aliases excluded).
+# New enum members must only ever be appended to keep ordinals stable.
+PART_OF_SPEECH_ORDER: tuple[PartOfSpeech, ...] = tuple(PartOfSpeech)
+POS_DETAIL_ORDER: tuple[POSDetailType, ...] = tuple(POSDetailType)
+INFLECTION_TYPE_ORDER: tuple[InflectionType, ...] = tuple(InflectionType)
+INFLECTION_FORM_ORDER: tuple[InflectionForm, ...] = tuple(InflectionForm)
+
+PART_OF_SPEECH_ORDINAL = {v: i for i, v in enumerate(PART_OF_SPEECH_ORDER)}
+POS_DETAIL_ORDINAL = {v: i for i, v in enumerate(POS_DETAIL_ORDER)}
+INFLECTION_TYPE_ORDINAL = {v: i for i, v in enumerate(INFLECTION_TYPE_ORDER)}
+INFLECTION_FORM_ORDINAL = {v: i for i, v in enumerate(INFLECTION_FORM_ORDER)}
+
+
+class CompactTokens(BaseModel):
+    """Columnar token sequence: parallel enum ordinal arrays plus a string table
+
+    String columns hold indices into ``strings``; enum columns hold ordinals
+    into the ``*_ORDER`` tables of this module.
+    """
+
+    strings: list[str] = Field(..., description="Interned string table")
+    surface: list[int] = Field(..., description="Surface form string indices")
+    part_of_speech: list[int] = Field(..., description="Part of speech ordinals")
+    pos_detail1: list[int] = Field(..., description="Detail 1 ordinals")
+    pos_detail2: list[int] = Field(..., description="Detail 2 ordinals")
+    pos_detail3: list[int] = Field(..., description="Detail 3 ordinals")
+    infl_type: list[int] = Field(..., description="Inflection type ordinals")
+    infl_form: list[int] = Field(..., description="Inflection form ordinals")
+    base_form: list[int] = Field(..., description="Base form string indices")
+    reading: list[int] = Field(..., description="Reading string indices")
+    phonetic: list[int] = Field(..., description="Pronunciation string indices")
+
+    @classmethod
+    def from_tokens(cls, tokens: list[KotogramToken]) -> "CompactTokens":
+        """Encode a token list into columnar form"""
+        string_ids: dict[str, int] = {}
+
+        def intern(value: str) -> int:
+            index = string_ids.get(value)
+            if index is None:
+                index = string_ids[value] = len(string_ids)
+            return index
+
+        return cls.model_construct(
+            surface=[intern(t.surface) for t in tokens],
+            part_of_speech=[PART_OF_SPEECH_ORDINAL[t.part_of_speech] for t in tokens],
+            pos_detail1=[POS_DETAIL_ORDINAL[t.pos_detail1] for t in tokens],
+            pos_detail2=[POS_DETAIL_ORDINAL[t.pos_detail2] for t in tokens],
+            pos_detail3=[POS_DETAIL_ORDINAL[t.pos_detail3] for t in tokens],
+            infl_type=[INFLECTION_TYPE_ORDINAL[t.infl_type] for t in tokens],
+            infl_form=[INFLECTION_FORM_ORDINAL[t.infl_form] for t in tokens],
+            base_form=[intern(t.base_form) for t in tokens],
+            reading=[intern(t.reading) for t in tokens],
+            phonetic=[intern(t.phonetic) for t in tokens],
+            strings=list(string_ids),
+        )
+
+    def __len__(self) -> int:
+        return len(self.surface)
+
+    def to_tokens(self) -> list[KotogramToken]:
+        """Decode into tokens without running per-token model validation"""
+        count = len(self.surface)
+        columns = (
+            self.part_of_speech,
+            self.pos_detail1,
+            self.pos_detail2,
+            self.pos_detail3,
+            self.infl_type,
+            self.infl_form,
+            self.base_form,
+            self.reading,
+            self.phonetic,
+        )
+        if any(len(column) != count for column in columns):
+            raise ValueError("All token columns must have the same length")
+        if count and min(min(column) for column in (self.surface, *columns)) < 0:
+            raise ValueError("Token column contains an out-of-range index")
+
+        strings = self.strings
+        try:
+            return [
+                KotogramToken.model_construct(
+                    surface=strings[surface],
+                    part_of_speech=PART_OF_SPEECH_ORDER[pos],
+                    pos_detail1=POS_DETAIL_ORDER[detail1],
+                    pos_detail2=POS_DETAIL_ORDER[detail2],
+                    pos_detail3=POS_DETAIL_ORDER[detail3],
+                    infl_type=INFLECTION_TYPE_ORDER[infl_type],
+                    infl_form=INFLECTION_FORM_ORDER[infl_form],
+                    base_form=strings[base_form],
+                    reading=strings[reading],
+                    phonetic=strings[phonetic],
+                )
+                for (
+                    surface,
+                    pos,
+                    detail1,
+                    detail2,
+                    detail3,
+                    infl_type,
+                    infl_form,
+                    base_form,
+                    reading,
+                    phonetic,
+                ) in zip(self.surface, *columns)
+            ]
+        except IndexError:
+            raise ValueError("Token column contains an out-of-range index")
@@ -0,0 +1,394 @@
+"""Memory-mapped columnar storage for tokenized corpora
+
+A corpus file stores ``parse_text`` output for many sentences once, so rules
+can be re-run over it without tokenizing again. Token fields are stored as
+columns: enum ordinals (from ``codec``) as bytes and strings as indices into
+an interned string table. Reading maps the file and exposes tokens as
+zero-copy ``TokenView`` objects the matcher accepts in place of tokens.
+
+Layout (little-endian, every section aligned to 8 bytes)::
+
+    header            magic, version, sentence/token/string counts
+    sentence starts   uint64[sentences + 1]  token offset of each sentence
+    text offsets      uint64[sentences + 1]  byte offset of each sentence text
+    string offsets    uint64[strings + 1]    byte offset of each string
+    string columns    uint32[tokens] x 4     surface, base form, reading,
+                                             pronunciation
+    enum columns      uint8[tokens] x 6      part of speech, details 1-3,
+                                             inflection type and form
+    string data       UTF-8
+    text data         UTF-8
+"""
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Iterable, Iterator
+from typing import Literal, cast
+
+from .analyzer import KotogramAnalyzer
+from .codec import (
+    INFLECTION_FORM_ORDER,
+    INFLECTION_FORM_ORDINAL,
+    INFLECTION_TYPE_ORDER,
+    INFLECTION_TYPE_ORDINAL,
+    PART_OF_SPEECH_ORDER,
+    PART_OF_SPEECH_ORDINAL,
+    POS_DETAIL_ORDER,
+    POS_DETAIL_ORDINAL,
+)
+from .grammar import QueryMode, RuleQueryResult, RuleRegistry
+from .token import KotogramToken
+from .types import InflectionForm, InflectionType, PartOfSpeech, POSDetailType
+
+CORPUS_MAGIC = b"KTGC"
+CORPUS_VERSION = 1
+
+# Magic, version, sentence count, token count, string count
+HEADER = struct.Struct("<4sIQQQ")
+
+STRING_COLUMNS = ("surface", "base_form", "reading", "phonetic")
+ENUM_COLUMNS = (
+    "part_of_speech",
+    "pos_detail1",
+    "pos_detail2",
+    "pos_detail3",
+    "infl_type",
+    "infl_form",
+)
+
+
+def _padding(size: int) -> int:
+    """Bytes needed to align a section of the given size to 8 bytes"""
+    return -size % 8
+
+
+class CorpusWriter:
+    """Accumulates tokenized sentences and writes them as a corpus file
+
+    The file is written to a temporary path and moved into place on close,
+    so readers never see a partial corpus.
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = os.fspath(path)
+        self._string_ids: dict[str, int] = {}
+        self._sentence_starts = array("Q", [0])
+        self._text_offsets = array("Q", [0])
+        self._texts: list[bytes] = []
+        self._string_columns = {name: array("I") for name in STRING_COLUMNS}
+        self._enum_columns = {name: array("B") for name in ENUM_COLUMNS}
+
+    def __enter__(self) -> "CorpusWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.close()
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def _intern(self, value: str) -> int:
+        index = self._string_ids.get(value)
+        if index is None:
+            index = self._string_ids[value] = len(self._string_ids)
+        return index
+
+    def add(self, text: str, tokens: list[KotogramToken]):
+        """Append one sentence and its tokens"""
+        columns = self._string_columns
+        for token in tokens:
+            columns["surface"].append(self._intern(token.surface))
+            columns["base_form"].append(self._intern(token.base_form))
+            columns["reading"].append(self._intern(token.reading))
+            columns["phonetic"].append(self._intern(token.phonetic))
+
+        enums = self._enum_columns
+        enums["part_of_speech"].extend(
+            PART_OF_SPEECH_ORDINAL[t.part_of_speech] for t in tokens
+        )
+        enums["pos_detail1"].extend(POS_DETAIL_ORDINAL[t.pos_detail1] for t in tokens)
+        enums["pos_detail2"].extend(POS_DETAIL_ORDINAL[t.pos_detail2] for t in tokens)
+        enums["pos_detail3"].extend(POS_DETAIL_ORDINAL[t.pos_detail3] for t in tokens)
+        enums["infl_type"].extend(INFLECTION_TYPE_ORDINAL[t.infl_type] for t in tokens)
+        enums["infl_form"].extend(INFLECTION_FORM_ORDINAL[t.infl_form] for t in tokens)
+
+        encoded = text.encode("utf-8")
+        self._texts.append(encoded)
+        self._text_offsets.append(self._text_offsets[-1] + len(encoded))
+        self._sentence_starts.append(self._sentence_starts[-1] + len(tokens))
+
+    def close(self):
+        """Write the corpus file"""
+        if sys.byteorder != "little":
+            raise RuntimeError("Corpus files can only be written on little-endian")
+
+        encoded_strings = [value.encode("utf-8") for value in self._string_ids]
+        string_offsets = array("Q", [0])
+        for encoded in encoded_strings:
+            string_offsets.append(string_offsets[-1] + len(encoded))
+
+        sections: list[bytes] = [
+            self._sentence_starts.tobytes(),
+            self._text_offsets.tobytes(),
+            string_offsets.tobytes(),
+            *(self._string_columns[name].tobytes() for name in STRING_COLUMNS),
+            *(self._enum_columns[name].tobytes() for name in ENUM_COLUMNS),
+            b"".join(encoded_strings),
+            b"".join(self._texts),
+        ]
+
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(
+                HEADER.pack(
+                    CORPUS_MAGIC,
+                    CORPUS_VERSION,
+                    len(self._texts),
+                    self._sentence_starts[-1],
+                    len(encoded_strings),
+                )
+            )
+            f.write(b"\0" * _padding(HEADER.size))
+            for section in sections:
+                f.write(section)
+                f.write(b"\0" * _padding(len(section)))
+        os.replace(temp_path, self.path)
+
+
+def build_corpus(
+    path: str | os.PathLike, sentences: Iterable[str], analyzer: KotogramAnalyzer
+) -> int:
+    """Tokenize sentences and write them as a corpus file
+
+    Returns the number of sentences written.
+    """
+    with CorpusWriter(path) as writer:
+        for sentence in sentences:
+            writer.add(sentence, analyzer.parse_text(sentence))
+    return len(writer)
+
+
+class TokenView:
+    """Read-only token backed by a corpus file's columns
+
+    Provides the same fields as ``KotogramToken``, decoded on access, so it
+    can be matched against rules without building token objects.
+    """
+
+    __slots__ = ("_corpus", "_index")
+
+    def __init__(self, corpus: "Corpus", index: int):
+        self._corpus = corpus
+        self._index = index
+
+    def __repr__(self) -> str:
+        return f"TokenView({self.surface!r})"
+
+    @property
+    def surface(self) -> str:
+        return self._corpus.string(self._corpus._surface[self._index])
+
+    @property
+    def part_of_speech(self) -> PartOfSpeech:
+        return PART_OF_SPEECH_ORDER[self._corpus._part_of_speech[self._index]]
+
+    @property
+    def pos_detail1(self) -> POSDetailType:
+        return POS_DETAIL_ORDER[self._corpus._pos_detail1[self._index]]
+
+    @property
+    def pos_detail2(self) -> POSDetailType:
+        return POS_DETAIL_ORDER[self._corpus._pos_detail2[self._index]]
+
+    @property
+    def pos_detail3(self) -> POSDetailType:
+        return POS_DETAIL_ORDER[self._corpus._pos_detail3[self._index]]
+
+    @property
+    def infl_type(self) -> InflectionType:
+        return INFLECTION_TYPE_ORDER[self._corpus._infl_type[self._index]]
+
+    @property
+    def infl_form(self) -> InflectionForm:
+        return INFLECTION_FORM_ORDER[self._corpus._infl_form[self._index]]
+
+    @property
+    def base_form(self) -> str:
+        return self._corpus.string(self._corpus._base_form[self._index])
+
+    @property
+    def reading(self) -> str:
+        return self._corpus.string(self._corpus._reading[self._index])
+
+    @property
+    def phonetic(self) -> str:
+        return self._corpus.string(self._corpus._phonetic[self._index])
+
+    def to_token(self) -> KotogramToken:
+        """Materialize the view as a KotogramToken"""
+        return KotogramToken.model_construct(
+            surface=self.surface,
+            part_of_speech=self.part_of_speech,
+            pos_detail1=self.pos_detail1,
+            pos_detail2=self.pos_detail2,
+            pos_detail3=self.pos_detail3,
+            infl_type=self.infl_type,
+            infl_form=self.infl_form,
+            base_form=self.base_form,
+            reading=self.reading,
+            phonetic=self.phonetic,
+        )
+
+
+class Corpus:
+    """Memory-mapped, read-only view of a corpus file"""
+
+    # Token columns, indexed by corpus-wide token index: string columns hold
+    # string indices and enum columns ordinals
+    _surface: memoryview
+    _base_form: memoryview
+    _reading: memoryview
+    _phonetic: memoryview
+    _part_of_speech: memoryview
+    _pos_detail1: memoryview
+    _pos_detail2: memoryview
+    _pos_detail3: memoryview
+    _infl_type: memoryview
+    _infl_form: memoryview
+
+    def __init__(self, path: str | os.PathLike):
+        if sys.byteorder != "little":
+            raise RuntimeError("Corpus files can only be read on little-endian")
+
+        self.path = os.fspath(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views: list[memoryview] = []
+
+        try:
+            self._map_sections()
+        except Exception:
+            self.close()
+            raise
+
+    def _map_sections(self):
+        """Locate every section and expose it as a typed memoryview"""
+        if len(self._mmap) < HEADER.size:
+            raise ValueError(f"Not a corpus file: {self.path}")
+        magic, version, sentence_count, token_count, string_count = HEADER.unpack_from(
+            self._mmap
+        )
+        if magic != CORPUS_MAGIC:
+            raise ValueError(f"Not a corpus file: {self.path}")
+        if version != CORPUS_VERSION:
+            raise ValueError(f"Unsupported corpus version {version}: {self.path}")
+
+        buffer = memoryview(self._mmap)
+        self._views.append(buffer)
+        position = HEADER.size + _padding(HEADER.size)
+
+        def section(size: int, format: Literal["Q", "I"] | None = None) -> memoryview:
+            nonlocal position
+            if position + size > len(buffer):
+                raise ValueError(f"Truncated corpus file: {self.path}")
+            view = buffer[position : position + size]
+            if format is not None:
+                view = view.cast(format)
+            self._views.append(view)
+            position += size + _padding(size)
+            return view
+
+        self._sentence_starts = section(8 * (sentence_count + 1), "Q")
+        self._text_offsets = section(8 * (sentence_count + 1), "Q")
+        self._string_offsets = section(8 * (string_count + 1), "Q")
+        self._columns = {name: section(4 * token_count, "I") for name in STRING_COLUMNS}
+        for name in ENUM_COLUMNS:
+            self._columns[name] = section(token_count)
+        # Token views read the columns as attributes
+        for name, column in self._columns.items():
+            setattr(self, f"_{name}", column)
+        self._string_data = section(self._string_offsets[-1])
+        self._text_data = section(self._text_offsets[-1])
+
+        self._token_count: int = token_count
+        # Strings are decoded on first use
+        self._strings: list[str | None] = [None] * string_count
+
+    def __enter__(self) -> "Corpus":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+    def close(self):
+        """Release the memory map; views obtained from it become invalid"""
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        self._mmap.close()
+
+    def __len__(self) -> int:
+        return len(self._sentence_starts) - 1
+
+    @property
+    def token_count(self) -> int:
+        """Total number of tokens in the corpus"""
+        return self._token_count
+
+    @property
+    def string_count(self) -> int:
+        """Number of strings in the interned string table"""
+        return len(self._strings)
+
+    def column(self, name: str) -> memoryview:
+        """Get a token column by name (one of ``STRING_COLUMNS`` or
+        ``ENUM_COLUMNS``), indexed by corpus-wide token index"""
+        try:
+            return self._columns[name]
+        except KeyError:
+            raise ValueError(f"Unknown corpus column: {name}")
+
+    def string(self, index: int) -> str:
+        """Get an interned string by index"""
+        value = self._strings[index]
+        if value is None:
+            start, end = self._string_offsets[index], self._string_offsets[index + 1]
+            value = self._strings[index] = str(self._string_data[start:end], "utf-8")
+        return value
+
+    def text(self, sentence: int) -> str:
+        """Get the original text of a sentence"""
+        start, end = self._text_offsets[sentence], self._text_offsets[sentence + 1]
+        return str(self._text_data[start:end], "utf-8")
+
+    def token_range(self, sentence: int) -> range:
+        """Get the corpus-wide token indices of a sentence"""
+        return range(
+            self._sentence_starts[sentence], self._sentence_starts[sentence + 1]
+        )
+
+    def views(self, sentence: int) -> list[TokenView]:
+        """Get zero-copy token views for a sentence"""
+        return [TokenView(self, index) for index in self.token_range(sentence)]
+
+    def tokens(self, sentence: int) -> list[KotogramToken]:
+        """Get the tokens of a sentence as KotogramToken objects"""
+        return [view.to_token() for view in self.views(sentence)]
+
+    def query(
+        self, registry: RuleRegistry, mode: QueryMode = "any"
+    ) -> Iterator[tuple[int, list[RuleQueryResult]]]:
+        """Run a rule query over every sentence without tokenizing
+
+        Yields the sentence index and results for sentences with a match.
+        """
+        for sentence in range(len(self)):
+            # Token views provide every field matching reads
+            views = cast(list[KotogramToken], self.views(sentence))
+            results = registry.query(views, mode)
+            if results:
+                yield sentence, results
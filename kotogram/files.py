@@ -0,0 +1,14 @@
+"""Helpers for files written by kotogram and its scripts"""
+
+import os
+from pathlib import Path
+
+
+def write_atomic(path: str | os.PathLike, content: str):
+    """Write a text file through a temporary file so readers never see
+    partial data"""
+    path = Path(path)
+    temp_path = path.with_name(f"{path.name}.tmp")
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(temp_path, path)
@@ -1,16 +1,30 @@
 """Grammar rule matching system for Japanese patterns"""
 
+import hashlib
 import json
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator, Sequence
+from operator import attrgetter
 from pathlib import Path
+from typing import Literal, NamedTuple
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 
+from .analyzer import KotogramAnalyzer
 from .token import KotogramToken
+from .tracing import get_tracer
 from .types import InflectionForm, InflectionType, PartOfSpeech, POSDetailType
 
 
 class TokenPattern(BaseModel):
-    """Pattern for matching individual tokens"""
+    """Pattern for matching individual tokens
+
+    Token patterns are immutable and hashable by structure, so identical
+    patterns can be shared between rules (see ``PatternInterner``).
+    """
+
+    model_config = ConfigDict(frozen=True)
 
     # Value that matches either surface form or base form
     value: str | None = Field(
@@ -37,23 +51,67 @@ class TokenPattern(BaseModel):
         None, description="Inflection form to match"
     )
 
-    # Alternative patterns (list of TokenPattern objects)
-    alternatives: list["TokenPattern"] | None = Field(
+    # Alternative patterns (sequence of TokenPattern objects)
+    alternatives: tuple["TokenPattern", ...] | None = Field(
         None, description="Alternative patterns"
     )
 
     # Whether this pattern is optional
     optional: bool = Field(False, description="Whether this pattern is optional")
 
+    # Gap bounds: a pattern without token constraints matches a run of tokens,
+    # of any length unless bounded here
+    min_tokens: int | None = Field(
+        None, ge=0, description="Fewest tokens a gap matches (default 0)"
+    )
+    max_tokens: int | None = Field(
+        None, ge=0, description="Most tokens a gap matches (None if unbounded)"
+    )
+
+    # Tokens a gap may not contain, e.g. sentence-ending punctuation
+    stop: tuple["TokenPattern", ...] | None = Field(
+        None, description="Patterns of tokens a gap stops at"
+    )
+
+    _pattern_id: str = PrivateAttr("")
+
+    def model_post_init(self, __context) -> None:
+        """Validate gap settings and derive the stable pattern ID"""
+        if (
+            self.min_tokens is not None
+            or self.max_tokens is not None
+            or self.stop is not None
+        ):
+            if not self._is_gap():
+                raise ValueError(
+                    "min_tokens, max_tokens and stop only apply to gap patterns "
+                    "without token constraints"
+                )
+            min_tokens, max_tokens = self.span_bounds()
+            if max_tokens is not None and max_tokens < min_tokens:
+                raise ValueError(
+                    f"Gap max_tokens ({max_tokens}) is less than min_tokens "
+                    f"({min_tokens})"
+                )
+
+        digest = hashlib.sha256(self.model_dump_json().encode("utf-8"))
+        self._pattern_id = digest.hexdigest()[:12]
+
+    @property
+    def pattern_id(self) -> str:
+        """Stable identifier derived from the pattern's structure"""
+        return self._pattern_id
+
     def matches(self, token: KotogramToken) -> bool:
         """Check if token matches this pattern"""
         # Check if pattern is optional (always matches)
         if self.optional and self._is_empty_pattern():
             return True
 
-        # Check if this is a multi-wildcard (all fields are None)
-        if self._is_multi_wildcard():
-            return True
+        # Check if this is a gap (all fields are None), which accepts any
+        # token except its stop tokens
+        if self._is_gap():
+            return not self._is_stop(token)
 
         # Check alternatives first
         if self.alternatives:
@@ -75,8 +133,8 @@ class TokenPattern(BaseModel):
             and not self.alternatives
         )
 
-    def _is_multi_wildcard(self) -> bool:
-        """Check if this is a multi-wildcard pattern (all fields are None)"""
+    def _is_gap(self) -> bool:
+        """Check if this is a gap matching a run of tokens (all fields are None)"""
         return (
             self.value is None
             and self.part_of_speech is None
@@ -87,6 +145,36 @@ class TokenPattern(BaseModel):
             and not self.optional
         )
 
+    def _is_multi_wildcard(self) -> bool:
+        """Check if this is an unbounded gap, e.g. the bare ``TokenPattern()``"""
+        return self._is_gap() and self.max_tokens is None
+
+    def _literal_values(self) -> tuple[str, ...] | None:
+        """Get the literal values this pattern accepts, or None if any
+        branch accepts tokens without one"""
+        if self.value is None:
+            return None
+        values = [self.value]
+        for alt in self.alternatives or ():
+            alt_values = alt._literal_values()
+            if alt_values is None:
+                return None
+            values.extend(alt_values)
+        return tuple(values)
+
+    def _is_stop(self, token: KotogramToken) -> bool:
+        """Check if a gap must stop before this token"""
+        return self.stop is not None and any(stop.matches(token) for stop in self.stop)
+
+    def span_bounds(self) -> tuple[int, int | None]:
+        """Get the (min, max) number of tokens this pattern can consume
+
+        The maximum is None when the pattern is unbounded.
+        """
+        if self._is_gap():
+            return self.min_tokens or 0, self.max_tokens
+        return (0 if self.optional else 1), 1
+
     def _matches_main_pattern(self, token: KotogramToken) -> bool:
         """Check if token matches the main pattern (all non-None fields must match)"""
         # Check value (matches either surface or base form)
@@ -125,6 +213,37 @@ class TokenPattern(BaseModel):
 TokenPattern.model_rebuild()
 
 
+class PatternInterner:
+    """Maps structurally equal TokenPatterns to one shared instance"""
+
+    def __init__(self):
+        self._patterns: dict[TokenPattern, TokenPattern] = {}
+        self._by_id: dict[str, TokenPattern] = {}
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def intern(self, pattern: TokenPattern) -> TokenPattern:
+        """Get the canonical instance for a pattern, registering it if new"""
+        canonical = self._patterns.get(pattern)
+        if canonical is not None:
+            return canonical
+
+        # Canonicalize alternatives first so nested patterns are shared too
+        if pattern.alternatives:
+            alternatives = tuple(self.intern(alt) for alt in pattern.alternatives)
+            if any(a is not b for a, b in zip(alternatives, pattern.alternatives)):
+                pattern = pattern.model_copy(update={"alternatives": alternatives})
+
+        self._patterns[pattern] = pattern
+        self._by_id[pattern.pattern_id] = pattern
+        return pattern
+
+    def get(self, pattern_id: str) -> TokenPattern | None:
+        """Look up a canonical pattern by its stable ID"""
+        return self._by_id.get(pattern_id)
+
+
 class PatternMatchResult(BaseModel):
     """Result of a pattern match"""
 
@@ -154,6 +273,94 @@ class GrammarMatchResult(BaseModel):
         return self.rule.description
 
 
+class MatchSpan(NamedTuple):
+    """A match as positions into a shared token sequence, without copying it"""
+
+    rule_id: str
+    pattern_index: int  # Index of the rule pattern that matched
+    start: int
+    end: int
+
+
+class MatchSpans:
+    """Match spans of a registry, with the token sequence they index into"""
+
+    __slots__ = ("tokens", "spans")
+
+    def __init__(self, tokens: list[KotogramToken], spans: list[MatchSpan]):
+        self.tokens = tokens
+        self.spans = spans
+
+    def __len__(self) -> int:
+        return len(self.spans)
+
+    def __iter__(self) -> Iterator[MatchSpan]:
+        return iter(self.spans)
+
+    def matched_tokens(self, span: MatchSpan) -> list[KotogramToken]:
+        """Get the tokens a span covers"""
+        return self.tokens[span.start : span.end]
+
+
+# Short-circuit query modes: whether a rule matches, where it first matches,
+# or how many times it matches
+QueryMode = Literal["any", "first", "count"]
+
+
+class RuleQueryResult(BaseModel):
+    """Answer to a query for one matching rule"""
+
+    rule_id: str = Field(..., description="ID of the matched rule")
+    rule_name: str = Field(..., description="Name of the matched rule")
+    start_pos: int | None = Field(
+        None, description="Start of the first match (first mode)"
+    )
+    end_pos: int | None = Field(None, description="End of the first match (first mode)")
+    count: int | None = Field(None, description="Number of matches (count mode)")
+
+
+def keep_longest(spans: list[tuple[int, int]], span: tuple[int, int]):
+    """Add a span found by scanning left to right, unless it overlaps a kept
+    span; a longer overlapping span replaces the kept one"""
+    start, end = span
+    for existing_span in spans:
+        # Check if this match overlaps with an existing match
+        if start < existing_span[1] and end > existing_span[0]:
+            # Keep the longer match
+            if end - start > existing_span[1] - existing_span[0]:
+                spans.remove(existing_span)
+                spans.append(span)
+            return
+    spans.append(span)
+
+
+class LiteralPositions:
+    """Positions of every surface and base form in one token sequence
+
+    Built once per sequence and shared by all patterns matched against it,
+    so patterns can jump straight to the tokens their literals occur at.
+    """
+
+    def __init__(self, tokens: list[KotogramToken]):
+        self._positions: dict[str, list[int]] = {}
+        for i, token in enumerate(tokens):
+            self._positions.setdefault(token.surface, []).append(i)
+            if token.base_form != token.surface:
+                self._positions.setdefault(token.base_form, []).append(i)
+        self._unions: dict[tuple[str, ...], list[int]] = {}
+
+    def positions(self, values: tuple[str, ...]) -> list[int]:
+        """Get the sorted positions of tokens with any of the given values"""
+        if len(values) == 1:
+            return self._positions.get(values[0], [])
+        merged = self._unions.get(values)
+        if merged is None:
+            merged = self._unions[values] = sorted(
+                {i for value in values for i in self._positions.get(value, ())}
+            )
+        return merged
+
+
 class GrammarRulePattern(BaseModel):
     """A pattern sequence for a grammar rule"""
 
@@ -161,12 +368,39 @@ class GrammarRulePattern(BaseModel):
         ..., description="List of token patterns to match"
     )
 
+    # Fewest tokens a match can span, used to skip hopeless start positions
+    _min_span: int = PrivateAttr(0)
+
+    # Required literal tokens a search can start from: their values and the
+    # fewest and most tokens (None if unbounded) before them in a match
+    _anchors: list[tuple[tuple[str, ...], int, int | None]] = PrivateAttr(
+        default_factory=list
+    )
+
     def model_post_init(self, __context) -> None:
         """Validate patterns after model initialization"""
         self._validate_patterns()
+        self._min_span = self.span_bounds()[0]
+        self._anchors = self._find_anchors()
+
+    def _find_anchors(self) -> list[tuple[tuple[str, ...], int, int | None]]:
+        """Locate the required literal tokens and their offsets in a match"""
+        anchors = []
+        min_offset = 0
+        max_offset: int | None = 0
+        for pattern in self.patterns:
+            if not pattern.optional and not pattern._is_gap():
+                values = pattern._literal_values()
+                if values is not None:
+                    anchors.append((values, min_offset, max_offset))
+            pattern_min, pattern_max = pattern.span_bounds()
+            min_offset += pattern_min
+            if max_offset is not None:
+                max_offset = None if pattern_max is None else max_offset + pattern_max
+        return anchors
 
     def _validate_patterns(self):
-        """Validate that there is at most one multi-wildcard per pattern"""
+        """Validate that there is at most one unbounded gap per pattern"""
         multi_wildcard_count = sum(
             1 for pattern in self.patterns if pattern._is_multi_wildcard()
         )
@@ -175,61 +409,74 @@ class GrammarRulePattern(BaseModel):
                 f"GrammarRulePattern has {multi_wildcard_count} multi-wildcards. Only one multi-wildcard per pattern is allowed."
             )
 
+    def span_bounds(self) -> tuple[int, int | None]:
+        """Get the (min, max) number of tokens a match can span
+
+        The maximum is None when the pattern contains an unbounded wildcard.
+        """
+        min_span = 0
+        max_span: int | None = 0
+        for pattern in self.patterns:
+            pattern_min, pattern_max = pattern.span_bounds()
+            min_span += pattern_min
+            if max_span is not None:
+                max_span = None if pattern_max is None else max_span + pattern_max
+        return min_span, max_span
+
     def match(
         self, tokens: list[KotogramToken], start_pos: int = 0
     ) -> PatternMatchResult | None:
         """Match this pattern against tokens starting from start_pos"""
-        if start_pos >= len(tokens):
+        end_pos = self.match_end(tokens, start_pos)
+        if end_pos is None:
             return None
+        return PatternMatchResult(
+            start_pos=start_pos,
+            end_pos=end_pos,
+            matched_tokens=tokens[start_pos:end_pos],
+        )
 
-        matched_tokens = []
-        current_pos = start_pos
-        pattern_index = 0
-
-        while pattern_index < len(self.patterns):
-            pattern = self.patterns[pattern_index]
+    def match_end(self, tokens: list[KotogramToken], start_pos: int = 0) -> int | None:
+        """Get the end position of a match starting at start_pos, if any
 
-            # MULTI_WILDCARD: match any number of tokens (including zero) until next pattern matches
-            if pattern._is_multi_wildcard():
+        Matches always cover a contiguous run of tokens, so the end position
+        is all that is needed to describe one.
+        """
+        if start_pos >= len(tokens):
+            return None
+        return self._match_end_from(tokens, start_pos, 0)
+
+    def _match_end_from(
+        self, tokens: list[KotogramToken], current_pos: int, pattern_index: int
+    ) -> int | None:
+        """Match patterns[pattern_index:] from current_pos, returning the end"""
+        patterns = self.patterns
+        while pattern_index < len(patterns):
+            pattern = patterns[pattern_index]
+
+            # Gap: match the fewest tokens (zero or more for a multi-wildcard)
+            # after which the rest of the patterns match, never crossing a
+            # stop token
+            if pattern._is_gap():
+                min_tokens, max_tokens = pattern.span_bounds()
+                limit = len(tokens)
+                if max_tokens is not None:
+                    limit = min(limit, current_pos + max_tokens)
                 next_index = pattern_index + 1
-                if next_index == len(self.patterns):
-                    # If MULTI_WILDCARD is last, consume all remaining tokens
-                    matched_tokens.extend(tokens[current_pos:])
-                    current_pos = len(tokens)
-                    pattern_index += 1
-                    continue
+                if next_index == len(patterns):
+                    # If the gap is last, consume as many tokens as it may
+                    end_pos = current_pos
+                    while end_pos < limit and not pattern._is_stop(tokens[end_pos]):
+                        end_pos += 1
+                    return end_pos if end_pos - current_pos >= min_tokens else None
                 # Try to find a match for the remaining pattern sequence
-                for skip in range(0, len(tokens) - current_pos + 1):
-                    if current_pos + skip >= len(tokens):
-                        break
-
-                    # Create a sub-pattern with remaining patterns and test it
-                    remaining_patterns = self.patterns[next_index:]
-                    if remaining_patterns:
-                        temp_pattern = GrammarRulePattern(patterns=remaining_patterns)
-                        temp_match = temp_pattern.match(tokens, current_pos + skip)
-                        if temp_match:
-                            # We found a valid match for the remaining patterns
-                            # Add skipped tokens as matched
-                            matched_tokens.extend(
-                                tokens[current_pos : current_pos + skip]
-                            )
-                            # Add the remaining matched tokens
-                            matched_tokens.extend(temp_match.matched_tokens)
-                            return PatternMatchResult(
-                                start_pos=start_pos,
-                                end_pos=temp_match.end_pos,
-                                matched_tokens=matched_tokens,
-                            )
-                    else:
-                        # No remaining patterns, so we match everything
-                        matched_tokens.extend(tokens[current_pos:])
-                        return PatternMatchResult(
-                            start_pos=start_pos,
-                            end_pos=len(tokens),
-                            matched_tokens=matched_tokens,
-                        )
-
+                for next_pos in range(current_pos, min(limit + 1, len(tokens))):
+                    if next_pos - current_pos >= min_tokens:
+                        rest_end = self._match_end_from(tokens, next_pos, next_index)
+                        if rest_end is not None:
+                            return rest_end
+                    if pattern._is_stop(tokens[next_pos]):
+                        return None
                 return None
 
             # Check if we've reached the end of tokens
@@ -242,7 +489,6 @@ class GrammarRulePattern(BaseModel):
 
             # Try to match current pattern
             if pattern.matches(tokens[current_pos]):
-                matched_tokens.append(tokens[current_pos])
                 current_pos += 1
                 pattern_index += 1
             elif pattern.optional:
@@ -252,41 +498,102 @@ class GrammarRulePattern(BaseModel):
                 # Non-optional pattern failed to match
                 return None
 
-        # Check if we've matched all patterns
-        if pattern_index == len(self.patterns):
-            return PatternMatchResult(
-                start_pos=start_pos,
-                end_pos=current_pos,
-                matched_tokens=matched_tokens,
-            )
-
-        return None
+        return current_pos
+
+    def _last_start(self, tokens: list[KotogramToken]) -> int:
+        """Get the last start position where a match could still fit"""
+        # No match can start where fewer than min_span tokens remain
+        return min(len(tokens) - 1, len(tokens) - self._min_span)
+
+    def _start_positions(
+        self, tokens: list[KotogramToken], literals: LiteralPositions | None
+    ) -> range | list[int]:
+        """Get the start positions worth trying, in increasing order
+
+        Every match contains each required literal at a bounded offset from
+        its start, so with the literal positions of the tokens only starts
+        placing the rarest literal there are tried. Without them, or without
+        a required literal, every start position is.
+        """
+        last_start = self._last_start(tokens)
+        if literals is None or not self._anchors:
+            return range(last_start + 1)
+
+        positions, min_offset, max_offset = min(
+            (
+                (literals.positions(values), min_offset, max_offset)
+                for values, min_offset, max_offset in self._anchors
+            ),
+            key=lambda anchor: len(anchor[0]),
+        )
+        if not positions:
+            return range(0)
+        if max_offset is None:
+            # An unbounded gap precedes the anchor, so any earlier start may do
+            return range(min(positions[-1] - min_offset, last_start) + 1)
+
+        starts: list[int] = []
+        next_start = 0
+        for position in positions:
+            first = max(position - max_offset, next_start)
+            stop = min(position - min_offset, last_start) + 1
+            if first < stop:
+                starts.extend(range(first, stop))
+                next_start = stop
+        return starts
+
+    def find_all_spans(
+        self, tokens: list[KotogramToken], literals: LiteralPositions | None = None
+    ) -> list[tuple[int, int]]:
+        """Find (start, end) positions of all non-overlapping matches"""
+        spans: list[tuple[int, int]] = []
+        for i in self._start_positions(tokens, literals):
+            end_pos = self.match_end(tokens, i)
+            if end_pos is not None:
+                keep_longest(spans, (i, end_pos))
+        return spans
 
     def find_all_matches(self, tokens: list[KotogramToken]) -> list[PatternMatchResult]:
         """Find all matches of this pattern in the token sequence"""
-        matches: list[PatternMatchResult] = []
-        for i in range(len(tokens)):
-            match = self.match(tokens, i)
-            if match:
-                # Check if this match overlaps with any existing match
-                overlaps = False
-                for existing_match in matches:
-                    if (
-                        match.start_pos < existing_match.end_pos
-                        and match.end_pos > existing_match.start_pos
-                    ):
-                        overlaps = True
-                        # Keep the longer match
-                        if len(match.matched_tokens) > len(
-                            existing_match.matched_tokens
-                        ):
-                            matches.remove(existing_match)
-                            matches.append(match)
-                        break
-
-                if not overlaps:
-                    matches.append(match)
-        return matches
+        return [
+            PatternMatchResult(
+                start_pos=start, end_pos=end, matched_tokens=tokens[start:end]
+            )
+            for start, end in self.find_all_spans(tokens)
+        ]
+
+    def has_match(
+        self, tokens: list[KotogramToken], literals: LiteralPositions | None = None
+    ) -> bool:
+        """Check whether the pattern matches anywhere, stopping at the first hit"""
+        return any(
+            self.match_end(tokens, i) is not None
+            for i in self._start_positions(tokens, literals)
+        )
+
+    def first_span(
+        self,
+        tokens: list[KotogramToken],
+        stop: int | None = None,
+        literals: LiteralPositions | None = None,
+    ) -> tuple[int, int] | None:
+        """Get the first span find_all_spans would return, scanning no further
+        than needed
+
+        A kept span can only be displaced by a longer overlapping match that
+        starts before it ends, so scanning stops once every span found so far
+        has ended. If nothing has matched before ``stop``, None is returned.
+        """
+        spans: list[tuple[int, int]] = []
+        for i in self._start_positions(tokens, literals):
+            if spans and i >= max(end for _, end in spans):
+                break
+            if not spans and stop is not None and i >= stop:
+                break
+            end_pos = self.match_end(tokens, i)
+            if end_pos is not None:
+                keep_longest(spans, (i, end_pos))
+        return min(spans, default=None)
 
 
 class GrammarRule(BaseModel):
@@ -303,39 +610,233 @@ class GrammarRule(BaseModel):
         default_factory=list, description="Example sentences for the rule"
     )
 
-    def match(self, tokens: list[KotogramToken]) -> GrammarMatchResult:
-        """Find all matches of this rule in the token sequence"""
-        all_matches = []
-        for pattern in self.patterns:
-            pattern_matches = pattern.find_all_matches(tokens)
-            all_matches.extend(pattern_matches)
-
-        # Remove duplicate matches with same start and end positions
-        unique_matches = []
+    @property
+    def rule_id(self) -> str:
+        """Identifier used for rule files (e.g. ``n3_011``), or the rule name"""
+        if self.category is not None and self.index is not None:
+            return f"{self.category.lower()}_{self.index:03d}"
+        return self.name
+
+    def find_all_spans(
+        self, tokens: list[KotogramToken], literals: LiteralPositions | None = None
+    ) -> list[MatchSpan]:
+        """Find all matches of this rule as spans, in the order of ``match``"""
+        if literals is None:
+            literals = LiteralPositions(tokens)
+        tracer = get_tracer()
+        rule_id = self.rule_id
+        spans = []
         seen_positions = set()
-        for match in all_matches:
-            position_key = (match.start_pos, match.end_pos)
-            if position_key not in seen_positions:
-                seen_positions.add(position_key)
-                unique_matches.append(match)
+        for pattern_index, pattern in enumerate(self.patterns):
+            if tracer.pattern_spans:
+                with tracer.span("pattern", rule_id=rule_id, index=pattern_index):
+                    pattern_spans = pattern.find_all_spans(tokens, literals)
+            else:
+                pattern_spans = pattern.find_all_spans(tokens, literals)
+            for position_key in pattern_spans:
+                # Remove duplicate matches with same start and end positions
+                if position_key not in seen_positions:
+                    seen_positions.add(position_key)
+                    spans.append(MatchSpan(rule_id, pattern_index, *position_key))
 
         # Sort by start position
-        unique_matches.sort(key=lambda x: x.start_pos)
-        return GrammarMatchResult(
+        spans.sort(key=attrgetter("start"))
+        return spans
+
+    def match(
+        self, tokens: list[KotogramToken], literals: LiteralPositions | None = None
+    ) -> GrammarMatchResult:
+        """Find all matches of this rule in the token sequence"""
+        # Results are built from already valid data, so skip validation
+        return GrammarMatchResult.model_construct(
             rule=self,
-            pattern_matches=unique_matches,
+            pattern_matches=[
+                PatternMatchResult.model_construct(
+                    start_pos=span.start,
+                    end_pos=span.end,
+                    matched_tokens=tokens[span.start : span.end],
+                )
+                for span in self.find_all_spans(tokens, literals)
+            ],
+        )
+
+    def has_match(
+        self, tokens: list[KotogramToken], literals: LiteralPositions | None = None
+    ) -> bool:
+        """Check whether any pattern of this rule matches the token sequence"""
+        if literals is None:
+            literals = LiteralPositions(tokens)
+        return any(pattern.has_match(tokens, literals) for pattern in self.patterns)
+
+    def first_span(
+        self, tokens: list[KotogramToken], literals: LiteralPositions | None = None
+    ) -> tuple[int, int] | None:
+        """Get the (start, end) of the first match that ``match`` would return"""
+        if literals is None:
+            literals = LiteralPositions(tokens)
+        first: tuple[int, int] | None = None
+        for pattern in self.patterns:
+            # Earlier patterns win ties, so later ones must start strictly before
+            span = pattern.first_span(
+                tokens, None if first is None else first[0], literals
+            )
+            if span is not None and (first is None or span[0] < first[0]):
+                first = span
+        return first
+
+    def count_matches(
+        self, tokens: list[KotogramToken], literals: LiteralPositions | None = None
+    ) -> int:
+        """Count the matches that ``match`` would return"""
+        if literals is None:
+            literals = LiteralPositions(tokens)
+        return len(
+            {
+                span
+                for pattern in self.patterns
+                for span in pattern.find_all_spans(tokens, literals)
+            }
         )
 
 
+# Rule files may reference shared pattern fragments as {"$ref": "NAME"}; the
+# fragments live in this file alongside the rules
+PATTERN_LIBRARY_FILE = "_pattern_library.json"
+PATTERN_REF_KEY = "$ref"
+
+
+def dump_rule_with_refs(
+    rule: GrammarRule, library: dict[str, list[TokenPattern]]
+) -> dict:
+    """Serialize a rule, replacing runs of library fragments with references"""
+    # Prefer the longest fragment where several share a prefix
+    fragments = sorted(library.items(), key=lambda item: -len(item[1]))
+    rule_data = rule.model_dump(mode="json")
+
+    for pattern, pattern_data in zip(rule.patterns, rule_data["patterns"]):
+        tokens = pattern.patterns
+        items: list[dict] = []
+        i = 0
+        while i < len(tokens):
+            for name, fragment in fragments:
+                if fragment and tokens[i : i + len(fragment)] == fragment:
+                    items.append({PATTERN_REF_KEY: name})
+                    i += len(fragment)
+                    break
+            else:
+                items.append(pattern_data["patterns"][i])
+                i += 1
+        pattern_data["patterns"] = items
+
+    return rule_data
+
+
+def resolve_rule_refs(rule_data: dict, library: dict[str, list[TokenPattern]]) -> dict:
+    """Splice library fragments into serialized rule data in place of references"""
+    for pattern_data in rule_data.get("patterns", []):
+        items: list = []
+        for item in pattern_data.get("patterns", []):
+            if isinstance(item, dict) and PATTERN_REF_KEY in item:
+                name = item[PATTERN_REF_KEY]
+                if name not in library:
+                    raise ValueError(f"Unknown pattern reference: '{name}'")
+                items.extend(library[name])
+            else:
+                items.append(item)
+        pattern_data["patterns"] = items
+    return rule_data
+
+
+# Number of distinct rule subsets kept by RuleRegistry.subset
+SUBSET_CACHE_SIZE = 128
+
+
 class RuleRegistry:
-    """Container for grammar rules with matching capabilities"""
+    """Container for grammar rules with matching capabilities
+
+    A registry is built by adding rules, then frozen: a frozen registry
+    holds its rules in a tuple, rejects new rules and is safe to match
+    against from many threads.
+    """
 
     def __init__(self):
-        self.rules: list[GrammarRule] = []
+        self._rules: list[GrammarRule] | tuple[GrammarRule, ...] = []
+        self.interner = PatternInterner()
+        self._subsets: OrderedDict[tuple, RuleRegistry] = OrderedDict()
+        self._subsets_lock = threading.Lock()
+
+    @property
+    def rules(self) -> Sequence[GrammarRule]:
+        """Rules in the order they were added"""
+        return self._rules
+
+    @property
+    def frozen(self) -> bool:
+        """Whether the rule set can no longer change"""
+        return isinstance(self._rules, tuple)
+
+    def freeze(self) -> "RuleRegistry":
+        """Stop accepting rules so the registry can be shared between threads"""
+        self._rules = tuple(self._rules)
+        return self
 
     def add_rule(self, rule: GrammarRule):
-        """Add a grammar rule to the registry"""
-        self.rules.append(rule)
+        """Add a grammar rule to the registry, sharing identical token patterns"""
+        if isinstance(self._rules, tuple):
+            raise RuntimeError("Cannot add rules to a frozen registry")
+        for rule_pattern in rule.patterns:
+            rule_pattern.patterns = [
+                self.interner.intern(pattern) for pattern in rule_pattern.patterns
+            ]
+        self._rules.append(rule)
+        with self._subsets_lock:
+            self._subsets.clear()
+
+    def subset(
+        self,
+        categories: list[str] | None = None,
+        rule_ids: list[str] | None = None,
+    ) -> "RuleRegistry":
+        """Get a registry restricted to the given categories and/or rule IDs
+
+        Sub-registries are cached per distinct selection, so repeated queries
+        for the same subset reuse one view. Without a selection the registry
+        itself is returned.
+        """
+        if categories is None and rule_ids is None:
+            return self
+
+        key = (
+            None if categories is None else frozenset(c.upper() for c in categories),
+            None if rule_ids is None else frozenset(rule_ids),
+        )
+        with self._subsets_lock:
+            cached = self._subsets.get(key)
+            if cached is not None:
+                self._subsets.move_to_end(key)
+                return cached
+
+        category_set, rule_id_set = key
+        if rule_id_set is not None:
+            unknown = rule_id_set - {rule.rule_id for rule in self.rules}
+            if unknown:
+                raise ValueError(f"Unknown rule IDs: {', '.join(sorted(unknown))}")
+
+        sub_registry = RuleRegistry()
+        sub_registry.interner = self.interner
+        sub_registry._rules = tuple(
+            rule
+            for rule in self.rules
+            if (category_set is None or (rule.category or "").upper() in category_set)
+            and (rule_id_set is None or rule.rule_id in rule_id_set)
+        )
+
+        # Threads racing on a new selection keep whichever view was cached first
+        with self._subsets_lock:
+            sub_registry = self._subsets.setdefault(key, sub_registry)
+            if len(self._subsets) > SUBSET_CACHE_SIZE:
+                self._subsets.popitem(last=False)
+        return sub_registry
 
     def load_rules_from_directory(self, directory_path: str) -> None:
         """Load rules from JSON files in a directory"""
@@ -346,31 +847,121 @@ class RuleRegistry:
         if not rules_dir.is_dir():
             raise NotADirectoryError(f"Path is not a directory: {directory_path}")
 
-        rule_files = list(rules_dir.glob("*.json"))
+        # Files starting with an underscore hold shared data, not rules
+        rule_files = [
+            path for path in rules_dir.glob("*.json") if not path.name.startswith("_")
+        ]
         if not rule_files:
             raise FileNotFoundError(f"No JSON rule files found in: {directory_path}")
 
+        library = self.load_pattern_library(rules_dir / PATTERN_LIBRARY_FILE)
+
         for rule_file in rule_files:
             try:
                 with open(rule_file, "r", encoding="utf-8") as f:
                     rule_data = json.load(f)
 
-                # Create rule directly from JSON data
-                rule = GrammarRule(**rule_data)
+                # Create rule from JSON data, sharing referenced fragments
+                rule = GrammarRule(**resolve_rule_refs(rule_data, library))
                 self.add_rule(rule)
 
             except Exception as e:
                 raise ValueError(f"Error loading rule from {rule_file}: {e}")
 
+    def load_pattern_library(self, path: Path) -> dict[str, list[TokenPattern]]:
+        """Load named pattern fragments as interned token patterns"""
+        if not path.exists():
+            return {}
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                library_data = json.load(f)
+
+            return {
+                name: [
+                    self.interner.intern(TokenPattern(**pattern))
+                    for pattern in patterns
+                ]
+                for name, patterns in library_data.items()
+            }
+
+        except Exception as e:
+            raise ValueError(f"Error loading pattern library from {path}: {e}")
+
     def find_all_matches(self, tokens: list[KotogramToken]) -> list[GrammarMatchResult]:
         """Match all rules against the token sequence"""
-        all_matches = []
-        for rule in self.rules:
-            match = rule.match(tokens)
-            if match.pattern_matches:
-                all_matches.append(match)
+        tracer = get_tracer()
+        with tracer.span("match", rules=len(self.rules), tokens=len(tokens)) as span:
+            literals = LiteralPositions(tokens)
+            all_matches = []
+            for rule in self.rules:
+                if tracer.rule_spans:
+                    with tracer.span("rule", rule_id=rule.rule_id) as rule_span:
+                        match = rule.match(tokens, literals)
+                        rule_span["matches"] = len(match.pattern_matches)
+                else:
+                    match = rule.match(tokens, literals)
+                if match.pattern_matches:
+                    all_matches.append(match)
+            span["matched_rules"] = len(all_matches)
         return all_matches
 
+    def find_all_spans(self, tokens: list[KotogramToken]) -> MatchSpans:
+        """Match all rules, returning spans instead of copied match results"""
+        tracer = get_tracer()
+        with tracer.span("match", rules=len(self.rules), tokens=len(tokens)):
+            literals = LiteralPositions(tokens)
+            spans = []
+            for rule in self.rules:
+                if tracer.rule_spans:
+                    with tracer.span("rule", rule_id=rule.rule_id) as rule_span:
+                        rule_spans = rule.find_all_spans(tokens, literals)
+                        rule_span["matches"] = len(rule_spans)
+                else:
+                    rule_spans = rule.find_all_spans(tokens, literals)
+                spans.extend(rule_spans)
+        return MatchSpans(tokens, spans)
+
+    def query(
+        self, tokens: list[KotogramToken], mode: QueryMode = "any"
+    ) -> list[RuleQueryResult]:
+        """Answer a query for every rule without building match results
+
+        ``any`` stops at each rule's first hit, ``first`` reports the first
+        match ``find_all_matches`` would return and ``count`` the number of
+        matches it would return. Only matching rules are included.
+        """
+        literals = LiteralPositions(tokens)
+        results = []
+        for rule in self.rules:
+            if mode == "any":
+                if rule.has_match(tokens, literals):
+                    results.append(
+                        RuleQueryResult(rule_id=rule.rule_id, rule_name=rule.name)
+                    )
+            elif mode == "first":
+                span = rule.first_span(tokens, literals)
+                if span is not None:
+                    results.append(
+                        RuleQueryResult(
+                            rule_id=rule.rule_id,
+                            rule_name=rule.name,
+                            start_pos=span[0],
+                            end_pos=span[1],
+                        )
+                    )
+            elif mode == "count":
+                count = rule.count_matches(tokens, literals)
+                if count:
+                    results.append(
+                        RuleQueryResult(
+                            rule_id=rule.rule_id, rule_name=rule.name, count=count
+                        )
+                    )
+            else:
+                raise ValueError(f"Unknown query mode: '{mode}'")
+        return results
+
     def match_specific(
         self, tokens: list[KotogramToken], rule_name: str
     ) -> GrammarMatchResult | None:
@@ -380,6 +971,41 @@ class RuleRegistry:
                 return rule.match(tokens)
         return None
 
+    def validate_examples(self, analyzer: KotogramAnalyzer) -> list[str]:
+        """Check that every rule matches each of its own examples
+
+        Returns a description of every example that fails.
+        """
+        failures = []
+        for rule in self.rules:
+            for example in rule.examples:
+                try:
+                    tokens = analyzer.parse_text(example)
+                except ValueError as e:
+                    failures.append(f"{rule.rule_id}: cannot parse '{example}': {e}")
+                    continue
+                if not rule.has_match(tokens):
+                    failures.append(f"{rule.rule_id}: does not match '{example}'")
+        return failures
+
+    def max_pattern_span(self) -> int | None:
+        """Get the longest token span any rule pattern can match
+
+        Returns None if any pattern is unbounded.
+        """
+        max_span = 0
+        for rule in self.rules:
+            for pattern in rule.patterns:
+                pattern_max = pattern.span_bounds()[1]
+                if pattern_max is None:
+                    return None
+                max_span = max(max_span, pattern_max)
+        return max_span
+
+    def get_rule_ids(self) -> list[str]:
+        """Get list of all rule IDs"""
+        return [rule.rule_id for rule in self.rules]
+
     def get_rule_names(self) -> list[str]:
         """Get list of all rule names"""
         return [rule.name for rule in self.rules]
@@ -0,0 +1,297 @@
+"""Incremental re-analysis of edited documents"""
+
+import re
+from bisect import bisect_left, bisect_right
+
+from pydantic import BaseModel, Field
+
+from .analyzer import KotogramAnalyzer
+from .grammar import RuleRegistry
+from .token import KotogramToken
+
+SENTENCE_TERMINATORS = "。！？!?\n"
+
+# A sentence is any run of text followed by its terminators (or end of text)
+SENTENCE_PATTERN = re.compile(r"[^。！？!?\n]*[。！？!?\n]+|[^。！？!?\n]+")
+
+
+def split_sentences(text: str) -> list[str]:
+    """Split text into sentences that concatenate back to the original text"""
+    return SENTENCE_PATTERN.findall(text)
+
+
+class DocumentMatch(BaseModel):
+    """A rule match located in a document's token sequence"""
+
+    rule_id: str = Field(..., description="ID of the matched rule")
+    rule_name: str = Field(..., description="Name of the matched rule")
+    start_pos: int = Field(..., description="Start position in document tokens")
+    end_pos: int = Field(..., description="End position in document tokens")
+
+
+class DocumentDiff(BaseModel):
+    """Changes to tokens and matches caused by an edit"""
+
+    token_start: int = Field(..., description="First changed token position")
+    removed_token_count: int = Field(..., description="Number of tokens removed")
+    added_tokens: list[KotogramToken] = Field(
+        ..., description="Tokens inserted at token_start"
+    )
+    removed_matches: list[DocumentMatch] = Field(
+        ..., description="Matches removed, in pre-edit positions"
+    )
+    added_matches: list[DocumentMatch] = Field(
+        ..., description="Matches added, in post-edit positions"
+    )
+
+
+class _Sentence:
+    """Text of one sentence and its tokens"""
+
+    __slots__ = ("text", "tokens")
+
+    def __init__(self, text: str, tokens: list[KotogramToken]):
+        self.text = text
+        self.tokens = tokens
+
+
+class IncrementalDocument:
+    """Document that re-tokenizes and re-matches only what an edit affects
+
+    Tokens are kept per sentence, so an edit re-tokenizes only the sentences
+    it touches. Matching is re-run only for start positions within the
+    registry's maximum pattern span of the changed tokens; when some pattern
+    is unbounded the whole document is re-matched.
+    """
+
+    def __init__(
+        self, analyzer: KotogramAnalyzer, registry: RuleRegistry, text: str = ""
+    ):
+        self.analyzer = analyzer
+        self.registry = registry
+        self._sentences: list[_Sentence] = []
+        self._matches: list[DocumentMatch] = []
+        if text:
+            self.set_text(text)
+
+    @property
+    def text(self) -> str:
+        """Current document text"""
+        return "".join(sentence.text for sentence in self._sentences)
+
+    @property
+    def tokens(self) -> list[KotogramToken]:
+        """Current document tokens"""
+        return [token for sentence in self._sentences for token in sentence.tokens]
+
+    @property
+    def matches(self) -> list[DocumentMatch]:
+        """Current matches, ordered by position"""
+        return list(self._matches)
+
+    def set_text(self, text: str) -> DocumentDiff:
+        """Replace the document text, re-analyzing only the part that changed"""
+        old_text = self.text
+
+        # Reduce the replacement to a single edit between common affixes
+        limit = min(len(old_text), len(text))
+        prefix = 0
+        while prefix < limit and old_text[prefix] == text[prefix]:
+            prefix += 1
+        suffix = 0
+        while (
+            suffix < limit - prefix
+            and old_text[len(old_text) - 1 - suffix] == text[len(text) - 1 - suffix]
+        ):
+            suffix += 1
+
+        return self.edit(
+            prefix, len(old_text) - prefix - suffix, text[prefix : len(text) - suffix]
+        )
+
+    def edit(self, offset: int, delete_length: int, insert_text: str) -> DocumentDiff:
+        """Delete ``delete_length`` characters at ``offset`` and insert text"""
+        char_starts, token_starts = self._offsets()
+        text_length = char_starts[-1]
+        if offset < 0 or delete_length < 0 or offset + delete_length > text_length:
+            raise ValueError(
+                f"Edit range {offset}+{delete_length} is outside the document "
+                f"(length {text_length})"
+            )
+
+        # Sentences overlapping the edited range (none for an insertion at a
+        # sentence boundary)
+        sentence_count = len(self._sentences)
+        first = min(max(bisect_right(char_starts, offset) - 1, 0), sentence_count)
+        last = max(bisect_left(char_starts, offset + delete_length), first)
+
+        local = offset - char_starts[first]
+        region_text = "".join(s.text for s in self._sentences[first:last])
+        region_text = (
+            region_text[:local] + insert_text + region_text[local + delete_length :]
+        )
+
+        # Leading terminators attach to the previous sentence, and text without
+        # a trailing terminator runs on into the next one
+        if first > 0 and (
+            (region_text and region_text[0] in SENTENCE_TERMINATORS)
+            or self._sentences[first - 1].text[-1] not in SENTENCE_TERMINATORS
+        ):
+            first -= 1
+            region_text = self._sentences[first].text + region_text
+        if (
+            last < sentence_count
+            and region_text
+            and region_text[-1] not in SENTENCE_TERMINATORS
+        ):
+            region_text += self._sentences[last].text
+            last += 1
+
+        # Re-tokenize only the affected sentences
+        new_sentences = [
+            _Sentence(text, self.analyzer.parse_text(text))
+            for text in split_sentences(region_text)
+        ]
+        token_start = token_starts[first]
+        old_end = token_starts[last]
+        added_tokens = [t for s in new_sentences for t in s.tokens]
+        new_end = token_start + len(added_tokens)
+
+        self._sentences[first:last] = new_sentences
+        removed_matches, added_matches = self._rematch(token_start, old_end, new_end)
+
+        return DocumentDiff(
+            token_start=token_start,
+            removed_token_count=old_end - token_start,
+            added_tokens=added_tokens,
+            removed_matches=removed_matches,
+            added_matches=added_matches,
+        )
+
+    def _offsets(self) -> tuple[list[int], list[int]]:
+        """Get cumulative character and token start offsets per sentence"""
+        char_starts = [0]
+        token_starts = [0]
+        for sentence in self._sentences:
+            char_starts.append(char_starts[-1] + len(sentence.text))
+            token_starts.append(token_starts[-1] + len(sentence.tokens))
+        return char_starts, token_starts
+
+    def _rematch(
+        self, start: int, old_end: int, new_end: int
+    ) -> tuple[list[DocumentMatch], list[DocumentMatch]]:
+        """Re-run matching around changed tokens [start, new_end)
+
+        A match suppresses shorter matches of its pattern that overlap it, so
+        the re-matched window grows back over kept matches reaching into it
+        and forward past the end of every match it finds or replaces, until
+        matches outside the window cannot interact with those inside.
+        """
+        tokens = self.tokens
+        span = self.registry.max_pattern_span()
+        delta = new_end - old_end
+
+        def moved_end(position: int) -> int:
+            # Highest post-edit position of an old end
+            if position <= start:
+                return position
+            return max(position + delta, new_end)
+
+        if span is None:
+            window_start, cut = 0, len(tokens)
+        else:
+            window_start, cut = max(start - span, 0), new_end
+
+        # Old matches starting before window_start are kept, those starting at
+        # or after cut are kept shifted, and the ones between are re-matched
+        while True:
+            for match in self._matches:
+                if match.start_pos < window_start < moved_end(match.end_pos):
+                    window_start = match.start_pos
+
+            fresh = self._match_window(window_start, cut, span)
+            new_cut = max(
+                [cut]
+                + [match.end_pos for match in fresh]
+                + [
+                    moved_end(match.end_pos)
+                    for match in self._matches
+                    if match.start_pos >= window_start
+                    and (match.start_pos < old_end or match.start_pos + delta < cut)
+                ]
+            )
+            if new_cut == cut and not any(
+                match.start_pos < window_start < moved_end(match.end_pos)
+                for match in self._matches
+            ):
+                break
+            cut = new_cut
+
+        kept: list[DocumentMatch] = []
+        stale: list[DocumentMatch] = []
+        for match in self._matches:
+            if match.start_pos < window_start:
+                kept.append(match)
+            elif match.start_pos >= old_end and match.start_pos + delta >= cut:
+                kept.append(
+                    match.model_copy(
+                        update={
+                            "start_pos": match.start_pos + delta,
+                            "end_pos": match.end_pos + delta,
+                        }
+                    )
+                )
+            else:
+                stale.append(match)
+
+        # Matches outside the changed tokens that were found again are
+        # unchanged and do not belong in the diff
+        def key(match: DocumentMatch) -> tuple[int, int, str]:
+            return match.start_pos, match.end_pos, match.rule_id
+
+        fresh_keys = {key(m) for m in fresh}
+        unchanged: list[DocumentMatch] = []
+        removed: list[DocumentMatch] = []
+        for match in stale:
+            if match.end_pos <= start:
+                moved = match
+            elif match.start_pos >= old_end:
+                moved = match.model_copy(
+                    update={
+                        "start_pos": match.start_pos + delta,
+                        "end_pos": match.end_pos + delta,
+                    }
+                )
+            else:
+                removed.append(match)
+                continue
+            if key(moved) in fresh_keys:
+                unchanged.append(moved)
+            else:
+                removed.append(match)
+        unchanged_keys = {key(m) for m in unchanged}
+        added = [m for m in fresh if key(m) not in unchanged_keys]
+
+        self._matches = sorted(kept + unchanged + added, key=key)
+        return removed, added
+
+    def _match_window(
+        self, window_start: int, cut: int, span: int | None
+    ) -> list[DocumentMatch]:
+        """Match all rules from window_start, keeping matches starting before
+        cut"""
+        tokens = self.tokens
+        # A match starting at s reads at most tokens[s : s + span]
+        window_end = len(tokens) if span is None else min(cut + span, len(tokens))
+        window = tokens[window_start:window_end]
+        return [
+            DocumentMatch(
+                rule_id=match_span.rule_id,
+                rule_name=rule.name,
+                start_pos=window_start + match_span.start,
+                end_pos=window_start + match_span.end,
+            )
+            for rule in self.registry.rules
+            for match_span in rule.find_all_spans(window)
+            if window_start + match_span.start < cut
+        ]
@@ -0,0 +1,268 @@
+"""Inverted index over a tokenized corpus for fast rule search
+
+Postings map a token feature (surface, base form, part of speech, detailed
+part of speech, inflection type or form) to the sorted IDs of sentences
+containing it. To find a rule's sentences, the query planner intersects the
+postings of the tokens every match must contain and runs the matcher only
+on the remaining candidates.
+"""
+
+import os
+import struct
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Sequence
+from typing import cast
+
+from .codec import (
+    INFLECTION_FORM_ORDINAL,
+    INFLECTION_TYPE_ORDINAL,
+    PART_OF_SPEECH_ORDINAL,
+    POS_DETAIL_ORDINAL,
+)
+from .corpus import Corpus
+from .grammar import GrammarRule, GrammarRulePattern, TokenPattern
+from .token import KotogramToken
+
+INDEX_MAGIC = b"KTGI"
+INDEX_VERSION = 1
+
+# Magic, version, key count, and the sentence/token counts of the corpus
+INDEX_HEADER = struct.Struct("<4sIQQQ")
+
+# Indexed features; a key packs the feature's position here with its value
+INDEX_FIELDS = (
+    "surface",
+    "base_form",
+    "part_of_speech",
+    "pos_detail",
+    "infl_type",
+    "infl_form",
+)
+SURFACE, BASE_FORM, PART_OF_SPEECH, POS_DETAIL, INFL_TYPE, INFL_FORM = range(6)
+
+# Corpus columns indexed under each feature
+INDEXED_COLUMNS = (
+    (SURFACE, "surface"),
+    (BASE_FORM, "base_form"),
+    (PART_OF_SPEECH, "part_of_speech"),
+    (POS_DETAIL, "pos_detail1"),
+    (POS_DETAIL, "pos_detail2"),
+    (POS_DETAIL, "pos_detail3"),
+    (INFL_TYPE, "infl_type"),
+    (INFL_FORM, "infl_form"),
+)
+
+# Posting of a feature no sentence has
+EMPTY_POSTING = array("I")
+
+
+def _key(field: int, value: int) -> int:
+    """Pack a feature and its string index or enum ordinal into one key"""
+    return field << 32 | value
+
+
+def _intersect(postings: Iterable[Sequence[int]]) -> list[int]:
+    """Intersect sorted sentence ID lists, probing the larger ones"""
+    postings = sorted(postings, key=len)
+    result = list(postings[0])
+    for other in postings[1:]:
+        if not result:
+            break
+        size = len(other)
+        result = [
+            sentence
+            for sentence in result
+            if (i := bisect_left(other, sentence)) < size and other[i] == sentence
+        ]
+    return result
+
+
+def _union(postings: Iterable[Sequence[int]]) -> list[int]:
+    """Union sorted sentence ID lists"""
+    merged: set[int] = set()
+    for posting in postings:
+        merged.update(posting)
+    return sorted(merged)
+
+
+class CorpusIndex:
+    """Inverted index from token features to the sentences of a corpus"""
+
+    def __init__(self, corpus: Corpus, postings: dict[int, array]):
+        self.corpus = corpus
+        self._postings = postings
+        self._string_ids = {corpus.string(i): i for i in range(corpus.string_count)}
+
+    @classmethod
+    def build(cls, corpus: Corpus) -> "CorpusIndex":
+        """Index every sentence of a corpus"""
+        postings: dict[int, array] = {}
+        columns = [(field, corpus.column(name)) for field, name in INDEXED_COLUMNS]
+        for sentence in range(len(corpus)):
+            token_range = corpus.token_range(sentence)
+            keys = {
+                _key(field, value)
+                for field, column in columns
+                for value in column[token_range.start : token_range.stop]
+            }
+            for key in keys:
+                posting = postings.get(key)
+                if posting is None:
+                    posting = postings[key] = array("I")
+                posting.append(sentence)
+        return cls(corpus, postings)
+
+    def save(self, path: str | os.PathLike):
+        """Write the index next to its corpus, replacing any previous index"""
+        keys = array("Q", sorted(self._postings))
+        offsets = array("Q", [0])
+        for key in keys:
+            offsets.append(offsets[-1] + len(self._postings[key]))
+
+        path = os.fspath(path)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(
+                INDEX_HEADER.pack(
+                    INDEX_MAGIC,
+                    INDEX_VERSION,
+                    len(keys),
+                    len(self.corpus),
+                    self.corpus.token_count,
+                )
+            )
+            f.write(keys.tobytes())
+            f.write(offsets.tobytes())
+            for key in keys:
+                f.write(array("I", self._postings[key]).tobytes())
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike, corpus: Corpus) -> "CorpusIndex":
+        """Read an index written by ``save`` for the given corpus"""
+        with open(path, "rb") as f:
+            data = f.read()
+
+        if len(data) < INDEX_HEADER.size:
+            raise ValueError(f"Not an index file: {path}")
+        magic, version, key_count, sentence_count, token_count = (
+            INDEX_HEADER.unpack_from(data)
+        )
+        if magic != INDEX_MAGIC:
+            raise ValueError(f"Not an index file: {path}")
+        if version != INDEX_VERSION:
+            raise ValueError(f"Unsupported index version {version}: {path}")
+        if (sentence_count, token_count) != (len(corpus), corpus.token_count):
+            raise ValueError(f"Index {path} was built for a different corpus")
+
+        position = INDEX_HEADER.size
+        keys = array("Q", data[position : position + 8 * key_count])
+        position += 8 * key_count
+        offsets = array("Q", data[position : position + 8 * (key_count + 1)])
+        position += 8 * (key_count + 1)
+        sentences = array("I", data[position:])
+        if len(keys) != key_count or len(sentences) != offsets[-1]:
+            raise ValueError(f"Truncated index file: {path}")
+
+        postings = {
+            key: sentences[start:end]
+            for key, start, end in zip(keys, offsets, offsets[1:])
+        }
+        return cls(corpus, postings)
+
+    def _posting(self, field: int, value: int | None) -> array:
+        if value is None:
+            return EMPTY_POSTING
+        return self._postings.get(_key(field, value), EMPTY_POSTING)
+
+    def _branch_candidates(self, pattern: TokenPattern) -> Sequence[int] | None:
+        """Sentences satisfying every field of a pattern's main branch
+
+        Returns None if the branch constrains nothing.
+        """
+        postings: list[Sequence[int]] = []
+        if pattern.value is not None:
+            value_id = self._string_ids.get(pattern.value)
+            postings.append(
+                _union(
+                    [
+                        self._posting(SURFACE, value_id),
+                        self._posting(BASE_FORM, value_id),
+                    ]
+                )
+            )
+        if pattern.part_of_speech is not None:
+            postings.append(
+                self._posting(
+                    PART_OF_SPEECH, PART_OF_SPEECH_ORDINAL[pattern.part_of_speech]
+                )
+            )
+        if pattern.pos_detail is not None:
+            postings.append(
+                self._posting(POS_DETAIL, POS_DETAIL_ORDINAL[pattern.pos_detail])
+            )
+        if pattern.infl_type is not None:
+            postings.append(
+                self._posting(INFL_TYPE, INFLECTION_TYPE_ORDINAL[pattern.infl_type])
+            )
+        if pattern.infl_form is not None:
+            postings.append(
+                self._posting(INFL_FORM, INFLECTION_FORM_ORDINAL[pattern.infl_form])
+            )
+
+        if not postings:
+            return None
+        return postings[0] if len(postings) == 1 else _intersect(postings)
+
+    def _token_candidates(self, pattern: TokenPattern) -> Sequence[int] | None:
+        """Sentences containing a token the pattern accepts, or None if any"""
+        branches = [pattern, *(pattern.alternatives or ())]
+        postings: list[Sequence[int]] = []
+        for branch in branches:
+            # Alternatives may nest their own alternatives
+            candidates = (
+                self._branch_candidates(branch)
+                if branch is pattern
+                else self._token_candidates(branch)
+            )
+            if candidates is None:
+                return None
+            postings.append(candidates)
+        return postings[0] if len(postings) == 1 else _union(postings)
+
+    def pattern_candidates(self, pattern: GrammarRulePattern) -> list[int] | None:
+        """Plan a pattern: sentences containing every token it requires
+
+        Returns None if the pattern requires no indexable token, in which
+        case every sentence is a candidate.
+        """
+        postings: list[Sequence[int]] = []
+        for token_pattern in pattern.patterns:
+            if token_pattern.optional or token_pattern._is_gap():
+                continue
+            candidates = self._token_candidates(token_pattern)
+            if candidates is not None:
+                postings.append(candidates)
+        if not postings:
+            return None
+        return _intersect(postings)
+
+    def candidates(self, rule: GrammarRule) -> list[int]:
+        """Get the sentences a rule could match in"""
+        postings: list[Sequence[int]] = []
+        for pattern in rule.patterns:
+            candidates = self.pattern_candidates(pattern)
+            if candidates is None:
+                return list(range(len(self.corpus)))
+            postings.append(candidates)
+        return _union(postings)
+
+    def find_sentences(self, rule: GrammarRule) -> list[int]:
+        """Find the IDs of all sentences a rule matches in"""
+        return [
+            sentence
+            for sentence in self.candidates(rule)
+            # Token views provide every field matching reads
+            if rule.has_match(cast(list[KotogramToken], self.corpus.views(sentence)))
+        ]
@@ -7,22 +7,25 @@ from kotogram.types import InflectionForm, InflectionType, PartOfSpeech, POSDeta
 class CommonPatterns:
     """Collection of commonly used token patterns"""
 
+    # Stop set for gaps that must stay within one sentence (句点)
+    SENTENCE_END = (TokenPattern(pos_detail=POSDetailType.SYMBOL_PERIOD),)
+
     # 動詞普通形/い形容詞普通形
     VERB_OR_I_ADJ_PLAIN = [
         TokenPattern(
             part_of_speech=PartOfSpeech.VERB,
-            alternatives=[
+            alternatives=(
                 TokenPattern(
                     part_of_speech=PartOfSpeech.ADJECTIVE,
                     infl_type=InflectionType.ADJECTIVE_ISTEM,
-                    alternatives=[
+                    alternatives=(
                         TokenPattern(
                             part_of_speech=PartOfSpeech.ADJECTIVE,
                             infl_type=InflectionType.ADJECTIVE_AUO,
                         ),
-                    ],
+                    ),
                 ),
-            ],
+            ),
         ),
         TokenPattern(value="ない", optional=True),
     ]
@@ -32,12 +35,12 @@ class CommonPatterns:
         TokenPattern(
             part_of_speech=PartOfSpeech.NOUN,
             pos_detail=POSDetailType.NOUN_ADJECTIVE_VERBAL_STEM,
-            alternatives=[
+            alternatives=(
                 TokenPattern(
                     part_of_speech=PartOfSpeech.NOUN,
                     pos_detail=POSDetailType.NOUN_NAI_ADJECTIVE_STEM,
                 ),
-            ],
+            ),
         ),
         TokenPattern(value="な"),
     ]
@@ -47,18 +50,16 @@ class CommonPatterns:
         TokenPattern(
             part_of_speech=PartOfSpeech.NOUN,
             pos_detail=POSDetailType.NOUN_ADJECTIVE_VERBAL_STEM,
-            alternatives=[
+            alternatives=(
                 TokenPattern(
                     part_of_speech=PartOfSpeech.NOUN,
                     pos_detail=POSDetailType.NOUN_NAI_ADJECTIVE_STEM,
                 ),
-            ],
+            ),
         ),
         TokenPattern(
             value="な",
-            alternatives=[
-                TokenPattern(value="で"),
-            ],
+            alternatives=(TokenPattern(value="で"),),
         ),
         TokenPattern(value="ある", optional=True),
     ]
@@ -74,9 +75,7 @@ class CommonPatterns:
         TokenPattern(part_of_speech=PartOfSpeech.NOUN),
         TokenPattern(
             value="の",
-            alternatives=[
-                TokenPattern(value="で"),
-            ],
+            alternatives=(TokenPattern(value="で"),),
         ),
         TokenPattern(value="ある", optional=True),
     ]
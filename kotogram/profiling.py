@@ -0,0 +1,113 @@
+"""Low-overhead sampling profiler for live processes
+
+``StackSampler`` wakes up every ``interval`` seconds in a background thread
+and records the Python stack of every other thread. Sampled code runs at
+full speed between samples and needs no instrumentation, so it can be
+attached to a busy worker. Results are collapsed stacks: one
+``caller;...;callee count`` line per distinct stack, the input format of
+flame graph tools.
+"""
+
+import sys
+import threading
+from collections import Counter
+from types import CodeType, FrameType
+
+# Default seconds between samples
+DEFAULT_INTERVAL = 0.01
+
+
+class StackSampler:
+    """Samples the stacks of all threads of the process
+
+    Frames are labelled ``module.qualified_name``, e.g.
+    ``kotogram.grammar.TokenPattern.matches``. With a ``module_prefix``,
+    only stacks containing a frame of a module under that prefix are kept,
+    which leaves out idle threads.
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, module_prefix: str = ""):
+        if interval <= 0:
+            raise ValueError(f"Sampling interval must be positive: {interval}")
+        self.interval = interval
+        self.module_prefix = module_prefix
+        self.stacks: Counter[tuple[str, ...]] = Counter()
+        self.sample_count = 0
+        self._labels: dict[CodeType, tuple[str, bool]] = {}
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self) -> "StackSampler":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.stop()
+
+    def start(self):
+        """Start sampling in a background thread"""
+        if self._thread is not None:
+            raise RuntimeError("Sampler was already started")
+        self._thread = threading.Thread(
+            target=self._run, name="kotogram-stack-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling and wait for the sampling thread to finish"""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _label(self, code: CodeType, module: str) -> tuple[str, bool]:
+        """Label a code object and tell whether it is under the module prefix"""
+        label = self._labels.get(code)
+        if label is None:
+            # co_qualname only exists from Python 3.11
+            name = getattr(code, "co_qualname", code.co_name)
+            label = self._labels[code] = (
+                f"{module}.{name}",
+                module.startswith(self.module_prefix),
+            )
+        return label
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stopped.wait(self.interval):
+            self.sample_count += 1
+            for thread_id, top in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                relevant = False
+                frame: FrameType | None = top
+                while frame is not None:
+                    label, in_prefix = self._label(
+                        frame.f_code, frame.f_globals.get("__name__", "?")
+                    )
+                    stack.append(label)
+                    relevant = relevant or in_prefix
+                    frame = frame.f_back
+                if relevant:
+                    stack.reverse()
+                    self.stacks[tuple(stack)] += 1
+
+    def collapsed(self) -> str:
+        """Render the samples as collapsed stacks, most frequent first"""
+        return "".join(
+            f"{';'.join(stack)} {count}\n" for stack, count in self.stacks.most_common()
+        )
+
+    def functions(self) -> list[tuple[str, int, int]]:
+        """Get (function, own samples, inclusive samples), most inclusive first"""
+        own: Counter[str] = Counter()
+        inclusive: Counter[str] = Counter()
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            # A recursive function counts once per sample
+            for label in set(stack):
+                inclusive[label] += count
+        return [
+            (label, own[label], total)
+            for label, total in sorted(inclusive.items(), key=lambda item: -item[1])
+        ]
@@ -0,0 +1,267 @@
+"""Matcher backend that compiles grammar rule patterns to regular expressions
+
+Every token is encoded as eight feature codes: part of speech, the three
+detailed parts of speech, inflection type and form, and the literal class of
+its surface and base form. Each GrammarRulePattern becomes a regular
+expression over those codes, so scanning runs in the ``re`` engine.
+
+Codes come from disjoint private-use ranges per feature, so a compiled
+pattern can only match at token boundaries. Results equal those of
+``RuleRegistry``: optional tokens are taken greedily without backtracking,
+gaps are lazy, and trailing gaps consume as much as they may. The possessive
+and atomic constructs needed for that are emulated with lookaheads, which
+are atomic in ``re``, so they work before Python 3.11.
+"""
+
+import re
+from collections.abc import Sequence
+from itertools import count
+from operator import attrgetter
+
+from .codec import (
+    INFLECTION_FORM_ORDER,
+    INFLECTION_TYPE_ORDER,
+    PART_OF_SPEECH_ORDER,
+    POS_DETAIL_ORDER,
+)
+from .grammar import (
+    GrammarMatchResult,
+    GrammarRule,
+    GrammarRulePattern,
+    MatchSpan,
+    MatchSpans,
+    PatternMatchResult,
+    RuleRegistry,
+    TokenPattern,
+    keep_longest,
+)
+from .token import KotogramToken
+
+# Feature codes per token
+TOKEN_WIDTH = 8
+
+# First code point of each feature's private-use range
+PART_OF_SPEECH_BASE = 0xE000
+POS_DETAIL_BASE = 0xE100
+INFLECTION_TYPE_BASE = 0xE200
+INFLECTION_FORM_BASE = 0xE300
+LITERAL_BASE = 0xF0000  # Literal 0 stands for values no rule mentions
+
+
+def _codes(base: int, values: Sequence) -> dict:
+    return {value: chr(base + i) for i, value in enumerate(values)}
+
+
+def _any(base: int) -> str:
+    return f"[{chr(base)}-{chr(base + 0xFF)}]"
+
+
+PART_OF_SPEECH_CODE = _codes(PART_OF_SPEECH_BASE, PART_OF_SPEECH_ORDER)
+POS_DETAIL_CODE = _codes(POS_DETAIL_BASE, POS_DETAIL_ORDER)
+INFLECTION_TYPE_CODE = _codes(INFLECTION_TYPE_BASE, INFLECTION_TYPE_ORDER)
+INFLECTION_FORM_CODE = _codes(INFLECTION_FORM_BASE, INFLECTION_FORM_ORDER)
+
+ANY_PART_OF_SPEECH = _any(PART_OF_SPEECH_BASE)
+ANY_POS_DETAIL = _any(POS_DETAIL_BASE)
+ANY_INFLECTION_TYPE = _any(INFLECTION_TYPE_BASE)
+ANY_INFLECTION_FORM = _any(INFLECTION_FORM_BASE)
+ANY_LITERAL = f"[{chr(LITERAL_BASE)}-{chr(0xFFFFD)}]"
+ANY_TOKEN = (
+    ANY_PART_OF_SPEECH
+    + ANY_POS_DETAIL * 3
+    + ANY_INFLECTION_TYPE
+    + ANY_INFLECTION_FORM
+    + ANY_LITERAL * 2
+)
+
+
+def _pattern_values(pattern: TokenPattern):
+    """Yield the literal values of a token pattern and its nested patterns"""
+    if pattern.value is not None:
+        yield pattern.value
+    for nested in (*(pattern.alternatives or ()), *(pattern.stop or ())):
+        yield from _pattern_values(nested)
+
+
+class RegexMatcher:
+    """Matches the rules of a registry with compiled regular expressions
+
+    A drop-in for the registry's ``find_all_matches`` and ``find_all_spans``.
+    The registry's rules are compiled once, so build a new matcher after
+    changing them.
+    """
+
+    def __init__(self, registry: RuleRegistry):
+        self.registry = registry
+        values = sorted(
+            {
+                value
+                for rule in registry.rules
+                for pattern in rule.patterns
+                for token_pattern in pattern.patterns
+                for value in _pattern_values(token_pattern)
+            }
+        )
+        self._literal_codes = {
+            value: chr(LITERAL_BASE + i) for i, value in enumerate(values, 1)
+        }
+        self._other_literal = chr(LITERAL_BASE)
+        self._compiled = [
+            [self.compile_pattern(pattern) for pattern in rule.patterns]
+            for rule in registry.rules
+        ]
+
+    def encode(self, tokens: list[KotogramToken]) -> str:
+        """Encode tokens as a string of TOKEN_WIDTH codes per token"""
+        literal_codes = self._literal_codes
+        other = self._other_literal
+        return "".join(
+            [
+                PART_OF_SPEECH_CODE[token.part_of_speech]
+                + POS_DETAIL_CODE[token.pos_detail1]
+                + POS_DETAIL_CODE[token.pos_detail2]
+                + POS_DETAIL_CODE[token.pos_detail3]
+                + INFLECTION_TYPE_CODE[token.infl_type]
+                + INFLECTION_FORM_CODE[token.infl_form]
+                + literal_codes.get(token.surface, other)
+                + literal_codes.get(token.base_form, other)
+                for token in tokens
+            ]
+        )
+
+    def _token_regex(self, pattern: TokenPattern) -> str:
+        """Translate the single-token test of ``TokenPattern.matches``"""
+        if pattern._is_gap():
+            return self._not_stop(pattern) + ANY_TOKEN
+
+        if pattern.part_of_speech is None:
+            main = ANY_PART_OF_SPEECH
+        else:
+            main = PART_OF_SPEECH_CODE[pattern.part_of_speech]
+        # The detailed part of speech may be any of the three
+        if pattern.pos_detail is None:
+            main += ANY_POS_DETAIL * 3
+        else:
+            code = POS_DETAIL_CODE[pattern.pos_detail]
+            main += (
+                f"(?:{code}{ANY_POS_DETAIL * 2}|{ANY_POS_DETAIL}{code}"
+                f"{ANY_POS_DETAIL}|{ANY_POS_DETAIL * 2}{code})"
+            )
+        if pattern.infl_type is None:
+            main += ANY_INFLECTION_TYPE
+        else:
+            main += INFLECTION_TYPE_CODE[pattern.infl_type]
+        if pattern.infl_form is None:
+            main += ANY_INFLECTION_FORM
+        else:
+            main += INFLECTION_FORM_CODE[pattern.infl_form]
+        # The value may be the surface or the base form
+        if pattern.value is None:
+            main += ANY_LITERAL * 2
+        else:
+            code = self._literal_codes[pattern.value]
+            main += f"(?:{code}{ANY_LITERAL}|{ANY_LITERAL}{code})"
+
+        if not pattern.alternatives:
+            return main
+        branches = [self._token_regex(alt) for alt in pattern.alternatives]
+        return f"(?:{'|'.join([*branches, main])})"
+
+    def _not_stop(self, pattern: TokenPattern) -> str:
+        """Lookahead rejecting a gap's stop tokens"""
+        if not pattern.stop:
+            return ""
+        return f"(?!{'|'.join(self._token_regex(stop) for stop in pattern.stop)})"
+
+    def compile_pattern(self, pattern: GrammarRulePattern) -> re.Pattern:
+        """Compile a pattern sequence to a regular expression over token codes"""
+        group_ids = count()
+
+        def possessive(regex: str) -> str:
+            # What a lookahead captured cannot be given back on backtracking
+            name = f"g{next(group_ids)}"
+            return f"(?=(?P<{name}>{regex}))(?P={name})"
+
+        parts = []
+        last = len(pattern.patterns) - 1
+        for i, token_pattern in enumerate(pattern.patterns):
+            if token_pattern._is_gap():
+                min_tokens, max_tokens = token_pattern.span_bounds()
+                bounds = f"{{{min_tokens},{'' if max_tokens is None else max_tokens}}}"
+                gap = f"(?:{self._not_stop(token_pattern)}{ANY_TOKEN}){bounds}"
+                if i == last:
+                    parts.append(possessive(gap))
+                else:
+                    # Shortest gap first; the rest must start at a token
+                    parts.append(f"{gap}?(?={ANY_PART_OF_SPEECH})")
+            elif token_pattern.optional:
+                parts.append(possessive(f"(?:{self._token_regex(token_pattern)})?"))
+            else:
+                parts.append(self._token_regex(token_pattern))
+        return re.compile("".join(parts))
+
+    @staticmethod
+    def _scan(regex: re.Pattern, code: str, token_count: int) -> list[tuple[int, int]]:
+        """Find spans like ``GrammarRulePattern.find_all_spans``"""
+        spans: list[tuple[int, int]] = []
+        position = 0
+        while (found := regex.search(code, position)) is not None:
+            start = found.start() // TOKEN_WIDTH
+            if start >= token_count:
+                break
+            keep_longest(spans, (start, found.end() // TOKEN_WIDTH))
+            position = found.start() + TOKEN_WIDTH
+        return spans
+
+    def _rule_spans(
+        self, rule: GrammarRule, regexes: list[re.Pattern], code: str, n: int
+    ) -> list[MatchSpan]:
+        """Find spans like ``GrammarRule.find_all_spans``"""
+        rule_id = rule.rule_id
+        spans = []
+        seen_positions = set()
+        for pattern_index, regex in enumerate(regexes):
+            for position_key in self._scan(regex, code, n):
+                # Remove duplicate matches with same start and end positions
+                if position_key not in seen_positions:
+                    seen_positions.add(position_key)
+                    spans.append(MatchSpan(rule_id, pattern_index, *position_key))
+
+        # Sort by start position
+        spans.sort(key=attrgetter("start"))
+        return spans
+
+    def find_all_spans(self, tokens: list[KotogramToken]) -> MatchSpans:
+        """Match all rules, returning spans instead of copied match results"""
+        code = self.encode(tokens)
+        return MatchSpans(
+            tokens,
+            [
+                span
+                for rule, regexes in zip(self.registry.rules, self._compiled)
+                for span in self._rule_spans(rule, regexes, code, len(tokens))
+            ],
+        )
+
+    def find_all_matches(self, tokens: list[KotogramToken]) -> list[GrammarMatchResult]:
+        """Match all rules against the token sequence"""
+        code = self.encode(tokens)
+        all_matches = []
+        for rule, regexes in zip(self.registry.rules, self._compiled):
+            spans = self._rule_spans(rule, regexes, code, len(tokens))
+            if spans:
+                # Results are built from already valid data, so skip validation
+                all_matches.append(
+                    GrammarMatchResult.model_construct(
+                        rule=rule,
+                        pattern_matches=[
+                            PatternMatchResult.model_construct(
+                                start_pos=span.start,
+                                end_pos=span.end,
+                                matched_tokens=tokens[span.start : span.end],
+                            )
+                            for span in spans
+                        ],
+                    )
+                )
+        return all_matches
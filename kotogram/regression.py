@@ -0,0 +1,228 @@
+"""Parallel, cached regression runs of grammar rules against their examples
+
+Every rule must match each of its own examples. Example tokenizations are
+cached on disk keyed by text and tokenizer version, rules are checked in
+worker processes, and a rule is only re-checked when its compiled form, its
+definition file or the matching engine changed since it last passed.
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from pydantic import BaseModel, Field
+
+from .analyzer import KotogramAnalyzer
+from .backends import JanomeBackend
+from .cache import tokenizer_version
+from .codec import CompactTokens
+from .files import write_atomic
+from .grammar import GrammarRule, RuleRegistry
+from .token import KotogramToken
+
+DEFAULT_CACHE_DIR = ".kotogram_cache"
+TOKEN_CACHE_FILE = "example_tokens.json"
+STATE_FILE = "regression_state.json"
+
+PACKAGE_DIR = Path(__file__).parent
+
+
+def _hash_files(paths: list[Path]) -> str:
+    """Hash the contents of files, in order"""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def engine_version() -> str:
+    """Identify the tokenizer and matcher sources a regression result depends on"""
+    return _hash_files(sorted(PACKAGE_DIR.glob("*.py")))[:12]
+
+
+def _write_json(path: Path, data: dict):
+    """Write JSON through a temporary file so readers never see partial data"""
+    write_atomic(path, json.dumps(data, ensure_ascii=False))
+
+
+def _read_json(path: Path) -> dict:
+    """Read a JSON cache file, treating a missing or corrupt file as empty"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data: dict = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data
+
+
+class RuleRegressionResult(BaseModel):
+    """Outcome of checking one rule against its examples"""
+
+    rule_id: str = Field(..., description="ID of the checked rule")
+    rule_name: str = Field(..., description="Name of the checked rule")
+    failures: list[str] = Field(
+        default_factory=list, description="Examples the rule failed on"
+    )
+    cached: bool = Field(
+        False, description="Whether the result was reused from an earlier run"
+    )
+
+    @property
+    def passed(self) -> bool:
+        """Whether the rule matched all of its examples"""
+        return not self.failures
+
+
+class ExampleTokenCache:
+    """On-disk cache of tokenized examples keyed by text and tokenizer version"""
+
+    def __init__(self, path: Path, version: str):
+        self.path = path
+        self.version = version
+        self._entries: dict[str, dict] = _read_json(path)
+        self._dirty = False
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.version}\0{text}".encode("utf-8")).hexdigest()
+
+    def get(self, text: str) -> CompactTokens | None:
+        """Get the cached tokens of a text, if present"""
+        entry = self._entries.get(self._key(text))
+        if entry is None:
+            return None
+        return CompactTokens.model_construct(**entry)
+
+    def put(self, text: str, tokens: CompactTokens):
+        """Cache the tokens of a text"""
+        self._entries[self._key(text)] = tokens.model_dump()
+        self._dirty = True
+
+    def save(self):
+        """Write the cache if anything was added"""
+        if self._dirty:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            _write_json(self.path, self._entries)
+            self._dirty = False
+
+
+# Analyzer of the current worker process, created on first use
+_worker_analyzer: KotogramAnalyzer | None = None
+
+
+def check_rule(
+    rule: GrammarRule, tokenized: dict[str, CompactTokens]
+) -> tuple[list[str], dict[str, CompactTokens]]:
+    """Check a rule against its examples, tokenizing those not given
+
+    Returns the failures and the newly tokenized examples.
+    """
+    global _worker_analyzer
+
+    failures = []
+    new_tokens: dict[str, CompactTokens] = {}
+    for example in rule.examples:
+        tokens: list[KotogramToken]
+        if example in tokenized:
+            tokens = tokenized[example].to_tokens()
+        else:
+            if _worker_analyzer is None:
+                _worker_analyzer = KotogramAnalyzer()
+            try:
+                tokens = _worker_analyzer.parse_text(example)
+            except ValueError as e:
+                failures.append(f"cannot parse '{example}': {e}")
+                continue
+            new_tokens[example] = CompactTokens.from_tokens(tokens)
+        if not rule.has_match(tokens):
+            failures.append(f"does not match '{example}'")
+    return failures, new_tokens
+
+
+class RegressionRunner:
+    """Checks every rule in a rules directory against its own examples"""
+
+    def __init__(
+        self,
+        rules_dir: str = "rules",
+        definitions_dir: str = "rule_definitions",
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        workers: int | None = None,
+    ):
+        self.rules_dir = rules_dir
+        self.definitions_dir = Path(definitions_dir)
+        self.cache_dir = Path(cache_dir)
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+
+    def _rule_hash(self, rule: GrammarRule) -> str:
+        """Hash a rule's compiled form together with its definition file"""
+        digest = hashlib.sha256(rule.model_dump_json().encode("utf-8"))
+        source = self.definitions_dir / f"{rule.rule_id}.py"
+        if source.exists():
+            digest.update(source.read_bytes())
+        return digest.hexdigest()
+
+    def run(self, force: bool = False) -> list[RuleRegressionResult]:
+        """Check all rules, skipping those unchanged since they last passed"""
+        registry = RuleRegistry()
+        registry.load_rules_from_directory(self.rules_dir)
+
+        state_path = self.cache_dir / STATE_FILE
+        state = _read_json(state_path)
+        engine = engine_version()
+        previous = state.get("rules", {}) if state.get("engine") == engine else {}
+
+        results: dict[str, RuleRegressionResult] = {}
+        rule_hashes = {}
+        pending: list[GrammarRule] = []
+        for rule in registry.rules:
+            rule_hashes[rule.rule_id] = self._rule_hash(rule)
+            if not force and previous.get(rule.rule_id) == rule_hashes[rule.rule_id]:
+                results[rule.rule_id] = RuleRegressionResult(
+                    rule_id=rule.rule_id, rule_name=rule.name, cached=True
+                )
+            else:
+                pending.append(rule)
+
+        token_cache = ExampleTokenCache(
+            self.cache_dir / TOKEN_CACHE_FILE, tokenizer_version(JanomeBackend)
+        )
+        tasks = []
+        for rule in pending:
+            tokenized = {}
+            for example in rule.examples:
+                tokens = token_cache.get(example)
+                if tokens is not None:
+                    tokenized[example] = tokens
+            tasks.append((rule, tokenized))
+
+        if self.workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                outcomes = list(executor.map(check_rule, *zip(*tasks)))
+        else:
+            outcomes = [check_rule(rule, tokenized) for rule, tokenized in tasks]
+
+        for rule, (failures, new_tokens) in zip(pending, outcomes):
+            results[rule.rule_id] = RuleRegressionResult(
+                rule_id=rule.rule_id, rule_name=rule.name, failures=failures
+            )
+            for example, tokens in new_tokens.items():
+                token_cache.put(example, tokens)
+        token_cache.save()
+
+        # Only passing rules may be skipped next time
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        _write_json(
+            state_path,
+            {
+                "engine": engine,
+                "rules": {
+                    rule_id: rule_hashes[rule_id]
+                    for rule_id, result in results.items()
+                    if result.passed
+                },
+            },
+        )
+
+        return [results[rule.rule_id] for rule in registry.rules]
@@ -0,0 +1,148 @@
+"""Timed spans for the stages of tokenization and matching
+
+Code under ``use_tracer(tracer)`` reports each pipeline stage as a span:
+``parse_text`` emits ``cache_lookup``, ``tokenize``, ``convert`` and
+``cache_store``, and rule matching emits ``match`` with a ``rule`` child per
+rule and a ``pattern`` grandchild per pattern when the tracer asks for them.
+The current tracer is held in a context variable, so it follows a request
+across threads started with a copied context and across asyncio tasks.
+
+Without a tracer the no-op ``NullTracer`` is used, whose spans cost one
+context variable lookup per stage.
+"""
+
+import json
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from contextvars import ContextVar
+from operator import attrgetter
+from pathlib import Path
+from typing import Any, NamedTuple
+
+
+class TraceSpan(NamedTuple):
+    """A finished span; times are seconds relative to the tracer's creation"""
+
+    name: str
+    start: float
+    duration: float
+    parent: int | None  # Index of the enclosing span in the tracer's spans
+    attributes: dict[str, Any]
+
+
+class _DiscardedAttributes(dict):
+    """Attribute dict of a span nobody records"""
+
+    def __setitem__(self, key, value):
+        pass
+
+
+class NullTracer:
+    """Tracer that records nothing (the default)"""
+
+    # Whether matching should emit a child span per rule, and per pattern
+    rule_spans = False
+    pattern_spans = False
+
+    _span = nullcontext(_DiscardedAttributes())
+
+    def span(self, name: str, **attributes: Any) -> AbstractContextManager[dict]:
+        """Time a stage; the yielded dict collects attributes known at the end"""
+        return self._span
+
+
+class InMemoryTracer(NullTracer):
+    """Tracer collecting the spans of one request or task
+
+    Spans are kept in the order they were entered, so parents precede their
+    children. A tracer follows one flow of work; give concurrent requests
+    their own tracers.
+    """
+
+    def __init__(self, rule_spans: bool = False, pattern_spans: bool = False):
+        self.rule_spans = rule_spans or pattern_spans
+        self.pattern_spans = pattern_spans
+        self.spans: list[TraceSpan] = []
+        self._origin = time.perf_counter()
+        self._stack: list[int] = []
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[dict]:
+        index = len(self.spans)
+        parent = self._stack[-1] if self._stack else None
+        start = time.perf_counter() - self._origin
+        self.spans.append(TraceSpan(name, start, 0.0, parent, attributes))
+        self._stack.append(index)
+        try:
+            yield attributes
+        finally:
+            self._stack.pop()
+            duration = time.perf_counter() - self._origin - start
+            self.spans[index] = self.spans[index]._replace(duration=duration)
+
+    def find(self, name: str) -> list[TraceSpan]:
+        """Get the spans with a name, in order"""
+        return [span for span in self.spans if span.name == name]
+
+    def slowest(self, name: str, count: int) -> list[TraceSpan]:
+        """Get up to ``count`` spans with a name, longest first"""
+        spans = sorted(self.find(name), key=attrgetter("duration"), reverse=True)
+        return spans[:count]
+
+    def children(self, span: TraceSpan) -> list[TraceSpan]:
+        """Get the direct children of a span"""
+        index = self.spans.index(span)
+        return [child for child in self.spans if child.parent == index]
+
+
+class JsonLinesExporter:
+    """Appends each exported trace as one JSON line to a file (thread-safe)"""
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def export(self, tracer: InMemoryTracer, **fields: Any):
+        """Write the tracer's spans, plus any extra fields, as one line"""
+        record = {
+            **fields,
+            "spans": [
+                {
+                    "name": span.name,
+                    "start_ms": round(span.start * 1000, 3),
+                    "duration_ms": round(span.duration * 1000, 3),
+                    "parent": span.parent,
+                    **span.attributes,
+                }
+                for span in tracer.spans
+            ],
+        }
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+
+NULL_TRACER = NullTracer()
+
+_current_tracer: ContextVar[NullTracer] = ContextVar(
+    "kotogram_tracer", default=NULL_TRACER
+)
+
+
+def get_tracer() -> NullTracer:
+    """Get the tracer of the current context"""
+    return _current_tracer.get()
+
+
+@contextmanager
+def use_tracer(tracer: NullTracer) -> Iterator[NullTracer]:
+    """Trace the pipeline stages run inside the block with ``tracer``"""
+    token = _current_tracer.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _current_tracer.reset(token)
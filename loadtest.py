@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""Load-testing harness for the Kotogram API
+
+Drives ``app.py`` in-process (through its ASGI interface) or a running
+server with a sweep of concurrent clients, and reports latency percentiles,
+throughput and error rates per endpoint and concurrency level as JSON.
+
+In-process, request handlers run on the clients' own event loop, so
+latencies leave out the queueing a server's socket and worker pool add.
+Use ``--url`` against a running server for meaningful p95/p99 figures at
+high concurrency; the in-process mode suits quick comparisons of code.
+
+Each client sends requests back to back for the duration of a level.
+Request texts join a number of sentences drawn from ``--mix``, so long and
+short inputs can be mixed in realistic proportions.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import math
+import random
+import sys
+import time
+from pathlib import Path
+
+from benchmark import load_sentences
+from kotogram import KotogramAnalyzer
+
+try:
+    import httpx
+except ImportError:
+    sys.exit("loadtest.py requires httpx: pip install httpx")
+
+SCENARIOS = ("parse", "match", "parse-and-match")
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted values"""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(fraction * len(sorted_values))
+    return sorted_values[max(rank, 1) - 1]
+
+
+def build_payloads(
+    scenario: str, sentences: list[str], mix: list[int], count: int, seed: int
+) -> list[dict]:
+    """Build request bodies joining ``mix``-sampled numbers of sentences"""
+    rng = random.Random(seed)
+    texts = ["".join(rng.choices(sentences, k=rng.choice(mix))) for _ in range(count)]
+    if scenario != "match":
+        return [{"text": text} for text in texts]
+
+    # The match endpoint takes tokens, which are prepared up front
+    analyzer = KotogramAnalyzer()
+    return [
+        {
+            "tokens": [
+                token.model_dump(mode="json") for token in analyzer.parse_text(text)
+            ]
+        }
+        for text in texts
+    ]
+
+
+async def run_level(
+    client: httpx.AsyncClient,
+    scenario: str,
+    payloads: list[dict],
+    concurrency: int,
+    duration: float,
+) -> dict:
+    """Run ``concurrency`` clients for ``duration`` seconds and summarize"""
+    latencies: list[float] = []
+    errors: dict[str, int] = {}
+    deadline = time.perf_counter() + duration
+
+    async def client_loop(offset: int):
+        index = offset
+        while time.perf_counter() < deadline:
+            payload = payloads[index % len(payloads)]
+            index += concurrency
+            start = time.perf_counter()
+            error: str | None
+            try:
+                response = await client.post(f"/{scenario}", json=payload)
+            except httpx.HTTPError as e:
+                error = type(e).__name__
+            else:
+                error = None if response.is_success else str(response.status_code)
+            if error is None:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors[error] = errors.get(error, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client_loop(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    error_count = sum(errors.values())
+    total = len(latencies) + error_count
+    return {
+        "scenario": scenario,
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": error_count,
+        "error_rate": round(error_count / total, 4) if total else 0.0,
+        "error_kinds": errors,
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(total / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+    }
+
+
+async def run_sweep(
+    base_url: str | None,
+    scenarios: list[str],
+    sentences: list[str],
+    mix: list[int],
+    levels: list[int],
+    duration: float,
+    seed: int,
+) -> list[dict]:
+    """Run every scenario at every concurrency level, in increasing order"""
+    if base_url is None:
+        # Keep the app's startup messages out of the JSON report
+        with contextlib.redirect_stdout(sys.stderr):
+            from app import app
+
+        transport = httpx.ASGITransport(app=app)
+        base_url = "http://kotogram"
+    else:
+        transport = None
+
+    results = []
+    for scenario in scenarios:
+        payloads = build_payloads(scenario, sentences, mix, 200, seed)
+        for concurrency in sorted(levels):
+            limits = httpx.Limits(
+                max_connections=concurrency, max_keepalive_connections=concurrency
+            )
+            async with httpx.AsyncClient(
+                base_url=base_url, transport=transport, limits=limits, timeout=60.0
+            ) as client:
+                # A warm-up round lets every server worker thread load its tokenizer
+                warm_up = await asyncio.gather(
+                    *(
+                        client.post(f"/{scenario}", json=payloads[i % len(payloads)])
+                        for i in range(concurrency)
+                    ),
+                    return_exceptions=True,
+                )
+                failures = [
+                    (
+                        type(response).__name__
+                        if isinstance(response, BaseException)
+                        else str(response.status_code)
+                    )
+                    for response in warm_up
+                    if isinstance(response, BaseException) or not response.is_success
+                ]
+                if failures:
+                    print(
+                        f"Warm-up of {scenario} with {concurrency} clients: "
+                        f"{len(failures)} failed ({', '.join(sorted(set(failures)))})",
+                        file=sys.stderr,
+                    )
+                print(
+                    f"Running {scenario} with {concurrency} clients...",
+                    file=sys.stderr,
+                )
+                results.append(
+                    await run_level(client, scenario, payloads, concurrency, duration)
+                )
+    return results
+
+
+def parse_int_list(value: str) -> list[int]:
+    """Parse a comma-separated list of positive integers"""
+    numbers = [int(part) for part in value.split(",")]
+    if any(number < 1 for number in numbers):
+        raise ValueError(value)
+    return numbers
+
+
+def main():
+    """Main function to run the load test"""
+    parser = argparse.ArgumentParser(description="Load-test the Kotogram API")
+    parser.add_argument(
+        "--url",
+        help="Base URL of a running server (default: drive app.py in-process, "
+        "which leaves server queueing out of the latencies)",
+    )
+    parser.add_argument(
+        "--scenarios",
+        default=",".join(SCENARIOS),
+        help=f"Comma-separated endpoints to test (default: {','.join(SCENARIOS)})",
+    )
+    parser.add_argument(
+        "--concurrency",
+        default="50,200,1000",
+        help="Comma-separated concurrent client counts (default: 50,200,1000)",
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=10.0,
+        help="Seconds to run each concurrency level (default: 10)",
+    )
+    parser.add_argument(
+        "--mix",
+        default="1,1,1,2,5",
+        help="Sentences per request, sampled uniformly (default: 1,1,1,2,5)",
+    )
+    parser.add_argument(
+        "--input", help="File with one sentence per line (default: rule examples)"
+    )
+    parser.add_argument(
+        "--rules-dir", default="rules", help="Rules directory (default: rules)"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+
+    args = parser.parse_args()
+
+    scenarios = args.scenarios.split(",")
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+    try:
+        levels = parse_int_list(args.concurrency)
+        mix = parse_int_list(args.mix)
+    except ValueError as e:
+        parser.error(f"Invalid list of positive integers: {e}")
+    if not args.input and not Path(args.rules_dir).is_dir():
+        parser.error(f"Rules directory not found: {args.rules_dir}")
+
+    sentences = load_sentences(args.input, args.rules_dir)
+    results = asyncio.run(
+        run_sweep(args.url, scenarios, sentences, mix, levels, args.duration, args.seed)
+    )
+
+    report = json.dumps(results, ensure_ascii=False, indent=2)
+    print(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report)
+
+
+if __name__ == "__main__":
+    main()
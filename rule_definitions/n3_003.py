@@ -14,9 +14,7 @@ def create_rule() -> GrammarRule:
                     *CommonPatterns.VERB_MASU,
                     TokenPattern(
                         value="あがる",
-                        alternatives=[
-                            TokenPattern(value="上がる"),
-                        ],
+                        alternatives=(TokenPattern(value="上がる"),),
                     ),
                 ]
             ),
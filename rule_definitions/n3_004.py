@@ -14,9 +14,7 @@ def create_rule() -> GrammarRule:
                     *CommonPatterns.VERB_MASU,
                     TokenPattern(
                         value="いい",
-                        alternatives=[
-                            TokenPattern(value="よい"),
-                        ],
+                        alternatives=(TokenPattern(value="よい"),),
                     ),
                 ]
             ),
@@ -17,10 +17,10 @@ def create_rule() -> GrammarRule:
                     TokenPattern(value="おかげ"),
                     TokenPattern(
                         value="で",
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(value="だ"),
                             TokenPattern(value="です"),
-                        ],
+                        ),
                     ),
                 ]
             ),
@@ -34,10 +34,10 @@ def create_rule() -> GrammarRule:
                     TokenPattern(value="おかげ"),
                     TokenPattern(
                         value="で",
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(value="だ"),
                             TokenPattern(value="です"),
-                        ],
+                        ),
                     ),
                 ]
             ),
@@ -48,10 +48,10 @@ def create_rule() -> GrammarRule:
                     TokenPattern(value="おかげ"),
                     TokenPattern(
                         value="で",
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(value="だ"),
                             TokenPattern(value="です"),
-                        ],
+                        ),
                     ),
                 ]
             ),
@@ -62,10 +62,10 @@ def create_rule() -> GrammarRule:
                     TokenPattern(value="おかげ"),
                     TokenPattern(
                         value="で",
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(value="だ"),
                             TokenPattern(value="です"),
-                        ],
+                        ),
                     ),
                 ]
             ),
@@ -76,10 +76,10 @@ def create_rule() -> GrammarRule:
                     TokenPattern(value="おかげ"),
                     TokenPattern(
                         value="で",
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(value="だ"),
                             TokenPattern(value="です"),
-                        ],
+                        ),
                     ),
                 ]
             ),
@@ -93,10 +93,10 @@ def create_rule() -> GrammarRule:
                     TokenPattern(value="おかげ"),
                     TokenPattern(
                         value="で",
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(value="だ"),
                             TokenPattern(value="です"),
-                        ],
+                        ),
                     ),
                 ]
             ),
@@ -106,22 +106,22 @@ def create_rule() -> GrammarRule:
                     TokenPattern(
                         part_of_speech=PartOfSpeech.NOUN,
                         pos_detail=POSDetailType.NOUN_ADJECTIVE_VERBAL_STEM,
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(
                                 part_of_speech=PartOfSpeech.NOUN,
                                 pos_detail=POSDetailType.NOUN_NAI_ADJECTIVE_STEM,
                             ),
-                        ],
+                        ),
                     ),
                     TokenPattern(value="だっ"),
                     TokenPattern(value="た"),
                     TokenPattern(value="おかげ"),
                     TokenPattern(
                         value="で",
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(value="だ"),
                             TokenPattern(value="です"),
-                        ],
+                        ),
                     ),
                 ]
             ),
@@ -15,17 +15,17 @@ def create_rule() -> GrammarRule:
                     TokenPattern(value="から"),
                     TokenPattern(
                         value="言う",
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(value="言え"),
                             TokenPattern(value="言っ"),
-                        ],
+                        ),
                     ),
                     TokenPattern(
                         value="と",
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(value="ば"),
                             TokenPattern(value="て"),
-                        ],
+                        ),
                     ),
                 ]
             ),
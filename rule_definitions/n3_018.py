@@ -15,15 +15,11 @@ def create_rule() -> GrammarRule:
                     TokenPattern(value="から"),
                     TokenPattern(
                         value="する",
-                        alternatives=[
-                            TokenPattern(value="すれ"),
-                        ],
+                        alternatives=(TokenPattern(value="すれ"),),
                     ),
                     TokenPattern(
                         value="と",
-                        alternatives=[
-                            TokenPattern(value="ば"),
-                        ],
+                        alternatives=(TokenPattern(value="ば"),),
                     ),
                 ]
             ),
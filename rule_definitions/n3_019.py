@@ -1,6 +1,7 @@
 """Rule definition for ～から～にかけて"""
 
 from kotogram.grammar import GrammarRule, GrammarRulePattern, TokenPattern
+from kotogram.patterns import CommonPatterns
 from kotogram.types import PartOfSpeech
 
 
@@ -13,7 +14,7 @@ def create_rule() -> GrammarRule:
                 patterns=[
                     TokenPattern(part_of_speech=PartOfSpeech.NOUN),
                     TokenPattern(value="から"),
-                    TokenPattern(),
+                    TokenPattern(max_tokens=5, stop=CommonPatterns.SENTENCE_END),
                     TokenPattern(part_of_speech=PartOfSpeech.NOUN),
                     TokenPattern(value="にかけて"),
                 ]
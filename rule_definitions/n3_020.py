@@ -15,17 +15,17 @@ def create_rule() -> GrammarRule:
                     TokenPattern(value="から"),
                     TokenPattern(
                         value="見る",
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(value="見れ"),
                             TokenPattern(value="見"),
-                        ],
+                        ),
                     ),
                     TokenPattern(
                         value="と",
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(value="ば"),
                             TokenPattern(value="て"),
-                        ],
+                        ),
                     ),
                 ]
             ),
@@ -15,10 +15,10 @@ def create_rule() -> GrammarRule:
                     *CommonPatterns.VERB_MASU,
                     TokenPattern(
                         value="きる",
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(value="きれる"),
                             TokenPattern(value="きれない"),
-                        ],
+                        ),
                     ),
                 ]
             ),
@@ -26,19 +26,19 @@ def create_rule() -> GrammarRule:
                 patterns=[
                     TokenPattern(
                         part_of_speech=PartOfSpeech.VERB,
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(
                                 part_of_speech=PartOfSpeech.VERB,
                                 infl_form=InflectionForm.INFLECTED,
                             ),
-                        ],
+                        ),
                     ),
                     TokenPattern(
                         value="きる",
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(value="きれる"),
                             TokenPattern(value="きれない"),
-                        ],
+                        ),
                     ),
                 ]
             ),
@@ -16,9 +16,7 @@ def create_rule() -> GrammarRule:
                     *CommonPatterns.VERB_OR_I_ADJ_PLAIN,
                     TokenPattern(
                         value="ぐらい",
-                        alternatives=[
-                            TokenPattern(value="くらい"),
-                        ],
+                        alternatives=(TokenPattern(value="くらい"),),
                     ),
                 ]
             ),
@@ -29,9 +27,7 @@ def create_rule() -> GrammarRule:
                     TokenPattern(value="たい"),
                     TokenPattern(
                         value="ぐらい",
-                        alternatives=[
-                            TokenPattern(value="くらい"),
-                        ],
+                        alternatives=(TokenPattern(value="くらい"),),
                     ),
                 ]
             ),
@@ -41,9 +37,7 @@ def create_rule() -> GrammarRule:
                     TokenPattern(part_of_speech=PartOfSpeech.NOUN),
                     TokenPattern(
                         value="ぐらい",
-                        alternatives=[
-                            TokenPattern(value="くらい"),
-                        ],
+                        alternatives=(TokenPattern(value="くらい"),),
                     ),
                 ]
             ),
@@ -53,9 +47,7 @@ def create_rule() -> GrammarRule:
                     TokenPattern(part_of_speech=PartOfSpeech.NOUN),
                     TokenPattern(
                         value="ぐらい",
-                        alternatives=[
-                            TokenPattern(value="くらい"),
-                        ],
+                        alternatives=(TokenPattern(value="くらい"),),
                     ),
                     TokenPattern(value="は"),
                     TokenPattern(value="ない"),
@@ -67,9 +59,7 @@ def create_rule() -> GrammarRule:
                     TokenPattern(part_of_speech=PartOfSpeech.NOUN),
                     TokenPattern(
                         value="ぐらい",
-                        alternatives=[
-                            TokenPattern(value="くらい"),
-                        ],
+                        alternatives=(TokenPattern(value="くらい"),),
                     ),
                     TokenPattern(part_of_speech=PartOfSpeech.NOUN),
                     TokenPattern(value="は"),
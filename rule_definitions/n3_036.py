@@ -17,11 +17,11 @@ def create_rule() -> GrammarRule:
                     TokenPattern(value="ん"),
                     TokenPattern(
                         value="",
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(value="じゃん"),
                             TokenPattern(value="じゃ"),
                             TokenPattern(value="ない"),
-                        ],
+                        ),
                     ),
                 ]
             ),
@@ -33,10 +33,10 @@ def create_rule() -> GrammarRule:
                     TokenPattern(value="ない"),
                     TokenPattern(
                         value="",
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(value="の"),
                             TokenPattern(value="か"),
-                        ],
+                        ),
                     ),
                 ]
             ),
@@ -47,11 +47,11 @@ def create_rule() -> GrammarRule:
                     TokenPattern(value="なん"),
                     TokenPattern(
                         value="",
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(value="じゃん"),
                             TokenPattern(value="じゃ"),
                             TokenPattern(value="ない"),
-                        ],
+                        ),
                     ),
                 ]
             ),
@@ -63,10 +63,10 @@ def create_rule() -> GrammarRule:
                     TokenPattern(value="ない"),
                     TokenPattern(
                         value="",
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(value="の"),
                             TokenPattern(value="か"),
-                        ],
+                        ),
                     ),
                 ]
             ),
@@ -78,10 +78,10 @@ def create_rule() -> GrammarRule:
                     TokenPattern(value="ない"),
                     TokenPattern(
                         value="",
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(value="の"),
                             TokenPattern(value="か"),
-                        ],
+                        ),
                     ),
                 ]
             ),
@@ -91,10 +91,10 @@ def create_rule() -> GrammarRule:
                     TokenPattern(part_of_speech=PartOfSpeech.VERB),
                     TokenPattern(
                         value="",
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(value="う"),
                             TokenPattern(value="よう"),
-                        ],
+                        ),
                     ),
                     TokenPattern(value="じゃ"),
                     TokenPattern(value="ない"),
@@ -15,10 +15,10 @@ def create_rule() -> GrammarRule:
                     TokenPattern(part_of_speech=PartOfSpeech.NOUN),
                     TokenPattern(
                         value="",
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(value="は"),
                             TokenPattern(value="も"),
-                        ],
+                        ),
                     ),
                     TokenPattern(value="する"),
                 ]
@@ -17,11 +17,11 @@ def create_rule() -> GrammarRule:
                     TokenPattern(value="せい"),
                     TokenPattern(
                         value="",
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(value="で"),
                             TokenPattern(value="だ"),
                             TokenPattern(value="か"),
-                        ],
+                        ),
                     ),
                 ]
             ),
@@ -32,11 +32,11 @@ def create_rule() -> GrammarRule:
                     TokenPattern(value="せい"),
                     TokenPattern(
                         value="",
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(value="で"),
                             TokenPattern(value="だ"),
                             TokenPattern(value="か"),
-                        ],
+                        ),
                     ),
                 ]
             ),
@@ -48,11 +48,11 @@ def create_rule() -> GrammarRule:
                     TokenPattern(value="せい"),
                     TokenPattern(
                         value="",
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(value="で"),
                             TokenPattern(value="だ"),
                             TokenPattern(value="か"),
-                        ],
+                        ),
                     ),
                 ]
             ),
@@ -15,9 +15,7 @@ def create_rule() -> GrammarRule:
                     TokenPattern(value="そう"),
                     TokenPattern(
                         value="に",
-                        alternatives=[
-                            TokenPattern(value="も"),
-                        ],
+                        alternatives=(TokenPattern(value="も"),),
                     ),
                     TokenPattern(value="ない"),
                 ]
@@ -14,10 +14,10 @@ def create_rule() -> GrammarRule:
                     *CommonPatterns.VERB_TA,
                     TokenPattern(
                         value="きり",
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(value="っきり"),
                             TokenPattern(value="ぎり"),
-                        ],
+                        ),
                     ),
                 ]
             ),
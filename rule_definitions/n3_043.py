@@ -17,9 +17,7 @@ def create_rule() -> GrammarRule:
                     TokenPattern(value="だけ"),
                     TokenPattern(
                         value="で",
-                        alternatives=[
-                            TokenPattern(value="じゃ"),
-                        ],
+                        alternatives=(TokenPattern(value="じゃ"),),
                     ),
                     TokenPattern(value="なく"),
                 ]
@@ -31,9 +29,7 @@ def create_rule() -> GrammarRule:
                     TokenPattern(value="だけ"),
                     TokenPattern(
                         value="で",
-                        alternatives=[
-                            TokenPattern(value="じゃ"),
-                        ],
+                        alternatives=(TokenPattern(value="じゃ"),),
                     ),
                     TokenPattern(value="なく"),
                 ]
@@ -46,9 +42,7 @@ def create_rule() -> GrammarRule:
                     TokenPattern(value="だけ"),
                     TokenPattern(
                         value="で",
-                        alternatives=[
-                            TokenPattern(value="じゃ"),
-                        ],
+                        alternatives=(TokenPattern(value="じゃ"),),
                     ),
                     TokenPattern(value="なく"),
                 ]
@@ -60,9 +54,7 @@ def create_rule() -> GrammarRule:
                     TokenPattern(value="だけ"),
                     TokenPattern(
                         value="で",
-                        alternatives=[
-                            TokenPattern(value="じゃ"),
-                        ],
+                        alternatives=(TokenPattern(value="じゃ"),),
                     ),
                     TokenPattern(value="なく"),
                 ]
@@ -17,9 +17,7 @@ def create_rule() -> GrammarRule:
                     TokenPattern(value="だけ"),
                     TokenPattern(
                         value="で",
-                        alternatives=[
-                            TokenPattern(value="じゃ"),
-                        ],
+                        alternatives=(TokenPattern(value="じゃ"),),
                     ),
                     TokenPattern(value="は"),
                 ]
@@ -31,9 +29,7 @@ def create_rule() -> GrammarRule:
                     TokenPattern(value="だけ"),
                     TokenPattern(
                         value="で",
-                        alternatives=[
-                            TokenPattern(value="じゃ"),
-                        ],
+                        alternatives=(TokenPattern(value="じゃ"),),
                     ),
                     TokenPattern(value="は"),
                 ]
@@ -45,9 +41,7 @@ def create_rule() -> GrammarRule:
                     TokenPattern(value="だけ"),
                     TokenPattern(
                         value="で",
-                        alternatives=[
-                            TokenPattern(value="じゃ"),
-                        ],
+                        alternatives=(TokenPattern(value="じゃ"),),
                     ),
                     TokenPattern(value="は"),
                 ]
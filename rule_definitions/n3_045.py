@@ -15,9 +15,7 @@ def create_rule() -> GrammarRule:
                     TokenPattern(value="に"),
                     TokenPattern(
                         value="する",
-                        alternatives=[
-                            TokenPattern(value="し"),
-                        ],
+                        alternatives=(TokenPattern(value="し"),),
                     ),
                 ]
             ),
@@ -35,12 +35,12 @@ def create_rule() -> GrammarRule:
                     TokenPattern(
                         part_of_speech=PartOfSpeech.NOUN,
                         pos_detail=POSDetailType.NOUN_ADJECTIVE_VERBAL_STEM,
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(
                                 part_of_speech=PartOfSpeech.NOUN,
                                 pos_detail=POSDetailType.NOUN_NAI_ADJECTIVE_STEM,
                             ),
-                        ],
+                        ),
                     ),
                     TokenPattern(value="だって"),
                 ]
@@ -58,12 +58,12 @@ def create_rule() -> GrammarRule:
                     TokenPattern(
                         part_of_speech=PartOfSpeech.NOUN,
                         pos_detail=POSDetailType.NOUN_PRONOUN,
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(
                                 part_of_speech=PartOfSpeech.NOUN,
                                 pos_detail=POSDetailType.NOUN_ADVERBIAL,
                             ),
-                        ],
+                        ),
                     ),
                     TokenPattern(value="だって"),
                 ]
@@ -1,6 +1,7 @@
 """Rule definition for たとえ/たとい〜ても"""
 
 from kotogram.grammar import GrammarRule, GrammarRulePattern, TokenPattern
+from kotogram.patterns import CommonPatterns
 from kotogram.types import PartOfSpeech, POSDetailType
 
 
@@ -14,9 +15,7 @@ def create_rule() -> GrammarRule:
                 patterns=[
                     TokenPattern(
                         value="たとえ",
-                        alternatives=[
-                            TokenPattern(value="たとい"),
-                        ],
+                        alternatives=(TokenPattern(value="たとい"),),
                     ),
                     TokenPattern(
                         part_of_speech=PartOfSpeech.VERB,
@@ -31,9 +30,7 @@ def create_rule() -> GrammarRule:
                 patterns=[
                     TokenPattern(
                         value="たとえ",
-                        alternatives=[
-                            TokenPattern(value="たとい"),
-                        ],
+                        alternatives=(TokenPattern(value="たとい"),),
                     ),
                     TokenPattern(
                         part_of_speech=PartOfSpeech.ADJECTIVE,
@@ -48,19 +45,17 @@ def create_rule() -> GrammarRule:
                 patterns=[
                     TokenPattern(
                         value="たとえ",
-                        alternatives=[
-                            TokenPattern(value="たとい"),
-                        ],
+                        alternatives=(TokenPattern(value="たとい"),),
                     ),
                     TokenPattern(
                         part_of_speech=PartOfSpeech.NOUN,
                         pos_detail=POSDetailType.NOUN_ADJECTIVE_VERBAL_STEM,
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(
                                 part_of_speech=PartOfSpeech.NOUN,
                                 pos_detail=POSDetailType.NOUN_NAI_ADJECTIVE_STEM,
                             ),
-                        ],
+                        ),
                     ),
                     TokenPattern(value="でも"),
                 ]
@@ -70,25 +65,21 @@ def create_rule() -> GrammarRule:
                 patterns=[
                     TokenPattern(
                         value="たとえ",
-                        alternatives=[
-                            TokenPattern(value="たとい"),
-                        ],
+                        alternatives=(TokenPattern(value="たとい"),),
                     ),
                     TokenPattern(part_of_speech=PartOfSpeech.NOUN),
                     TokenPattern(value="で"),
                     TokenPattern(value="も"),
                 ]
             ),
-            # Pattern 5: たとえ/たとい + [any tokens] + て + も (flexible pattern for complex structures)
+            # Pattern 5: たとえ/たとい + [up to 10 tokens of the same sentence] + て + も (flexible pattern for complex structures)
             GrammarRulePattern(
                 patterns=[
                     TokenPattern(
                         value="たとえ",
-                        alternatives=[
-                            TokenPattern(value="たとい"),
-                        ],
+                        alternatives=(TokenPattern(value="たとい"),),
                     ),
-                    TokenPattern(),  # Multi wildcard that matches any number of any token
+                    TokenPattern(max_tokens=10, stop=CommonPatterns.SENTENCE_END),
                     TokenPattern(value="て"),
                     TokenPattern(value="も"),
                 ]
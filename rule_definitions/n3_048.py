@@ -16,10 +16,10 @@ def create_rule() -> GrammarRule:
                     TokenPattern(value="ばかり"),
                     TokenPattern(
                         value="だ",
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(value="です"),
                             TokenPattern(value="で"),
-                        ],
+                        ),
                         optional=True,
                     ),
                 ]
@@ -13,11 +13,11 @@ def create_rule() -> GrammarRule:
                 patterns=[
                     TokenPattern(
                         part_of_speech=PartOfSpeech.VERB,
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(
                                 value="せ",
                             ),
-                        ],
+                        ),
                     ),
                     TokenPattern(
                         value="ず",
@@ -14,18 +14,18 @@ def create_rule() -> GrammarRule:
                     TokenPattern(
                         part_of_speech=PartOfSpeech.ADJECTIVE,
                         infl_type=InflectionType.ADJECTIVE_ISTEM,
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(
                                 part_of_speech=PartOfSpeech.NOUN,
                                 pos_detail=POSDetailType.NOUN_ADJECTIVE_VERBAL_STEM,
-                                alternatives=[
+                                alternatives=(
                                     TokenPattern(
                                         part_of_speech=PartOfSpeech.NOUN,
                                         pos_detail=POSDetailType.NOUN_NAI_ADJECTIVE_STEM,
                                     ),
-                                ],
+                                ),
                             ),
-                        ],
+                        ),
                     ),
                     TokenPattern(
                         value="がる",
@@ -37,9 +37,7 @@ def create_rule() -> GrammarRule:
                     TokenPattern(
                         part_of_speech=PartOfSpeech.VERB,
                         value="怖がる",
-                        alternatives=[
-                            TokenPattern(value="可愛がる"),
-                        ],
+                        alternatives=(TokenPattern(value="可愛がる"),),
                     ),
                 ]
             ),
@@ -19,10 +19,10 @@ def create_rule() -> GrammarRule:
                     ),
                     TokenPattern(
                         part_of_speech=PartOfSpeech.AUXILIARY_VERB,
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(value="だ"),
                             TokenPattern(value="です"),
-                        ],
+                        ),
                     ),
                 ]
             ),
@@ -34,10 +34,10 @@ def create_rule() -> GrammarRule:
                     ),
                     TokenPattern(
                         part_of_speech=PartOfSpeech.AUXILIARY_VERB,
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(value="だ"),
                             TokenPattern(value="です"),
-                        ],
+                        ),
                     ),
                 ]
             ),
@@ -49,10 +49,10 @@ def create_rule() -> GrammarRule:
                     ),
                     TokenPattern(
                         part_of_speech=PartOfSpeech.AUXILIARY_VERB,
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(value="だっ"),
                             TokenPattern(value="だ"),
-                        ],
+                        ),
                     ),
                     TokenPattern(
                         value="た",
@@ -63,10 +63,10 @@ def create_rule() -> GrammarRule:
                     ),
                     TokenPattern(
                         part_of_speech=PartOfSpeech.AUXILIARY_VERB,
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(value="だ"),
                             TokenPattern(value="です"),
-                        ],
+                        ),
                     ),
                 ]
             ),
@@ -79,10 +79,10 @@ def create_rule() -> GrammarRule:
                     ),
                     TokenPattern(
                         part_of_speech=PartOfSpeech.AUXILIARY_VERB,
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(value="だ"),
                             TokenPattern(value="です"),
-                        ],
+                        ),
                     ),
                 ]
             ),
@@ -98,11 +98,11 @@ def create_rule() -> GrammarRule:
                     ),
                     TokenPattern(
                         part_of_speech=PartOfSpeech.AUXILIARY_VERB,
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(value="だ"),
                             TokenPattern(value="な"),
                             TokenPattern(value="です"),
-                        ],
+                        ),
                     ),
                 ]
             ),
@@ -117,11 +117,11 @@ def create_rule() -> GrammarRule:
                     ),
                     TokenPattern(
                         part_of_speech=PartOfSpeech.AUXILIARY_VERB,
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(value="だ"),
                             TokenPattern(value="な"),
                             TokenPattern(value="です"),
-                        ],
+                        ),
                     ),
                 ]
             ),
@@ -136,11 +136,11 @@ def create_rule() -> GrammarRule:
                     ),
                     TokenPattern(
                         part_of_speech=PartOfSpeech.AUXILIARY_VERB,
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(value="だ"),
                             TokenPattern(value="な"),
                             TokenPattern(value="です"),
-                        ],
+                        ),
                     ),
                 ]
             ),
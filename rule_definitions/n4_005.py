@@ -16,11 +16,11 @@ def create_rule() -> GrammarRule:
                     TokenPattern(value="よう"),
                     TokenPattern(
                         value="だ",
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(value="に"),
                             TokenPattern(value="な"),
                             TokenPattern(value="です"),
-                        ],
+                        ),
                     ),
                 ]
             ),
@@ -30,11 +30,11 @@ def create_rule() -> GrammarRule:
                     TokenPattern(value="よう"),
                     TokenPattern(
                         value="だ",
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(value="に"),
                             TokenPattern(value="な"),
                             TokenPattern(value="です"),
-                        ],
+                        ),
                     ),
                 ]
             ),
@@ -44,11 +44,11 @@ def create_rule() -> GrammarRule:
                     TokenPattern(value="よう"),
                     TokenPattern(
                         value="だ",
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(value="に"),
                             TokenPattern(value="な"),
                             TokenPattern(value="です"),
-                        ],
+                        ),
                     ),
                 ]
             ),
@@ -58,11 +58,11 @@ def create_rule() -> GrammarRule:
                     TokenPattern(value="よう"),
                     TokenPattern(
                         value="だ",
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(value="に"),
                             TokenPattern(value="な"),
                             TokenPattern(value="です"),
-                        ],
+                        ),
                     ),
                 ]
             ),
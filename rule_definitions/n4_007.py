@@ -17,10 +17,10 @@ def create_rule() -> GrammarRule:
                     TokenPattern(value="みたい"),
                     TokenPattern(
                         value="だ",
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(value="な"),
                             TokenPattern(value="に"),
-                        ],
+                        ),
                     ),
                 ]
             ),
@@ -30,21 +30,21 @@ def create_rule() -> GrammarRule:
                     TokenPattern(
                         part_of_speech=PartOfSpeech.NOUN,
                         pos_detail=POSDetailType.NOUN_ADJECTIVE_VERBAL_STEM,
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(
                                 part_of_speech=PartOfSpeech.NOUN,
                                 pos_detail=POSDetailType.NOUN_NAI_ADJECTIVE_STEM,
                             ),
                             TokenPattern(part_of_speech=PartOfSpeech.NOUN),
-                        ],
+                        ),
                     ),
                     TokenPattern(value="みたい"),
                     TokenPattern(
                         value="だ",
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(value="な"),
                             TokenPattern(value="に"),
-                        ],
+                        ),
                     ),
                 ]
             ),
@@ -55,10 +55,10 @@ def create_rule() -> GrammarRule:
                     TokenPattern(value="みたい"),
                     TokenPattern(
                         value="だ",
-                        alternatives=[
+                        alternatives=(
                             TokenPattern(value="な"),
                             TokenPattern(value="に"),
-                        ],
+                        ),
                     ),
                 ]
             ),
@@ -0,0 +1,13 @@
+"""Builders shared by several test modules"""
+
+from kotogram import GrammarRule, GrammarRulePattern, TokenPattern
+
+
+def literal_rule(value: str, category: str, index: int) -> GrammarRule:
+    """Build a rule matching a single literal token"""
+    return GrammarRule(
+        name=f"{value}_rule",
+        category=category,
+        index=index,
+        patterns=[GrammarRulePattern(patterns=[TokenPattern(value=value)])],
+    )
@@ -0,0 +1,113 @@
+"""Tests for static grammar rule analysis"""
+
+from kotogram import GrammarRule, GrammarRulePattern, PartOfSpeech, TokenPattern
+from kotogram.analysis import analyze_pattern, analyze_rule
+
+
+class TestPatternAnalysis:
+    """Test analyze_pattern"""
+
+    def test_span_bounds(self):
+        """Test min/max spans with optional tokens"""
+        pattern = GrammarRulePattern(
+            patterns=[
+                TokenPattern(part_of_speech=PartOfSpeech.NOUN),
+                TokenPattern(value="の", optional=True),
+                TokenPattern(value="間"),
+            ]
+        )
+        analysis = analyze_pattern(pattern)
+
+        assert (analysis.min_span, analysis.max_span) == (2, 3)
+        assert not analysis.has_unbounded_wildcard
+
+    def test_first_set_skips_optional(self):
+        """Test that optional leading tokens extend the first-set"""
+        pattern = GrammarRulePattern(
+            patterns=[
+                TokenPattern(value="たとえ", optional=True),
+                TokenPattern(value="て"),
+                TokenPattern(value="も"),
+            ]
+        )
+        analysis = analyze_pattern(pattern)
+
+        assert [p.value for p in analysis.first_set] == ["たとえ", "て"]
+
+    def test_required_literals(self):
+        """Test that literal alternatives form one required group"""
+        pattern = GrammarRulePattern(
+            patterns=[
+                TokenPattern(part_of_speech=PartOfSpeech.NOUN),
+                TokenPattern(
+                    value="ぐらい", alternatives=(TokenPattern(value="くらい"),)
+                ),
+                TokenPattern(value="だ", optional=True),
+            ]
+        )
+        analysis = analyze_pattern(pattern)
+
+        assert analysis.required_literals == [["ぐらい", "くらい"]]
+
+    def test_wildcard_cost_is_quadratic(self):
+        """Test that unbounded wildcards are unbounded and quadratic"""
+        pattern = GrammarRulePattern(
+            patterns=[
+                TokenPattern(value="から"),
+                TokenPattern(),
+                TokenPattern(value="にかけて"),
+            ]
+        )
+        analysis = analyze_pattern(pattern)
+
+        assert analysis.max_span is None
+        assert analysis.has_unbounded_wildcard
+        assert analysis.estimate_cost(100) > 10 * analysis.estimate_cost(10)
+
+    def test_bounded_gap_cost_is_linear(self):
+        """Test that bounded gaps keep span and cost bounded"""
+        pattern = GrammarRulePattern(
+            patterns=[
+                TokenPattern(value="から"),
+                TokenPattern(max_tokens=3, stop=(TokenPattern(value="。"),)),
+                TokenPattern(value="にかけて"),
+            ]
+        )
+        analysis = analyze_pattern(pattern)
+
+        assert (analysis.min_span, analysis.max_span) == (2, 5)
+        assert not analysis.has_unbounded_wildcard
+        assert analysis.required_literals == [["から"], ["にかけて"]]
+        assert analysis.estimate_cost(100) == 10 * analysis.estimate_cost(10)
+
+
+class TestRuleAnalysis:
+    """Test analyze_rule diagnostics"""
+
+    def test_trailing_wildcard_is_error(self):
+        """Test that a wildcard consuming the rest of the input is rejected"""
+        rule = GrammarRule(
+            name="trailing",
+            patterns=[
+                GrammarRulePattern(
+                    patterns=[TokenPattern(value="から"), TokenPattern()]
+                )
+            ],
+        )
+
+        assert analyze_rule(rule).errors
+
+    def test_broad_pattern_is_flagged(self):
+        """Test that patterns without literals are flagged"""
+        rule = GrammarRule(
+            name="broad",
+            patterns=[
+                GrammarRulePattern(
+                    patterns=[TokenPattern(part_of_speech=PartOfSpeech.NOUN)]
+                )
+            ],
+        )
+        analysis = analyze_rule(rule)
+
+        assert not analysis.errors
+        assert analysis.warnings
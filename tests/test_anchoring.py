@@ -0,0 +1,111 @@
+"""Tests for anchoring pattern search on required literals"""
+
+import random
+from pathlib import Path
+
+import pytest
+
+from kotogram import (
+    GrammarRulePattern,
+    KotogramAnalyzer,
+    LiteralPositions,
+    PartOfSpeech,
+    RuleRegistry,
+    TokenPattern,
+)
+
+
+class TestAnchoring:
+    """Test that literal anchors prune start positions without changing results"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """Tokenize a sentence with repeated literals"""
+        self.analyzer = KotogramAnalyzer()
+        # 猫 の おかげ で 、 犬 の おかげ だ 。
+        self.tokens = self.analyzer.parse_text("猫のおかげで、犬のおかげだ。")
+        self.literals = LiteralPositions(self.tokens)
+
+    def test_literal_positions(self):
+        """Test that surfaces and base forms map to their positions"""
+        assert self.literals.positions(("おかげ",)) == [2, 7]
+        assert self.literals.positions(("猫", "犬")) == [0, 5]
+        assert self.literals.positions(("鳥",)) == []
+
+    def test_starts_before_anchor(self):
+        """Test that only starts placing the anchor at a valid offset are tried"""
+        pattern = GrammarRulePattern(
+            patterns=[
+                TokenPattern(part_of_speech=PartOfSpeech.NOUN),
+                TokenPattern(value="の", optional=True),
+                TokenPattern(value="おかげ"),
+            ]
+        )
+
+        assert list(pattern._start_positions(self.tokens, self.literals)) == [
+            0,
+            1,
+            5,
+            6,
+        ]
+        assert pattern.find_all_spans(self.tokens, self.literals) == [(0, 3), (5, 8)]
+
+    def test_rarest_anchor(self):
+        """Test that the literal with the fewest occurrences is the anchor"""
+        pattern = GrammarRulePattern(
+            patterns=[
+                TokenPattern(value="の"),
+                TokenPattern(value="おかげ"),
+                TokenPattern(value="で"),
+            ]
+        )
+
+        assert list(pattern._start_positions(self.tokens, self.literals)) == [1]
+
+    def test_missing_anchor(self):
+        """Test that a pattern whose literal is absent tries no start"""
+        pattern = GrammarRulePattern(
+            patterns=[TokenPattern(), TokenPattern(value="鳥")]
+        )
+
+        assert not pattern._start_positions(self.tokens, self.literals)
+        assert not pattern.has_match(self.tokens, self.literals)
+
+    def test_unanchored_pattern(self):
+        """Test that patterns without required literals scan every start"""
+        pattern = GrammarRulePattern(
+            patterns=[
+                TokenPattern(part_of_speech=PartOfSpeech.NOUN),
+                TokenPattern(value="の", optional=True),
+            ]
+        )
+
+        assert pattern._start_positions(self.tokens, self.literals) == range(
+            len(self.tokens)
+        )
+
+    def test_rules_parity(self):
+        """Test anchored and full scans of every rule on shuffled tokens"""
+        if not Path("rules").is_dir():
+            pytest.skip("No rules directory")
+        registry = RuleRegistry()
+        registry.load_rules_from_directory("rules")
+        sequences = [
+            self.analyzer.parse_text(example)
+            for rule in registry.rules
+            for example in rule.examples
+        ]
+        pool = [token for tokens in sequences for token in tokens]
+        rng = random.Random(0)
+        sequences += [rng.choices(pool, k=rng.randint(1, 30)) for _ in range(50)]
+
+        for tokens in sequences:
+            literals = LiteralPositions(tokens)
+            for rule in registry.rules:
+                for pattern in rule.patterns:
+                    assert pattern.find_all_spans(tokens) == pattern.find_all_spans(
+                        tokens, literals
+                    )
+                    assert pattern.first_span(tokens) == pattern.first_span(
+                        tokens, None, literals
+                    )
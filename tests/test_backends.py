@@ -0,0 +1,94 @@
+"""Tests for tokenizer backends"""
+
+import pytest
+
+from kotogram import (
+    IpadicTextBackend,
+    JanomeBackend,
+    KotogramAnalyzer,
+    MeCabBackend,
+    TokenizerBackend,
+)
+from kotogram.backends import (
+    RawToken,
+    format_ipadic_line,
+    parse_ipadic_line,
+    parse_ipadic_output,
+)
+
+
+class TestIpadicParsing:
+    """Test parsing MeCab/IPADIC text output"""
+
+    def test_parse_line(self):
+        """Test that all nine features are mapped"""
+        token = parse_ipadic_line("寝\t動詞,自立,*,*,一段,連用形,寝る,ネ,ネ")
+
+        assert token == RawToken(
+            surface="寝",
+            part_of_speech="動詞,自立,*,*",
+            infl_type="一段",
+            infl_form="連用形",
+            base_form="寝る",
+            reading="ネ",
+            phonetic="ネ",
+        )
+
+    def test_parse_unknown_word(self):
+        """Test that unknown words get Janome's defaults"""
+        token = parse_ipadic_line("zzqx\t名詞,固有名詞,組織,*,*,*,*")
+
+        assert token.base_form == "zzqx"
+        assert token.reading == "*"
+        assert token.phonetic == "*"
+
+    def test_parse_output_skips_eos(self):
+        """Test that sentence markers and blank lines are skipped"""
+        output = "猫\t名詞,一般,*,*,*,*,猫,ネコ,ネコ\nEOS\n\n犬\t名詞,一般,*,*,*,*,犬,イヌ,イヌ\nEOS\n"
+
+        assert [t.surface for t in parse_ipadic_output(output)] == ["猫", "犬"]
+
+    @pytest.mark.parametrize(
+        "line", ["猫 名詞,一般,*,*,*,*,猫,ネコ,ネコ", "猫\t名詞,一般,*,*"]
+    )
+    def test_parse_invalid_line(self, line):
+        """Test that malformed lines are rejected"""
+        with pytest.raises(ValueError, match="IPADIC"):
+            parse_ipadic_line(line)
+
+
+class TestBackends:
+    """Test analyzers built on different backends"""
+
+    text = "赤ちゃんが寝ている間に、洗濯をしました。a,b"
+
+    def test_backends_satisfy_protocol(self):
+        """Test that the bundled backends implement TokenizerBackend"""
+        assert isinstance(JanomeBackend(), TokenizerBackend)
+        assert isinstance(IpadicTextBackend(), TokenizerBackend)
+
+    def test_default_backend(self):
+        """Test that Janome is used by default"""
+        assert isinstance(KotogramAnalyzer().backend, JanomeBackend)
+
+    def test_pretokenized_matches_janome(self):
+        """Test that Janome output fed back as IPADIC text gives equal tokens"""
+        janome = JanomeBackend()
+        output = "\n".join(
+            format_ipadic_line(token) for token in janome.tokenize(self.text)
+        )
+
+        expected = KotogramAnalyzer(janome).parse_text(self.text)
+        actual = KotogramAnalyzer(IpadicTextBackend()).parse_text(output)
+
+        assert actual == expected
+
+    def test_mecab_unavailable(self):
+        """Test that a missing MeCab binding gives an install hint"""
+        try:
+            import MeCab  # noqa: F401
+        except ImportError:
+            with pytest.raises(ImportError, match="mecab-python3"):
+                MeCabBackend()
+        else:
+            pytest.skip("MeCab is installed")
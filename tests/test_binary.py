@@ -0,0 +1,81 @@
+"""Tests for the MessagePack-compatible binary encoding"""
+
+from enum import Enum
+
+import pytest
+
+from kotogram import KotogramAnalyzer
+from kotogram.binary import MAX_DEPTH, packb, unpackb
+
+
+class TestPackUnpack:
+    """Test the stdlib MessagePack encoder and decoder"""
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            None,
+            True,
+            False,
+            0,
+            127,
+            128,
+            -1,
+            -33,
+            65536,
+            2**64 - 1,
+            -(2**63),
+            1.5,
+            "",
+            "名詞",
+            "あ" * 100,
+            b"\x00\x01",
+            list(range(20)),
+            {"tokens": [{"surface": "猫", "index": 3}]},
+        ],
+    )
+    def test_round_trip(self, value):
+        """Test that values survive an encode/decode round trip"""
+        assert unpackb(packb(value)) == value
+
+    def test_wire_format(self):
+        """Test that output matches the MessagePack specification"""
+        assert packb({"a": 1}) == b"\x81\xa1a\x01"
+        assert packb([None, True, -1]) == b"\x93\xc0\xc3\xff"
+        assert packb("a" * 32) == b"\xd9\x20" + b"a" * 32
+
+    def test_repeated_strings(self):
+        """Test that strings reused across a payload decode to equal values"""
+        tokens = KotogramAnalyzer().parse_text("猫と犬と猫。")
+        payload = {"tokens": [token.model_dump(mode="json") for token in tokens]}
+
+        assert unpackb(packb(payload)) == payload
+
+    def test_subclasses(self):
+        """Test that str and int subclasses are encoded by value"""
+
+        class Color(str, Enum):
+            RED = "red"
+
+        assert unpackb(packb({"color": Color.RED, "flag": True})) == {
+            "color": "red",
+            "flag": True,
+        }
+
+    def test_truncated_data(self):
+        """Test that truncated input is rejected"""
+        with pytest.raises(ValueError, match="Truncated"):
+            unpackb(packb("猫と犬")[:-1])
+
+    def test_trailing_data(self):
+        """Test that trailing bytes are rejected"""
+        with pytest.raises(ValueError, match="Trailing"):
+            unpackb(packb(1) + b"\x01")
+
+    def test_nesting_limit(self):
+        """Test that deeply nested input is rejected rather than recursed into"""
+        assert unpackb(b"\x91" * MAX_DEPTH + b"\xc0") is not None
+        with pytest.raises(ValueError, match="nested deeper"):
+            unpackb(b"\x91" * (MAX_DEPTH + 1) + b"\xc0")
+        with pytest.raises(ValueError, match="nested deeper"):
+            unpackb(b"\x91" * 100000 + b"\xc0")
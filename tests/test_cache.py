@@ -0,0 +1,127 @@
+"""Tests for the persistent tokenization cache"""
+
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from kotogram import IpadicTextBackend, KotogramAnalyzer, TokenCache
+from kotogram.cache import tokenizer_version
+
+
+class TestTokenCache:
+    """Test caching tokenizations in SQLite"""
+
+    text = "赤ちゃんが寝ている間に、洗濯をしました。"
+
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        """Set up a cache file and an analyzer using it"""
+        self.path = tmp_path / "cache" / "tokens.db"
+        self.cache = TokenCache(self.path)
+        self.analyzer = KotogramAnalyzer(cache=self.cache)
+        yield
+        self.cache.close()
+
+    def test_round_trip(self):
+        """Test that cached tokens equal freshly tokenized ones"""
+        expected = KotogramAnalyzer().parse_text(self.text)
+
+        assert self.analyzer.parse_text(self.text) == expected
+        assert len(self.cache) == 1
+        assert self.analyzer.parse_text(self.text) == expected
+        assert len(self.cache) == 1
+
+    def test_cache_hit_skips_backend(self):
+        """Test that a cached text is not tokenized again"""
+        self.analyzer.parse_text(self.text)
+        self.analyzer.backend = None
+
+        assert self.analyzer.parse_text(self.text)
+
+    def test_shared_between_instances(self):
+        """Test that another cache on the same file sees the entries"""
+        tokens = self.analyzer.parse_text(self.text)
+        version = self.analyzer.tokenizer_version
+
+        with TokenCache(self.path) as other:
+            assert other.get(version, self.text) == tokens
+            assert other.get(version, "猫") is None
+
+    def test_wal_mode(self):
+        """Test that the database allows concurrent readers and writers"""
+        connection = sqlite3.connect(self.path)
+        try:
+            assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        finally:
+            connection.close()
+
+    def test_version_separates_entries(self):
+        """Test that entries of another tokenizer version are not returned"""
+        tokens = self.analyzer.parse_text(self.text)
+
+        assert self.cache.get(self.analyzer.tokenizer_version, self.text) == tokens
+        assert self.cache.get("other-version", self.text) is None
+        assert tokenizer_version(IpadicTextBackend()) != (
+            self.analyzer.tokenizer_version
+        )
+
+    def test_concurrent_threads(self):
+        """Test that threads share the cache through their own connections"""
+        texts = [f"猫が{i}匹います。" for i in range(20)]
+        expected = [KotogramAnalyzer().parse_text(text) for text in texts]
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            assert list(executor.map(self.analyzer.parse_text, texts * 2)) == (
+                expected * 2
+            )
+        assert len(self.cache) == len(texts)
+
+    def test_clear(self):
+        """Test that clearing removes all entries"""
+        self.analyzer.parse_text(self.text)
+        self.cache.clear()
+
+        assert len(self.cache) == 0
+
+    def test_corrupt_entry_is_a_miss(self):
+        """Test that an undecodable entry is dropped and tokenized again"""
+        expected = self.analyzer.parse_text(self.text)
+        connection = sqlite3.connect(self.path)
+        try:
+            with connection:
+                connection.execute("UPDATE tokens SET tokens = x'c1'")
+        finally:
+            connection.close()
+
+        assert self.cache.get(self.analyzer.tokenizer_version, self.text) is None
+        assert len(self.cache) == 0
+        assert self.analyzer.parse_text(self.text) == expected
+        assert len(self.cache) == 1
+
+    def test_locked_database_does_not_block(self):
+        """Test that a write waiting on another process's lock is dropped fast"""
+        connection = sqlite3.connect(self.path, isolation_level=None)
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            start = time.perf_counter()
+            tokens = self.analyzer.parse_text(self.text)
+            elapsed = time.perf_counter() - start
+            connection.execute("ROLLBACK")
+        finally:
+            connection.close()
+
+        assert tokens
+        assert elapsed < 1.0
+        assert len(self.cache) == 0
+
+    def test_close_closes_every_thread(self):
+        """Test that close() closes connections opened by other threads"""
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(self.analyzer.parse_text, ["猫。", "犬。"] * 4))
+        self.cache.close()
+
+        # The write-ahead log is removed once the last connection closes
+        assert not self.path.with_name(f"{self.path.name}-wal").exists()
+        assert self.analyzer.parse_text("猫。")
@@ -0,0 +1,52 @@
+"""Tests for the compact columnar token encoding"""
+
+import pytest
+
+from kotogram import KotogramAnalyzer
+from kotogram.codec import CompactTokens
+
+
+class TestCompactTokens:
+    """Test CompactTokens encoding and decoding"""
+
+    def setup_method(self):
+        self.analyzer = KotogramAnalyzer()
+
+    def test_round_trip(self):
+        """Test that decoding an encoded sequence restores the tokens"""
+        tokens = self.analyzer.parse_text("赤ちゃんが寝ている間に、洗濯をしました。")
+        compact = CompactTokens.from_tokens(tokens)
+
+        assert len(compact) == len(tokens)
+        assert compact.to_tokens() == tokens
+
+    def test_string_table_is_interned(self):
+        """Test that repeated strings are stored once"""
+        tokens = self.analyzer.parse_text("猫と猫と猫")
+        compact = CompactTokens.from_tokens(tokens)
+
+        assert compact.strings.count("猫") == 1
+        assert compact.surface[0] == compact.surface[2] == compact.surface[4]
+
+    def test_json_round_trip(self):
+        """Test that the wire form validates back into the same tokens"""
+        tokens = self.analyzer.parse_text("この町は住みよいです。")
+        payload = CompactTokens.from_tokens(tokens).model_dump_json()
+
+        assert CompactTokens.model_validate_json(payload).to_tokens() == tokens
+
+    def test_mismatched_columns(self):
+        """Test that columns of different lengths are rejected"""
+        compact = CompactTokens.from_tokens(self.analyzer.parse_text("猫"))
+        compact.reading.append(0)
+
+        with pytest.raises(ValueError, match="same length"):
+            compact.to_tokens()
+
+    def test_out_of_range_ordinal(self):
+        """Test that unknown ordinals are rejected"""
+        compact = CompactTokens.from_tokens(self.analyzer.parse_text("猫"))
+        compact.part_of_speech[0] = 999
+
+        with pytest.raises(ValueError, match="out-of-range"):
+            compact.to_tokens()
@@ -0,0 +1,113 @@
+"""Tests for the memory-mapped corpus store"""
+
+import pytest
+
+from kotogram import (
+    GrammarRule,
+    GrammarRulePattern,
+    KotogramAnalyzer,
+    KotogramToken,
+    RuleRegistry,
+    TokenPattern,
+)
+from kotogram.corpus import Corpus, CorpusWriter, TokenView, build_corpus
+
+
+class TestCorpus:
+    """Test writing and reading corpus files"""
+
+    sentences = [
+        "赤ちゃんが寝ている間に、洗濯をしました。",
+        "猫が好き。",
+        "",
+        "zzqx,猫と猫と猫",
+    ]
+
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        """Write the sentences to a corpus file"""
+        self.analyzer = KotogramAnalyzer()
+        self.path = tmp_path / "corpus.ktg"
+        build_corpus(self.path, self.sentences, self.analyzer)
+
+    def test_round_trip(self):
+        """Test that texts and tokens are restored"""
+        with Corpus(self.path) as corpus:
+            assert len(corpus) == len(self.sentences)
+            for i, sentence in enumerate(self.sentences):
+                assert corpus.text(i) == sentence
+                assert corpus.tokens(i) == self.analyzer.parse_text(sentence)
+            assert corpus.token_count == sum(
+                len(self.analyzer.parse_text(s)) for s in self.sentences
+            )
+
+    def test_views_expose_token_fields(self):
+        """Test that views read the same fields as tokens"""
+        tokens = self.analyzer.parse_text(self.sentences[0])
+        with Corpus(self.path) as corpus:
+            views = corpus.views(0)
+
+            assert all(isinstance(view, TokenView) for view in views)
+            for view, token in zip(views, tokens):
+                for field in KotogramToken.model_fields:
+                    assert getattr(view, field) == getattr(token, field)
+
+    def test_columns(self):
+        """Test that columns and the string table are exposed by name"""
+        tokens = self.analyzer.parse_text(self.sentences[1])
+        with Corpus(self.path) as corpus:
+            token_range = corpus.token_range(1)
+            # Copy out the column, since a live slice would keep the file mapped
+            surfaces = corpus.column("surface").tolist()[
+                token_range.start : token_range.stop
+            ]
+
+            assert [corpus.string(i) for i in surfaces] == [t.surface for t in tokens]
+            assert len(corpus.column("infl_form")) == corpus.token_count
+            assert corpus.string_count > max(corpus.column("base_form"))
+            with pytest.raises(ValueError, match="Unknown corpus column"):
+                corpus.column("_string_offsets")
+
+    def test_query_matches_tokenized_text(self):
+        """Test that rules match views like freshly parsed tokens"""
+        registry = RuleRegistry()
+        registry.add_rule(
+            GrammarRule(
+                name="猫",
+                patterns=[GrammarRulePattern(patterns=[TokenPattern(value="猫")])],
+            )
+        )
+
+        with Corpus(self.path) as corpus:
+            results = list(corpus.query(registry, "count"))
+
+        assert [(i, [r.count for r in found]) for i, found in results] == [
+            (1, [1]),
+            (3, [3]),
+        ]
+
+    def test_empty_corpus(self):
+        """Test that a corpus without sentences can be written and read"""
+        path = self.path.with_name("empty.ktg")
+        with CorpusWriter(path):
+            pass
+
+        with Corpus(path) as corpus:
+            assert len(corpus) == 0
+            assert corpus.token_count == 0
+
+    def test_not_a_corpus(self):
+        """Test that other files are rejected"""
+        path = self.path.with_name("other.ktg")
+        path.write_bytes(b"not a corpus file at all, just some text")
+
+        with pytest.raises(ValueError, match="Not a corpus file"):
+            Corpus(path)
+
+    def test_truncated(self):
+        """Test that truncated files are rejected"""
+        path = self.path.with_name("truncated.ktg")
+        path.write_bytes(self.path.read_bytes()[:100])
+
+        with pytest.raises(ValueError, match="Truncated"):
+            Corpus(path)
@@ -90,10 +90,10 @@ class TestTokenPattern:
     def test_alternative_match_verb(self):
         """Test alternative pattern matching with verb"""
         pattern = TokenPattern(
-            alternatives=[
+            alternatives=(
                 TokenPattern(part_of_speech=PartOfSpeech.VERB),
                 TokenPattern(part_of_speech=PartOfSpeech.ADJECTIVE),
-            ]
+            )
         )
         verb_token = KotogramToken(
             surface="読む",
@@ -112,10 +112,10 @@ class TestTokenPattern:
     def test_alternative_match_adjective(self):
         """Test alternative pattern matching with adjective"""
         pattern = TokenPattern(
-            alternatives=[
+            alternatives=(
                 TokenPattern(part_of_speech=PartOfSpeech.VERB),
                 TokenPattern(part_of_speech=PartOfSpeech.ADJECTIVE),
-            ]
+            )
         )
         adj_token = KotogramToken(
             surface="美しい",
@@ -651,3 +651,113 @@ class TestWildcardPatterns:
         surfaces = [t.surface for t in match.matched_tokens]
         assert "から" in surfaces
         assert "まで" in surfaces
+
+
+class TestBoundedGaps:
+    """Test gap patterns with token limits and stop tokens"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.analyzer = KotogramAnalyzer()
+
+    def _rule(self, gap: TokenPattern) -> GrammarRule:
+        """Build a から + gap + まで rule"""
+        return GrammarRule(
+            name="gap",
+            patterns=[
+                GrammarRulePattern(
+                    patterns=[
+                        TokenPattern(value="から"),
+                        gap,
+                        TokenPattern(value="まで"),
+                    ]
+                )
+            ],
+        )
+
+    def _spans(self, rule: GrammarRule, text: str) -> list[tuple[int, int]]:
+        """Get the match positions of a rule in a text"""
+        tokens = self.analyzer.parse_text(text)
+        return [(m.start_pos, m.end_pos) for m in rule.match(tokens).pattern_matches]
+
+    def test_max_tokens(self):
+        """Test that a gap spans at most max_tokens tokens"""
+        text = "東京から大阪の駅まで"  # 東京 から 大阪 の 駅 まで
+
+        assert self._spans(self._rule(TokenPattern(max_tokens=3)), text) == [(1, 6)]
+        assert self._spans(self._rule(TokenPattern(max_tokens=2)), text) == []
+
+    def test_min_tokens(self):
+        """Test that a gap spans at least min_tokens tokens"""
+        rule = self._rule(TokenPattern(min_tokens=1, max_tokens=3))
+
+        assert self._spans(rule, "東京から大阪まで") == [(1, 4)]
+        assert self._spans(rule, "東京からまで") == []
+
+    def test_stop_tokens(self):
+        """Test that a gap does not cross a stop token"""
+        gap = TokenPattern(stop=(TokenPattern(pos_detail=POSDetailType.SYMBOL_PERIOD),))
+
+        assert self._spans(self._rule(gap), "東京から大阪まで") == [(1, 4)]
+        assert self._spans(self._rule(gap), "東京から。大阪まで") == []
+        assert self._spans(self._rule(TokenPattern()), "東京から。大阪まで") == [(1, 5)]
+
+    def test_trailing_gap(self):
+        """Test that a trailing gap consumes tokens up to its limits"""
+        rule = GrammarRule(
+            name="trailing",
+            patterns=[
+                GrammarRulePattern(
+                    patterns=[
+                        TokenPattern(value="から"),
+                        TokenPattern(
+                            max_tokens=5,
+                            stop=(
+                                TokenPattern(pos_detail=POSDetailType.SYMBOL_PERIOD),
+                            ),
+                        ),
+                    ]
+                )
+            ],
+        )
+
+        assert self._spans(rule, "東京から大阪まで。京都") == [(1, 4)]
+
+    def test_span_bounds(self):
+        """Test that bounded gaps give patterns a maximum span"""
+        pattern = GrammarRulePattern(
+            patterns=[
+                TokenPattern(value="から"),
+                TokenPattern(min_tokens=1, max_tokens=4),
+                TokenPattern(value="まで"),
+            ]
+        )
+
+        assert pattern.span_bounds() == (3, 6)
+
+    def test_several_bounded_gaps(self):
+        """Test that only unbounded gaps are limited to one per pattern"""
+        GrammarRulePattern(
+            patterns=[
+                TokenPattern(max_tokens=2),
+                TokenPattern(value="から"),
+                TokenPattern(max_tokens=2),
+            ]
+        )
+        with pytest.raises(ValueError, match="multi-wildcards"):
+            GrammarRulePattern(
+                patterns=[
+                    TokenPattern(stop=(TokenPattern(value="。"),)),
+                    TokenPattern(value="から"),
+                    TokenPattern(),
+                ]
+            )
+
+    def test_invalid_gaps(self):
+        """Test that gap settings are rejected where they cannot apply"""
+        with pytest.raises(ValueError, match="gap patterns"):
+            TokenPattern(value="から", max_tokens=2)
+        with pytest.raises(ValueError, match="gap patterns"):
+            TokenPattern(optional=True, max_tokens=2)
+        with pytest.raises(ValueError, match="less than min_tokens"):
+            TokenPattern(min_tokens=3, max_tokens=2)
@@ -0,0 +1,198 @@
+"""Tests for incremental document re-analysis"""
+
+import pytest
+
+from kotogram import (
+    GrammarRule,
+    GrammarRulePattern,
+    KotogramAnalyzer,
+    KotogramToken,
+    RuleRegistry,
+    TokenPattern,
+)
+from kotogram.incremental import IncrementalDocument, split_sentences
+from kotogram.types import (
+    InflectionForm,
+    InflectionType,
+    PartOfSpeech,
+    POSDetailType,
+)
+
+
+class CharacterAnalyzer(KotogramAnalyzer):
+    """Analyzer producing one token per character"""
+
+    def parse_text(self, text: str) -> list[KotogramToken]:
+        return [
+            KotogramToken(
+                surface=character,
+                part_of_speech=PartOfSpeech.NOUN,
+                pos_detail1=POSDetailType.NOUN_GENERAL,
+                pos_detail2=POSDetailType.UNKNOWN,
+                pos_detail3=POSDetailType.UNKNOWN,
+                infl_type=InflectionType.UNKNOWN,
+                infl_form=InflectionForm.UNKNOWN,
+                base_form=character,
+                reading=character,
+                phonetic=character,
+            )
+            for character in text
+        ]
+
+
+class TestSplitSentences:
+    """Test sentence splitting"""
+
+    def test_split_keeps_terminators(self):
+        """Test that sentences keep their terminators and rejoin losslessly"""
+        text = "猫が好き。犬も好き！本当？\n最後"
+        sentences = split_sentences(text)
+
+        assert sentences == ["猫が好き。", "犬も好き！", "本当？\n", "最後"]
+        assert "".join(sentences) == text
+
+
+class TestIncrementalDocument:
+    """Test IncrementalDocument edits"""
+
+    text = "赤ちゃんが寝ている間に、洗濯をしました。日本に留学したい。"
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """Set up analyzer, a bounded-span registry and a document"""
+        self.analyzer = KotogramAnalyzer()
+        self.registry = RuleRegistry()
+        self.registry.add_rule(
+            GrammarRule(
+                name="間に",
+                patterns=[
+                    GrammarRulePattern(
+                        patterns=[
+                            TokenPattern(value="間"),
+                            TokenPattern(value="に", optional=True),
+                        ]
+                    )
+                ],
+            )
+        )
+        self.document = IncrementalDocument(self.analyzer, self.registry, self.text)
+
+    def _assert_consistent(self):
+        """Assert the document equals one analyzed from scratch"""
+        fresh = IncrementalDocument(self.analyzer, self.registry, self.document.text)
+        assert self.document.tokens == fresh.tokens
+        assert self.document.matches == fresh.matches
+
+    def test_initial_analysis(self):
+        """Test that the initial text is tokenized and matched"""
+        assert self.document.text == self.text
+        assert [m.rule_name for m in self.document.matches] == ["間に"]
+
+    def test_edit_adds_match(self):
+        """Test that inserting a grammar point reports an added match"""
+        offset = self.text.index("したい")
+        diff = self.document.edit(offset, 0, "している間に")
+
+        assert not diff.removed_matches
+        assert len(diff.added_matches) == 1
+        assert len(self.document.matches) == 2
+        self._assert_consistent()
+
+    def test_edit_removes_match(self):
+        """Test that deleting a grammar point reports a removed match"""
+        offset = self.text.index("間に")
+        diff = self.document.edit(offset, 2, "")
+
+        assert [m.rule_name for m in diff.removed_matches] == ["間に"]
+        assert not diff.added_matches
+        assert not self.document.matches
+        self._assert_consistent()
+
+    def test_edit_only_retokenizes_affected_sentence(self):
+        """Test that tokens outside the edited sentence are reported unchanged"""
+        first_sentence_tokens = len(
+            self.analyzer.parse_text("赤ちゃんが寝ている間に、洗濯をしました。")
+        )
+        diff = self.document.edit(self.text.index("日本"), 2, "東京")
+
+        assert diff.token_start == first_sentence_tokens
+        assert [t.surface for t in diff.added_tokens][0] == "東京"
+        self._assert_consistent()
+
+    def test_edit_shifts_later_matches(self):
+        """Test that matches after the edit move with their tokens"""
+        before = self.document.matches[0]
+        diff = self.document.edit(0, 0, "今日は晴れ。")
+
+        after = self.document.matches[0]
+        assert not diff.removed_matches and not diff.added_matches
+        assert after.end_pos - after.start_pos == before.end_pos - before.start_pos
+        assert after.start_pos > before.start_pos
+        self._assert_consistent()
+
+    def test_merge_sentences(self):
+        """Test deleting a sentence terminator merges sentences"""
+        diff = self.document.edit(self.text.index("。"), 1, "")
+
+        assert diff.removed_token_count > 0
+        self._assert_consistent()
+
+    def test_set_text(self):
+        """Test that replacing text yields the same state as a fresh document"""
+        self.document.set_text("私は夏休みの間、ずっと実家にいました。")
+
+        assert self.document.text == "私は夏休みの間、ずっと実家にいました。"
+        self._assert_consistent()
+
+    def test_edit_out_of_range(self):
+        """Test that edits outside the document are rejected"""
+        with pytest.raises(ValueError, match="outside the document"):
+            self.document.edit(len(self.text), 1, "")
+
+
+class TestOverlappingMatches:
+    """Test edits near matches that suppress overlapping ones"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """Set up a per-character analyzer and a rule with a bounded gap"""
+        self.analyzer = CharacterAnalyzer()
+        self.registry = RuleRegistry()
+        self.registry.add_rule(
+            GrammarRule(
+                name="a_b",
+                patterns=[
+                    GrammarRulePattern(
+                        patterns=[
+                            TokenPattern(value="a"),
+                            TokenPattern(max_tokens=10),
+                            TokenPattern(value="b"),
+                        ]
+                    )
+                ],
+            )
+        )
+
+    def _assert_edit(self, text: str, new_text: str):
+        """Assert editing text matches like analyzing the result from scratch"""
+        document = IncrementalDocument(self.analyzer, self.registry, text)
+        before = document.matches
+        diff = document.set_text(new_text)
+
+        fresh = IncrementalDocument(self.analyzer, self.registry, new_text)
+        assert document.matches == fresh.matches
+        assert all(match in before for match in diff.removed_matches)
+        assert all(match in fresh.matches for match in diff.added_matches)
+        return diff
+
+    def test_edit_after_overlapping_pair(self):
+        """Test that a kept match still suppresses one it overlaps"""
+        diff = self._assert_edit("aaxxxxxxxxbx。z。", "aaxxxxxxxxbx。y。")
+
+        assert not diff.removed_matches and not diff.added_matches
+
+    def test_removed_match_releases_suppressed_match(self):
+        """Test that matches suppressed by a removed match are found"""
+        diff = self._assert_edit("ba。xaaab", "。xaaab")
+
+        assert [(m.start_pos, m.end_pos) for m in diff.added_matches] == [(2, 6)]
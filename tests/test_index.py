@@ -0,0 +1,132 @@
+"""Tests for the inverted corpus index"""
+
+from pathlib import Path
+
+import pytest
+
+from kotogram import (
+    GrammarRule,
+    GrammarRulePattern,
+    KotogramAnalyzer,
+    PartOfSpeech,
+    RuleRegistry,
+    TokenPattern,
+)
+from kotogram.corpus import Corpus, build_corpus
+from kotogram.index import CorpusIndex
+
+
+def _rule(*patterns: TokenPattern) -> GrammarRule:
+    """Build a single-pattern rule"""
+    return GrammarRule(name="rule", patterns=[GrammarRulePattern(patterns=patterns)])
+
+
+class TestCorpusIndex:
+    """Test query planning and search over an indexed corpus"""
+
+    sentences = [
+        "猫が好き。",
+        "犬が好き。",
+        "猫と犬。",
+        "赤ちゃんが寝ている間に、洗濯をしました。",
+        "本を読みます。",
+    ]
+
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        """Build a corpus and its index"""
+        self.path = tmp_path / "corpus.ktg"
+        build_corpus(self.path, self.sentences, KotogramAnalyzer())
+        self.corpus = Corpus(self.path)
+        self.index = CorpusIndex.build(self.corpus)
+        yield
+        self.corpus.close()
+
+    def test_literal_candidates(self):
+        """Test that literals select sentences by surface or base form"""
+        rule = _rule(TokenPattern(value="好き"), TokenPattern(value="。"))
+
+        assert self.index.candidates(rule) == [0, 1]
+        assert self.index.candidates(_rule(TokenPattern(value="読む"))) == [4]
+
+    def test_required_tokens_are_intersected(self):
+        """Test that every required token must occur in a candidate"""
+        rule = _rule(TokenPattern(value="猫"), TokenPattern(value="犬"))
+
+        assert self.index.candidates(rule) == [2]
+
+    def test_alternatives_are_united(self):
+        """Test that any alternative can satisfy a token"""
+        rule = _rule(
+            TokenPattern(value="猫", alternatives=(TokenPattern(value="本"),)),
+        )
+
+        assert self.index.candidates(rule) == [0, 2, 4]
+
+    def test_optional_tokens_do_not_restrict(self):
+        """Test that optional and wildcard tokens are not required"""
+        rule = _rule(
+            TokenPattern(value="猫"),
+            TokenPattern(),
+            TokenPattern(value="鳥", optional=True),
+            TokenPattern(value="。"),
+        )
+
+        assert self.index.candidates(rule) == [0, 2]
+
+    def test_feature_candidates(self):
+        """Test that part-of-speech constraints use their postings"""
+        rule = _rule(TokenPattern(part_of_speech=PartOfSpeech.VERB))
+
+        assert self.index.candidates(rule) == [3, 4]
+
+    def test_unconstrained_pattern(self):
+        """Test that a pattern without indexable tokens scans everything"""
+        rule = _rule(TokenPattern(value="猫"), TokenPattern(optional=True))
+        rule.patterns.append(GrammarRulePattern(patterns=[TokenPattern(optional=True)]))
+
+        assert self.index.candidates(rule) == list(range(len(self.sentences)))
+
+    def test_find_sentences_verifies_candidates(self):
+        """Test that candidates are confirmed by the matcher"""
+        rule = _rule(TokenPattern(value="犬"), TokenPattern(value="。"))
+
+        assert self.index.candidates(rule) == [1, 2]
+        assert self.index.find_sentences(rule) == [2]
+
+    def test_save_and_load(self, tmp_path):
+        """Test that a saved index answers the same queries"""
+        self.index.save(tmp_path / "corpus.idx")
+        loaded = CorpusIndex.load(tmp_path / "corpus.idx", self.corpus)
+        rule = _rule(TokenPattern(value="猫"))
+
+        assert loaded.candidates(rule) == self.index.candidates(rule)
+
+    def test_load_for_other_corpus(self, tmp_path):
+        """Test that an index is tied to the corpus it was built for"""
+        self.index.save(tmp_path / "corpus.idx")
+        build_corpus(tmp_path / "other.ktg", ["猫"], KotogramAnalyzer())
+
+        with Corpus(tmp_path / "other.ktg") as other:
+            with pytest.raises(ValueError, match="different corpus"):
+                CorpusIndex.load(tmp_path / "corpus.idx", other)
+
+
+class TestIndexParity:
+    """Test that indexed search agrees with scanning every sentence"""
+
+    def test_rules_examples(self, tmp_path):
+        """Test every generated rule over a corpus of all rule examples"""
+        if not Path("rules").is_dir():
+            pytest.skip("No rules directory")
+        registry = RuleRegistry()
+        registry.load_rules_from_directory("rules")
+        sentences = [example for rule in registry.rules for example in rule.examples]
+        build_corpus(tmp_path / "corpus.ktg", sentences, KotogramAnalyzer())
+
+        with Corpus(tmp_path / "corpus.ktg") as corpus:
+            index = CorpusIndex.build(corpus)
+            for rule in registry.rules:
+                assert index.find_sentences(rule) == [
+                    i for i in range(len(corpus)) if rule.has_match(corpus.views(i))
+                ]
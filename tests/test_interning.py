@@ -0,0 +1,78 @@
+"""Tests for token pattern interning"""
+
+from kotogram import (
+    GrammarRule,
+    GrammarRulePattern,
+    PartOfSpeech,
+    PatternInterner,
+    RuleRegistry,
+    TokenPattern,
+)
+
+
+class TestPatternInterner:
+    """Test PatternInterner hash-consing"""
+
+    def test_equal_patterns_share_instance(self):
+        """Test that structurally equal patterns intern to one instance"""
+        interner = PatternInterner()
+        first = interner.intern(TokenPattern(value="の"))
+        second = interner.intern(TokenPattern(value="の"))
+
+        assert first is second
+        assert len(interner) == 1
+
+    def test_different_patterns_stay_distinct(self):
+        """Test that optional and required patterns are not merged"""
+        interner = PatternInterner()
+        required = interner.intern(TokenPattern(value="に"))
+        optional = interner.intern(TokenPattern(value="に", optional=True))
+
+        assert required is not optional
+        assert required.pattern_id != optional.pattern_id
+
+    def test_alternatives_are_interned(self):
+        """Test that nested alternatives are shared as well"""
+        interner = PatternInterner()
+        leaf = interner.intern(TokenPattern(value="だ"))
+        parent = interner.intern(
+            TokenPattern(value="で", alternatives=(TokenPattern(value="だ"),))
+        )
+
+        assert parent.alternatives[0] is leaf
+
+    def test_lookup_by_stable_id(self):
+        """Test that pattern IDs are stable across instances"""
+        interner = PatternInterner()
+        pattern = interner.intern(TokenPattern(part_of_speech=PartOfSpeech.NOUN))
+
+        assert TokenPattern(part_of_speech=PartOfSpeech.NOUN).pattern_id == (
+            pattern.pattern_id
+        )
+        assert interner.get(pattern.pattern_id) is pattern
+
+
+class TestRegistryInterning:
+    """Test that registries share patterns between rules"""
+
+    def test_rules_share_patterns(self):
+        """Test that identical patterns in two rules become one instance"""
+        registry = RuleRegistry()
+        for name in ("a", "b"):
+            registry.add_rule(
+                GrammarRule(
+                    name=name,
+                    patterns=[
+                        GrammarRulePattern(
+                            patterns=[
+                                TokenPattern(part_of_speech=PartOfSpeech.NOUN),
+                                TokenPattern(value=name),
+                            ]
+                        )
+                    ],
+                )
+            )
+
+        first, second = (rule.patterns[0].patterns[0] for rule in registry.rules)
+        assert first is second
+        assert len(registry.interner) == 3
@@ -0,0 +1,148 @@
+"""Tests for the live-analysis WebSocket endpoint"""
+
+import time
+
+from fastapi.testclient import TestClient
+
+import app as app_module
+from app import app
+from kotogram import RuleRegistry
+from tests.helpers import literal_rule
+
+
+class TestLiveAnalysis:
+    """Test incremental analysis over a WebSocket"""
+
+    def setup_method(self):
+        self.client = TestClient(app)
+
+    def _receive_until(self, websocket, version):
+        """Collect updates until the given edit version has been analyzed"""
+        updates = []
+        while not updates or updates[-1]["version"] < version:
+            updates.append(websocket.receive_json())
+        return updates
+
+    def test_set_text(self):
+        """Test that setting text pushes its tokens"""
+        with self.client.websocket_connect("/ws/analyze") as websocket:
+            websocket.send_json({"type": "set", "text": "猫が好き。"})
+            (update,) = self._receive_until(websocket, 1)
+
+        assert update["type"] == "update"
+        assert update["diff"]["token_start"] == 0
+        assert [t["surface"] for t in update["diff"]["added_tokens"]] == [
+            "猫",
+            "が",
+            "好き",
+            "。",
+        ]
+
+    def test_edits_push_match_changes(self):
+        """Test that a burst of edits ends with the new match pushed"""
+        with self.client.websocket_connect("/ws/analyze") as websocket:
+            websocket.send_json({"type": "set", "text": "赤ちゃんが寝ている"})
+            self._receive_until(websocket, 1)
+
+            websocket.send_json({"offset": 9, "insert_text": "間"})
+            websocket.send_json({"offset": 10, "insert_text": "に、洗濯をしました。"})
+            updates = self._receive_until(websocket, 3)
+
+        added = [
+            match["rule_name"]
+            for update in updates
+            for match in update["diff"]["added_matches"]
+        ]
+        assert "～間（に）" in added
+
+    def test_invalid_edit(self):
+        """Test that out-of-range edits are reported without closing"""
+        with self.client.websocket_connect("/ws/analyze") as websocket:
+            websocket.send_json({"offset": 5, "delete_length": 1})
+            error = websocket.receive_json()
+
+            websocket.send_json({"type": "set", "text": "猫"})
+            (update,) = self._receive_until(websocket, 1)
+
+        assert error["type"] == "error"
+        assert update["diff"]["added_tokens"][0]["surface"] == "猫"
+
+    def test_malformed_frames(self):
+        """Test that frames that are not JSON objects are reported without
+        closing"""
+        with self.client.websocket_connect("/ws/analyze") as websocket:
+            websocket.send_text("{not json")
+            invalid_json = websocket.receive_json()
+            websocket.send_text("[1, 2]")
+            not_object = websocket.receive_json()
+            websocket.send_bytes(b"\x00")
+            binary = websocket.receive_json()
+
+            websocket.send_json({"type": "set", "text": "猫"})
+            (update,) = self._receive_until(websocket, 1)
+
+        assert [invalid_json["type"], not_object["type"], binary["type"]] == [
+            "error",
+            "error",
+            "error",
+        ]
+        assert update["diff"]["added_tokens"][0]["surface"] == "猫"
+
+    def test_burst_is_coalesced(self, monkeypatch):
+        """Test that each edit restarts the quiet period, so a burst spanning
+        longer than it still yields one update"""
+        monkeypatch.setattr(app_module, "LIVE_DEBOUNCE_SECONDS", 0.4)
+        monkeypatch.setattr(app_module, "LIVE_MAX_LATENCY_SECONDS", 10.0)
+        with self.client.websocket_connect("/ws/analyze") as websocket:
+            for offset, character in enumerate("猫が好き。"):
+                websocket.send_json({"offset": offset, "insert_text": character})
+                time.sleep(0.15)
+            updates = self._receive_until(websocket, 5)
+
+        assert len(updates) == 1
+        assert len(updates[0]["diff"]["added_tokens"]) == 4
+
+    def test_continuous_typing_is_analyzed(self, monkeypatch):
+        """Test that edits arriving faster than the quiet period are still
+        analyzed once the maximum latency has passed"""
+        monkeypatch.setattr(app_module, "LIVE_DEBOUNCE_SECONDS", 0.4)
+        monkeypatch.setattr(app_module, "LIVE_MAX_LATENCY_SECONDS", 0.3)
+        text = "猫が好き。犬も好き。"
+        with self.client.websocket_connect("/ws/analyze") as websocket:
+            for offset, character in enumerate(text):
+                websocket.send_json({"offset": offset, "insert_text": character})
+                time.sleep(0.1)
+            updates = self._receive_until(websocket, len(text))
+
+        # Typing never paused for the quiet period, yet updates kept coming
+        assert len(updates) > 1
+        assert updates[0]["version"] < len(text)
+
+    def test_reload_resyncs(self, monkeypatch):
+        """Test that the first update after a rules reload replaces every
+        token and match with those of the new rule set"""
+        with self.client.websocket_connect("/ws/analyze") as websocket:
+            websocket.send_json({"type": "set", "text": "猫が好き。"})
+            (first,) = self._receive_until(websocket, 1)
+
+            registry = RuleRegistry()
+            registry.add_rule(literal_rule("犬", "N5", 1))
+            monkeypatch.setattr(app_module, "rule_registry", registry.freeze())
+            monkeypatch.setattr(
+                app_module, "rules_version", app_module.rules_version + 1
+            )
+            websocket.send_json({"offset": 0, "delete_length": 1, "insert_text": "犬"})
+            (update,) = self._receive_until(websocket, 2)
+
+        assert update["rules_version"] == first["rules_version"] + 1
+        diff = update["diff"]
+        assert diff["token_start"] == 0
+        assert diff["removed_token_count"] == len(first["diff"]["added_tokens"])
+        assert diff["removed_matches"] == first["diff"]["added_matches"]
+        assert [t["surface"] for t in diff["added_tokens"]] == [
+            "犬",
+            "が",
+            "好き",
+            "。",
+        ]
+        assert [m["rule_id"] for m in diff["added_matches"]] == ["n5_001"]
@@ -0,0 +1,76 @@
+"""Tests for the load-testing harness helpers"""
+
+import pytest
+
+from loadtest import build_payloads, parse_int_list, percentile
+
+
+class TestPercentile:
+    """Test nearest-rank percentiles"""
+
+    def test_empty(self):
+        """Test that no values give zero"""
+        assert percentile([], 0.5) == 0.0
+
+    def test_nearest_rank(self):
+        """Test that the rank is rounded up to an existing value"""
+        values = [float(value) for value in range(1, 11)]
+
+        assert percentile(values, 0.5) == 5.0
+        assert percentile(values, 0.51) == 6.0
+        assert percentile(values, 0.95) == 10.0
+        assert percentile(values, 1.0) == 10.0
+
+    def test_edges(self):
+        """Test the lowest fraction and a single value"""
+        assert percentile([1.0, 2.0], 0.0) == 1.0
+        assert percentile([3.0], 0.99) == 3.0
+
+
+class TestParseIntList:
+    """Test parsing comma-separated positive integers"""
+
+    def test_valid(self):
+        """Test a list of positive integers"""
+        assert parse_int_list("50,200,1000") == [50, 200, 1000]
+
+    @pytest.mark.parametrize("value", ["0", "1,-2", "1,,2", "a"])
+    def test_invalid(self, value):
+        """Test that zero, negative and malformed entries are rejected"""
+        with pytest.raises(ValueError):
+            parse_int_list(value)
+
+
+class TestBuildPayloads:
+    """Test building request bodies"""
+
+    sentences = ["猫が好き。", "犬も好き。", "本を読みます。"]
+
+    def test_text_payloads(self):
+        """Test that texts join a sampled number of sentences"""
+        payloads = build_payloads("parse", self.sentences, [1, 3], 20, seed=0)
+
+        assert len(payloads) == 20
+        for payload in payloads:
+            text = payload["text"]
+            count = sum(text.count(sentence) for sentence in self.sentences)
+            assert count in (1, 3)
+            assert len(text) == sum(
+                len(sentence) * text.count(sentence) for sentence in self.sentences
+            )
+
+    def test_seeded(self):
+        """Test that the same seed builds the same payloads"""
+        first = build_payloads("parse-and-match", self.sentences, [1, 2], 5, seed=7)
+        second = build_payloads("parse-and-match", self.sentences, [1, 2], 5, seed=7)
+
+        assert first == second
+
+    def test_match_payloads(self):
+        """Test that match payloads hold the tokens of the same texts"""
+        texts = build_payloads("parse", self.sentences, [2], 3, seed=1)
+        payloads = build_payloads("match", self.sentences, [2], 3, seed=1)
+
+        for text, payload in zip(texts, payloads):
+            surfaces = "".join(token["surface"] for token in payload["tokens"])
+            assert surfaces == text["text"]
@@ -0,0 +1,111 @@
+"""Tests for the sampling profiler and its endpoint"""
+
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app as app_module
+from kotogram import KotogramAnalyzer
+from kotogram.profiling import StackSampler
+
+ADMIN_TOKEN = "secret"
+
+
+def _parse_until(analyzer: KotogramAnalyzer, stopped: threading.Event):
+    """Keep a thread busy in kotogram code"""
+    while not stopped.is_set():
+        analyzer.parse_text("赤ちゃんが寝ている間に、洗濯をしました。")
+
+
+class TestStackSampler:
+    """Test sampling the stacks of other threads"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """Run a busy thread for the duration of a test"""
+        analyzer = KotogramAnalyzer()
+        self.stopped = threading.Event()
+        worker = threading.Thread(target=_parse_until, args=(analyzer, self.stopped))
+        worker.start()
+        yield
+        self.stopped.set()
+        worker.join()
+
+    def test_samples_kotogram_frames(self):
+        """Test that stacks name the kotogram functions being run"""
+        with StackSampler(interval=0.001, module_prefix="kotogram") as sampler:
+            self.stopped.wait(0.3)
+
+        assert sampler.sample_count > 0
+        functions = [name for name, _, _ in sampler.functions()]
+        assert "kotogram.analyzer.KotogramAnalyzer.parse_text" in functions
+        # Stacks of threads outside kotogram, like this one, are left out
+        assert all(
+            any(label.startswith("kotogram") for label in stack)
+            for stack in sampler.stacks
+        )
+
+    def test_collapsed_format(self):
+        """Test that collapsed stacks run from caller to callee with a count"""
+        with StackSampler(interval=0.001, module_prefix="kotogram") as sampler:
+            self.stopped.wait(0.2)
+
+        lines = sampler.collapsed().splitlines()
+        assert lines
+        stack, count = lines[0].rsplit(" ", 1)
+        assert int(count) >= 1
+        frames = stack.split(";")
+        assert frames.index("tests.test_profiling._parse_until") < frames.index(
+            "kotogram.analyzer.KotogramAnalyzer.parse_text"
+        )
+
+    def test_invalid_interval(self):
+        """Test that the interval must be positive"""
+        with pytest.raises(ValueError, match="positive"):
+            StackSampler(interval=0)
+
+
+class TestProfileEndpoint:
+    """Test the /debug/profile endpoint"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, monkeypatch):
+        """Enable admin endpoints"""
+        monkeypatch.setenv(app_module.ADMIN_TOKEN_ENV, ADMIN_TOKEN)
+        self.client = TestClient(app_module.app)
+
+    def _profile(self, token=ADMIN_TOKEN, **params):
+        return self.client.get(
+            "/debug/profile", params=params, headers={"X-Admin-Token": token}
+        )
+
+    def test_collapsed_profile(self):
+        """Test that the default output is collapsed stacks as text"""
+        response = self._profile(seconds=0.1, module="")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert int(response.headers["x-profile-samples"]) >= 0
+
+    def test_functions_profile(self):
+        """Test the per-function summary"""
+        response = self._profile(seconds=0.1, format="functions", module="")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["seconds"] == 0.1
+        for function in data["functions"]:
+            assert function["total_samples"] >= function["own_samples"]
+
+    def test_requires_admin(self, monkeypatch):
+        """Test that the endpoint needs the admin token"""
+        assert self._profile("wrong", seconds=0.1).status_code == 401
+        monkeypatch.delenv(app_module.ADMIN_TOKEN_ENV)
+        assert self._profile(seconds=0.1).status_code == 403
+
+    def test_duration_limit(self):
+        """Test that overly long or empty profiles are rejected"""
+        seconds = app_module.MAX_PROFILE_SECONDS + 1
+        assert self._profile(seconds=seconds).status_code == 422
+        assert self._profile(seconds=0).status_code == 422
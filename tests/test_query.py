@@ -0,0 +1,158 @@
+"""Tests for short-circuit query modes"""
+
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import app
+from kotogram import (
+    GrammarRule,
+    GrammarRulePattern,
+    KotogramAnalyzer,
+    RuleRegistry,
+    TokenPattern,
+)
+
+
+def _one_of(*values: str, optional: bool = False) -> TokenPattern:
+    """Build a pattern matching any of the given values"""
+    return TokenPattern(
+        value=values[0],
+        alternatives=tuple(TokenPattern(value=value) for value in values[1:]),
+        optional=optional,
+    )
+
+
+class TestQueryModes:
+    """Test RuleRegistry.query against full matching"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """Set up an analyzer and a registry with an overlapping rule"""
+        self.analyzer = KotogramAnalyzer()
+        self.registry = RuleRegistry()
+        # Matches 猫が at 0, then the longer がとても好き at 1 displaces it
+        self.registry.add_rule(
+            GrammarRule(
+                name="overlap",
+                category="N5",
+                index=1,
+                patterns=[
+                    GrammarRulePattern(
+                        patterns=[
+                            _one_of("猫", "が"),
+                            _one_of("が", "とても", optional=True),
+                            _one_of("好き", optional=True),
+                        ]
+                    )
+                ],
+            )
+        )
+        self.registry.add_rule(
+            GrammarRule(
+                name="猫",
+                category="N5",
+                index=2,
+                patterns=[GrammarRulePattern(patterns=[TokenPattern(value="猫")])],
+            )
+        )
+        self.registry.add_rule(
+            GrammarRule(
+                name="犬",
+                category="N5",
+                index=3,
+                patterns=[GrammarRulePattern(patterns=[TokenPattern(value="犬")])],
+            )
+        )
+        self.tokens = self.analyzer.parse_text("猫がとても好き。猫も好き")
+
+    def test_any(self):
+        """Test that any reports only matching rules"""
+        results = self.registry.query(self.tokens, "any")
+
+        assert [r.rule_id for r in results] == ["n5_001", "n5_002"]
+        assert all(r.count is None and r.start_pos is None for r in results)
+
+    def test_first_follows_overlap_resolution(self):
+        """Test that first agrees with the first match of full matching"""
+        result, _ = self.registry.query(self.tokens, "first")
+        first_match = self.registry.rules[0].match(self.tokens).pattern_matches[0]
+
+        assert (result.start_pos, result.end_pos) == (1, 4)
+        assert (result.start_pos, result.end_pos) == (
+            first_match.start_pos,
+            first_match.end_pos,
+        )
+
+    def test_count(self):
+        """Test that count agrees with full matching"""
+        results = self.registry.query(self.tokens, "count")
+
+        assert [r.count for r in results] == [
+            len(rule.match(self.tokens).pattern_matches)
+            for rule in self.registry.rules[:2]
+        ]
+
+    def test_unknown_mode(self):
+        """Test that unknown modes are rejected"""
+        with pytest.raises(ValueError, match="Unknown query mode"):
+            self.registry.query(self.tokens, "all")
+
+
+class TestQueryParity:
+    """Test query modes against full matching with the generated rules"""
+
+    def test_rules_examples(self):
+        """Test every mode on every rule example"""
+        if not Path("rules").is_dir():
+            pytest.skip("No rules directory")
+        analyzer = KotogramAnalyzer()
+        registry = RuleRegistry()
+        registry.load_rules_from_directory("rules")
+
+        for rule in registry.rules:
+            for example in rule.examples:
+                tokens = analyzer.parse_text(example)
+                full = {m.rule.rule_id: m for m in registry.find_all_matches(tokens)}
+
+                assert [r.rule_id for r in registry.query(tokens, "any")] == list(full)
+                for result in registry.query(tokens, "first"):
+                    first_match = full[result.rule_id].pattern_matches[0]
+                    assert result.start_pos == first_match.start_pos
+                    assert result.end_pos == first_match.end_pos
+                for result in registry.query(tokens, "count"):
+                    assert result.count == len(full[result.rule_id].pattern_matches)
+
+
+class TestQueryAPI:
+    """Test the /query endpoint"""
+
+    text = "赤ちゃんが寝ている間に、洗濯をしました。"
+
+    def setup_method(self):
+        self.client = TestClient(app)
+
+    @pytest.mark.parametrize("mode", ["any", "first", "count"])
+    def test_query_matches_full_results(self, mode):
+        """Test that each mode reports the rules /parse-and-match finds"""
+        full = self.client.post("/parse-and-match", json={"text": self.text}).json()
+        response = self.client.post("/query", json={"text": self.text, "mode": mode})
+
+        assert response.status_code == 200
+        assert response.json()["mode"] == mode
+        assert [r["rule_name"] for r in response.json()["results"]] == [
+            m["rule"]["name"] for m in full["matches"]
+        ]
+
+    def test_empty_text(self):
+        """Test that empty text is a client error"""
+        response = self.client.post("/query", json={"text": " "})
+
+        assert response.status_code == 400
+
+    def test_invalid_mode(self):
+        """Test that unknown modes fail validation"""
+        response = self.client.post("/query", json={"text": self.text, "mode": "all"})
+
+        assert response.status_code == 422
@@ -0,0 +1,163 @@
+"""Tests for the regex matcher backend"""
+
+import random
+from pathlib import Path
+
+import pytest
+
+from kotogram import (
+    GrammarRule,
+    GrammarRulePattern,
+    KotogramAnalyzer,
+    PartOfSpeech,
+    POSDetailType,
+    RegexMatcher,
+    RuleRegistry,
+    TokenPattern,
+)
+from kotogram.regex_backend import TOKEN_WIDTH
+
+
+def _registry(*patterns: list[TokenPattern]) -> RuleRegistry:
+    """Build a registry with one rule per pattern sequence"""
+    registry = RuleRegistry()
+    for index, pattern in enumerate(patterns, 1):
+        registry.add_rule(
+            GrammarRule(
+                name=f"rule_{index}",
+                category="N3",
+                index=index,
+                patterns=[GrammarRulePattern(patterns=pattern)],
+            )
+        )
+    return registry
+
+
+class TestRegexMatcher:
+    """Test that compiled patterns reproduce the reference matcher"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """Set up analyzer"""
+        self.analyzer = KotogramAnalyzer()
+
+    def assert_parity(self, registry: RuleRegistry, text: str) -> list:
+        """Check both matchers agree on a sentence and return the spans"""
+        tokens = self.analyzer.parse_text(text)
+        spans = list(RegexMatcher(registry).find_all_spans(tokens))
+        assert spans == list(registry.find_all_spans(tokens))
+        return [(span.start, span.end) for span in spans]
+
+    def test_encode(self):
+        """Test that every token becomes TOKEN_WIDTH codes"""
+        matcher = RegexMatcher(_registry([TokenPattern(value="猫")]))
+        tokens = self.analyzer.parse_text("猫が好き。")
+
+        code = matcher.encode(tokens)
+        assert len(code) == len(tokens) * TOKEN_WIDTH
+        # Only the literal mentioned by a rule gets its own code
+        assert code[6] != code[TOKEN_WIDTH + 6]
+        assert code[TOKEN_WIDTH + 6] == code[2 * TOKEN_WIDTH + 6]
+
+    def test_value_matches_base_form(self):
+        """Test that values match the surface or the base form"""
+        # 食べ ます / 食べ た: base form 食べる
+        spans = self.assert_parity(
+            _registry([TokenPattern(value="食べる")]), "食べます。食べた。"
+        )
+        assert spans == [(0, 1), (3, 4)]
+
+    def test_pos_detail_any_slot(self):
+        """Test that a detailed part of speech matches in any of three slots"""
+        # 猫 が 東京 で 本 を: 一般 is the first, second and third detail
+        spans = self.assert_parity(
+            _registry([TokenPattern(pos_detail=POSDetailType.NOUN_GENERAL)]),
+            "猫が東京で本を読む。",
+        )
+        assert spans == [(0, 1), (1, 2), (2, 3), (3, 4), (4, 5), (5, 6)]
+
+    def test_optional_is_greedy(self):
+        """Test that a matched optional token is not given back"""
+        # の is taken by the optional, so the required の cannot match
+        registry = _registry(
+            [
+                TokenPattern(part_of_speech=PartOfSpeech.NOUN),
+                TokenPattern(value="の", optional=True),
+                TokenPattern(value="の"),
+            ]
+        )
+        assert self.assert_parity(registry, "猫の本。") == []
+
+    def test_alternatives(self):
+        """Test that alternatives, including nested ones, translate to branches"""
+        registry = _registry(
+            [
+                TokenPattern(
+                    value="が",
+                    alternatives=(
+                        TokenPattern(
+                            value="を", alternatives=(TokenPattern(value="に"),)
+                        ),
+                    ),
+                )
+            ]
+        )
+        assert self.assert_parity(registry, "猫が本を机に置く。") == [
+            (1, 2),
+            (3, 4),
+            (5, 6),
+        ]
+
+    def test_gaps(self):
+        """Test lazy, bounded, stopped and trailing gaps"""
+        # 猫 が 好き 。 猫 と 犬 が 好き 。
+        stop = (TokenPattern(pos_detail=POSDetailType.SYMBOL_PERIOD),)
+        registry = _registry(
+            [TokenPattern(value="猫"), TokenPattern(), TokenPattern(value="好き")],
+            [
+                TokenPattern(value="猫"),
+                TokenPattern(max_tokens=1),
+                TokenPattern(value="好き"),
+            ],
+            [
+                TokenPattern(value="猫"),
+                TokenPattern(stop=stop),
+                TokenPattern(value="犬"),
+            ],
+            [TokenPattern(value="猫"), TokenPattern(min_tokens=1, stop=stop)],
+        )
+        spans = self.assert_parity(registry, "猫が好き。猫と犬が好き。")
+        assert spans == [(0, 3), (4, 9), (0, 3), (4, 7), (0, 3), (4, 9)]
+
+    def test_find_all_matches(self):
+        """Test that match results equal the registry's"""
+        registry = _registry([TokenPattern(value="猫")], [TokenPattern(value="犬")])
+        tokens = self.analyzer.parse_text("猫と犬と猫。")
+
+        expected = registry.find_all_matches(tokens)
+        results = RegexMatcher(registry).find_all_matches(tokens)
+        assert [result.rule for result in results] == [r.rule for r in expected]
+        assert [result.pattern_matches for result in results] == [
+            r.pattern_matches for r in expected
+        ]
+
+    def test_rules_parity(self):
+        """Test every rule on its examples and on shuffled tokens"""
+        if not Path("rules").is_dir():
+            pytest.skip("No rules directory")
+        registry = RuleRegistry()
+        registry.load_rules_from_directory("rules")
+        matcher = RegexMatcher(registry)
+        sequences = [
+            self.analyzer.parse_text(example)
+            for rule in registry.rules
+            for example in rule.examples
+        ]
+        pool = [token for tokens in sequences for token in tokens]
+        rng = random.Random(0)
+        sequences += [rng.choices(pool, k=rng.randint(1, 30)) for _ in range(50)]
+
+        for tokens in sequences:
+            assert list(matcher.find_all_spans(tokens)) == list(
+                registry.find_all_spans(tokens)
+            )
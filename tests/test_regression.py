@@ -0,0 +1,106 @@
+"""Tests for the cached, parallel rule regression runner"""
+
+import json
+
+import pytest
+
+from kotogram import GrammarRule, GrammarRulePattern, TokenPattern
+from kotogram.regression import (
+    STATE_FILE,
+    TOKEN_CACHE_FILE,
+    ExampleTokenCache,
+    RegressionRunner,
+)
+
+
+def _write_rule(rules_dir, index: int, value: str, examples: list[str]):
+    """Write a single-literal rule file"""
+    rule = GrammarRule(
+        name=f"{value}_rule",
+        category="N5",
+        index=index,
+        patterns=[GrammarRulePattern(patterns=[TokenPattern(value=value)])],
+        examples=examples,
+    )
+    path = rules_dir / f"{rule.rule_id}.json"
+    path.write_text(rule.model_dump_json(), encoding="utf-8")
+
+
+class TestRegressionRunner:
+    """Test RegressionRunner caching and result reporting"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        """Set up a rules directory, definitions directory and cache"""
+        self.rules_dir = tmp_path / "rules"
+        self.definitions_dir = tmp_path / "rule_definitions"
+        self.cache_dir = tmp_path / "cache"
+        self.rules_dir.mkdir()
+        self.definitions_dir.mkdir()
+        _write_rule(self.rules_dir, 1, "猫", ["猫が好き。"])
+        _write_rule(self.rules_dir, 2, "犬", ["犬が好き。", "猫が好き。"])
+
+    def _run(self, workers=1, force=False):
+        runner = RegressionRunner(
+            rules_dir=str(self.rules_dir),
+            definitions_dir=str(self.definitions_dir),
+            cache_dir=str(self.cache_dir),
+            workers=workers,
+        )
+        return {result.rule_id: result for result in runner.run(force=force)}
+
+    def test_reports_failures(self):
+        """Test that unmatched examples are reported per rule"""
+        results = self._run()
+
+        assert results["n5_001"].passed
+        assert results["n5_002"].failures == ["does not match '猫が好き。'"]
+
+    def test_parallel_run(self):
+        """Test that running in worker processes gives the same results"""
+        assert self._run(workers=2) == self._run(workers=1, force=True)
+
+    def test_passing_rules_are_skipped(self):
+        """Test that only unchanged, passing rules are reused"""
+        self._run()
+        results = self._run()
+
+        assert results["n5_001"].cached
+        assert not results["n5_002"].cached
+        assert not results["n5_002"].passed
+
+    def test_changed_rule_is_rerun(self):
+        """Test that changing a rule file invalidates its result"""
+        self._run()
+        _write_rule(self.rules_dir, 1, "猫", ["猫が好き。", "猫と犬。"])
+
+        assert not self._run()["n5_001"].cached
+
+    def test_changed_definition_is_rerun(self):
+        """Test that changing a rule's definition file invalidates its result"""
+        self._run()
+        (self.definitions_dir / "n5_001.py").write_text("# edited\n")
+
+        assert not self._run()["n5_001"].cached
+
+    def test_force(self):
+        """Test that a forced run re-checks every rule"""
+        self._run()
+
+        assert not any(result.cached for result in self._run(force=True).values())
+
+    def test_tokenizations_are_cached(self):
+        """Test that examples are tokenized once across runs"""
+        self._run()
+        cache = ExampleTokenCache(self.cache_dir / TOKEN_CACHE_FILE, "unused")
+        entries = json.loads((self.cache_dir / TOKEN_CACHE_FILE).read_text())
+
+        assert len(entries) == 2
+        assert cache.get("猫が好き。") is None  # Keys include the version
+
+    def test_corrupt_state_is_ignored(self):
+        """Test that an unreadable state file just re-runs everything"""
+        self.cache_dir.mkdir()
+        (self.cache_dir / STATE_FILE).write_text("{not json")
+
+        assert not any(result.cached for result in self._run().values())
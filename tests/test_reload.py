@@ -0,0 +1,118 @@
+"""Tests for validating and hot-reloading rule sets"""
+
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app as app_module
+from kotogram import (
+    GrammarRule,
+    GrammarRulePattern,
+    KotogramAnalyzer,
+    RuleRegistry,
+    TokenPattern,
+)
+from kotogram.grammar import PATTERN_LIBRARY_FILE
+
+ADMIN_TOKEN = "secret"
+
+
+class TestValidateExamples:
+    """Test RuleRegistry.validate_examples"""
+
+    def test_reports_unmatched_examples(self):
+        """Test that only examples the rule does not match are reported"""
+        registry = RuleRegistry()
+        registry.add_rule(
+            GrammarRule(
+                name="猫",
+                category="N5",
+                index=1,
+                patterns=[GrammarRulePattern(patterns=[TokenPattern(value="猫")])],
+                examples=["猫が好き", "犬が好き"],
+            )
+        )
+
+        failures = registry.validate_examples(KotogramAnalyzer())
+
+        assert failures == ["n5_001: does not match '犬が好き'"]
+
+
+class TestReloadEndpoint:
+    """Test the /admin/reload-rules endpoint"""
+
+    rule_files = ["n3_001.json", "n3_003.json"]
+
+    @pytest.fixture(autouse=True)
+    def setup(self, monkeypatch, tmp_path):
+        """Point the app at a small rule set and restore its state afterwards"""
+        if not Path("rules").is_dir():
+            pytest.skip("No rules directory")
+        for name in self.rule_files + [PATTERN_LIBRARY_FILE]:
+            shutil.copy(Path("rules") / name, tmp_path / name)
+
+        self.rules_dir = tmp_path
+        monkeypatch.setenv(app_module.ADMIN_TOKEN_ENV, ADMIN_TOKEN)
+        monkeypatch.setattr(app_module, "RULES_DIR", str(tmp_path))
+        monkeypatch.setattr(app_module, "rule_registry", app_module.rule_registry)
+        monkeypatch.setattr(app_module, "rules_version", app_module.rules_version)
+        self.client = TestClient(app_module.app)
+
+    def _reload(self, token=ADMIN_TOKEN):
+        return self.client.post("/admin/reload-rules", headers={"X-Admin-Token": token})
+
+    def test_reload_swaps_registry(self):
+        """Test that a valid rule set replaces the active one"""
+        old_registry = app_module.rule_registry
+        old_version = app_module.rules_version
+
+        response = self._reload()
+        health = self.client.get("/health").json()
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "rules_loaded": 2,
+            "rules_version": old_version + 1,
+        }
+        assert health["rules_loaded"] == 2
+        assert health["rules_version"] == old_version + 1
+        assert app_module.rule_registry is not old_registry
+        assert len(old_registry.rules) > 2
+
+    def test_failed_validation_keeps_registry(self):
+        """Test that a rule set failing its own examples is rejected"""
+        rule_path = self.rules_dir / self.rule_files[0]
+        rule_data = json.loads(rule_path.read_text(encoding="utf-8"))
+        rule_data["examples"].append("猫が好き。")
+        rule_path.write_text(json.dumps(rule_data), encoding="utf-8")
+        old_registry = app_module.rule_registry
+        old_version = app_module.rules_version
+
+        response = self._reload()
+
+        assert response.status_code == 400
+        assert "猫が好き。" in response.json()["detail"]
+        assert app_module.rule_registry is old_registry
+        assert app_module.rules_version == old_version
+
+    def test_missing_directory(self):
+        """Test that an unloadable rule set is rejected"""
+        shutil.rmtree(self.rules_dir)
+
+        response = self._reload()
+
+        assert response.status_code == 400
+
+    def test_invalid_token(self):
+        """Test that a wrong token is rejected"""
+        assert self._reload("wrong").status_code == 401
+        assert self.client.post("/admin/reload-rules").status_code == 401
+
+    def test_disabled_without_token(self, monkeypatch):
+        """Test that admin endpoints are off unless a token is configured"""
+        monkeypatch.delenv(app_module.ADMIN_TOKEN_ENV)
+
+        assert self._reload().status_code == 403
@@ -0,0 +1,88 @@
+"""Tests for rule files with named pattern references"""
+
+import json
+
+import pytest
+
+from kotogram import GrammarRule, GrammarRulePattern, RuleRegistry, TokenPattern
+from kotogram.grammar import (
+    PATTERN_LIBRARY_FILE,
+    PATTERN_REF_KEY,
+    dump_rule_with_refs,
+    resolve_rule_refs,
+)
+from kotogram.patterns import CommonPatterns
+
+LIBRARY = {
+    "NOUN_NO": CommonPatterns.NOUN_NO,
+    "NA_ADJ_STEM_NA": CommonPatterns.NA_ADJ_STEM_NA,
+    "NA_ADJ_STEM_NA_OR_DEARU": CommonPatterns.NA_ADJ_STEM_NA_OR_DEARU,
+}
+
+
+def _create_rule(index: int) -> GrammarRule:
+    return GrammarRule(
+        name=f"rule_{index}",
+        patterns=[
+            GrammarRulePattern(
+                patterns=[*CommonPatterns.NOUN_NO, TokenPattern(value="間")]
+            ),
+            GrammarRulePattern(
+                patterns=[
+                    *CommonPatterns.NA_ADJ_STEM_NA_OR_DEARU,
+                    TokenPattern(value="間"),
+                ]
+            ),
+        ],
+        category="N3",
+        index=index,
+    )
+
+
+class TestPatternReferences:
+    """Test dumping and resolving pattern references"""
+
+    def test_dump_replaces_fragments(self):
+        """Test that spliced fragments are written as references"""
+        rule_data = dump_rule_with_refs(_create_rule(1), LIBRARY)
+
+        first, second = (p["patterns"] for p in rule_data["patterns"])
+        assert first[0] == {PATTERN_REF_KEY: "NOUN_NO"}
+        assert second[0] == {PATTERN_REF_KEY: "NA_ADJ_STEM_NA_OR_DEARU"}
+        assert first[1]["value"] == "間"
+
+    def test_round_trip(self):
+        """Test that resolving references restores the original rule"""
+        rule = _create_rule(1)
+        rule_data = resolve_rule_refs(dump_rule_with_refs(rule, LIBRARY), LIBRARY)
+
+        assert GrammarRule(**rule_data) == rule
+
+    def test_unknown_reference(self):
+        """Test that references to missing fragments are rejected"""
+        rule_data = {"name": "x", "patterns": [{"patterns": [{"$ref": "MISSING"}]}]}
+
+        with pytest.raises(ValueError, match="Unknown pattern reference"):
+            resolve_rule_refs(rule_data, LIBRARY)
+
+    def test_load_directory_shares_fragments(self, tmp_path):
+        """Test that rules loaded from files share referenced fragments"""
+        library_data = {
+            name: [p.model_dump(mode="json") for p in patterns]
+            for name, patterns in LIBRARY.items()
+        }
+        (tmp_path / PATTERN_LIBRARY_FILE).write_text(
+            json.dumps(library_data), encoding="utf-8"
+        )
+        for index in (1, 2):
+            (tmp_path / f"n3_{index:03d}.json").write_text(
+                json.dumps(dump_rule_with_refs(_create_rule(index), LIBRARY)),
+                encoding="utf-8",
+            )
+
+        registry = RuleRegistry()
+        registry.load_rules_from_directory(str(tmp_path))
+
+        assert len(registry.rules) == 2
+        first, second = (rule.patterns[0].patterns[0] for rule in registry.rules)
+        assert first is second
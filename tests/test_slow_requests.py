@@ -0,0 +1,156 @@
+"""Tests for request tracing, the slow-request log and input capture"""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from loguru import logger
+
+import app as app_module
+from kotogram import JsonLinesExporter
+
+TEXT = "赤ちゃんが寝ている間に、洗濯をしました。"
+
+
+class TestSlowRequests:
+    """Test logging and capturing requests slower than the threshold"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, monkeypatch, tmp_path):
+        """Log every request as slow and collect the log messages"""
+        self.replay_path = tmp_path / "replay.jsonl"
+        monkeypatch.setattr(app_module, "slow_request_seconds", 0.0)
+        monkeypatch.setattr(app_module, "replay_file", str(self.replay_path))
+        self.messages = []
+        handler_id = logger.add(self.messages.append, level="WARNING")
+        self.client = TestClient(app_module.app)
+        yield
+        app_module.flush_trace_output()
+        logger.remove(handler_id)
+
+    def test_logs_breakdown(self):
+        """Test that the log names the input, its size and the slowest rules"""
+        response = self.client.post("/parse-and-match", json={"text": TEXT})
+        assert response.status_code == 200
+        app_module.flush_trace_output()
+
+        (message,) = self.messages
+        record = message.record
+        assert "Slow request POST /parse-and-match" in record["message"]
+        assert f"({len(TEXT)} chars, {len(response.json()['tokens'])} tokens)" in (
+            record["message"]
+        )
+        extra = record["extra"]
+        assert len(extra["input_hash"]) == 16
+        assert 0 < len(extra["rules"]) <= app_module.slow_request_top
+        assert 0 < len(extra["patterns"]) <= app_module.slow_request_top
+        assert "#" in extra["patterns"][0]
+        assert [stage.split("=")[0] for stage in extra["stages"]] == [
+            "tokenize",
+            "convert",
+            "match",
+            "serialize",
+        ]
+
+    def test_requests_traced_by_stage(self, monkeypatch):
+        """Test that requests only time stages; rules are profiled when slow"""
+        tracers = []
+        log_slow_request = app_module.log_slow_request
+
+        def capture(tracer, *args):
+            tracers.append(tracer)
+            log_slow_request(tracer, *args)
+
+        monkeypatch.setattr(app_module, "log_slow_request", capture)
+        self.client.post("/parse-and-match", json={"text": TEXT})
+        app_module.flush_trace_output()
+
+        (tracer,) = tracers
+        assert not tracer.rule_spans
+        assert tracer.find("match") and not tracer.find("rule")
+        assert self.messages[0].record["extra"]["rules"]
+
+    def test_profiles_selected_rules(self):
+        """Test that the breakdown only covers the rules the request selected"""
+        rule_id = app_module.rule_registry.rules[0].rule_id
+        self.client.post("/parse-and-match", json={"text": TEXT, "rule_ids": [rule_id]})
+        app_module.flush_trace_output()
+
+        extra = self.messages[0].record["extra"]
+        assert [rule.split("=")[0] for rule in extra["rules"]] == [rule_id]
+        assert all(pattern.startswith(f"{rule_id}#") for pattern in extra["patterns"])
+
+    def test_no_rules_without_matching(self):
+        """Test that requests which match nothing name no rules"""
+        self.client.post("/parse", json={"text": TEXT})
+        app_module.flush_trace_output()
+
+        extra = self.messages[0].record["extra"]
+        assert extra["rules"] == [] and extra["patterns"] == []
+
+    def test_captures_replay_input(self):
+        """Test that slow inputs are appended to the replay file"""
+        self.client.post("/parse-and-match", json={"text": TEXT})
+        self.client.post("/parse", json={"text": "猫が好き。"})
+        app_module.flush_trace_output()
+
+        records = [
+            json.loads(line)
+            for line in self.replay_path.read_text(encoding="utf-8").splitlines()
+        ]
+        assert [(r["path"], r["text"]) for r in records] == [
+            ("/parse-and-match", TEXT),
+            ("/parse", "猫が好き。"),
+        ]
+        assert (
+            records[0]["input_hash"] == self.messages[0].record["extra"]["input_hash"]
+        )
+
+    def test_match_input_from_tokens(self):
+        """Test that token requests capture the text their surfaces spell"""
+        tokens = self.client.post("/parse", json={"text": TEXT}).json()["tokens"]
+        self.client.post("/match", json={"tokens": tokens})
+        app_module.flush_trace_output()
+
+        lines = self.replay_path.read_text(encoding="utf-8").splitlines()
+        assert json.loads(lines[-1])["text"] == TEXT
+
+    def test_fast_requests_not_logged(self, monkeypatch):
+        """Test that requests under the threshold are neither logged nor kept"""
+        monkeypatch.setattr(app_module, "slow_request_seconds", 60.0)
+        self.client.post("/parse", json={"text": TEXT})
+        app_module.flush_trace_output()
+
+        assert not self.messages
+        assert not self.replay_path.exists()
+
+
+class TestRequestTraceExport:
+    """Test exporting request traces as JSON lines"""
+
+    def test_exports_request_trace(self, monkeypatch, tmp_path):
+        """Test that each request becomes one line with its stage spans"""
+        path = tmp_path / "trace.jsonl"
+        monkeypatch.setattr(app_module, "trace_exporter", JsonLinesExporter(path))
+        client = TestClient(app_module.app)
+        client.post("/parse-and-match", json={"text": TEXT})
+        app_module.flush_trace_output()
+
+        (line,) = path.read_text(encoding="utf-8").splitlines()
+        record = json.loads(line)
+        assert record["path"] == "/parse-and-match"
+        names = [span["name"] for span in record["spans"]]
+        assert names[0] == "request"
+        assert record["spans"][0]["status"] == 200
+        assert "match" in names and "rule" in names
+        assert names[-1] == "serialize"
+        assert record["spans"][-1]["format"] == "json"
+        # Pattern spans are only collected when profiling slow inputs
+        assert "pattern" not in names
+
+    def test_disabled_by_default(self, tmp_path):
+        """Test that nothing is traced without an exporter or threshold"""
+        assert app_module.trace_exporter is None
+        assert app_module.slow_request_seconds is None
+        response = TestClient(app_module.app).post("/parse", json={"text": TEXT})
+        assert response.status_code == 200
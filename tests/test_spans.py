@@ -0,0 +1,81 @@
+"""Tests for lightweight span match results"""
+
+from pathlib import Path
+
+import pytest
+
+from kotogram import (
+    GrammarRule,
+    GrammarRulePattern,
+    KotogramAnalyzer,
+    MatchSpan,
+    MatchSpans,
+    RuleRegistry,
+    TokenPattern,
+)
+
+
+class TestMatchSpans:
+    """Test span results against full match results"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """Set up a registry whose rule has overlapping patterns"""
+        self.analyzer = KotogramAnalyzer()
+        self.registry = RuleRegistry()
+        self.registry.add_rule(
+            GrammarRule(
+                name="猫が",
+                category="N3",
+                index=1,
+                patterns=[
+                    GrammarRulePattern(
+                        patterns=[TokenPattern(value="猫"), TokenPattern(value="が")]
+                    ),
+                    GrammarRulePattern(patterns=[TokenPattern(value="猫")]),
+                    GrammarRulePattern(
+                        patterns=[TokenPattern(value="猫"), TokenPattern(value="が")]
+                    ),
+                ],
+            )
+        )
+        self.tokens = self.analyzer.parse_text("猫が好き。猫と犬。")
+
+    def test_rule_spans(self):
+        """Test that spans name the first pattern producing each match"""
+        spans = self.registry.rules[0].find_all_spans(self.tokens)
+
+        assert spans == [
+            MatchSpan(rule_id="n3_001", pattern_index=0, start=0, end=2),
+            MatchSpan(rule_id="n3_001", pattern_index=1, start=0, end=1),
+            MatchSpan(rule_id="n3_001", pattern_index=1, start=4, end=5),
+        ]
+
+    def test_registry_spans_share_tokens(self):
+        """Test that registry spans index into the matched token list"""
+        spans = self.registry.find_all_spans(self.tokens)
+
+        assert isinstance(spans, MatchSpans)
+        assert spans.tokens is self.tokens
+        assert len(spans) == 3
+        assert [spans.matched_tokens(span) for span in spans] == [
+            match.matched_tokens
+            for result in self.registry.find_all_matches(self.tokens)
+            for match in result.pattern_matches
+        ]
+
+    def test_rules_examples(self):
+        """Test that spans agree with full match results for every rule"""
+        if not Path("rules").is_dir():
+            pytest.skip("No rules directory")
+        registry = RuleRegistry()
+        registry.load_rules_from_directory("rules")
+
+        for rule in registry.rules:
+            for example in rule.examples:
+                tokens = self.analyzer.parse_text(example)
+                assert [
+                    (span.start, span.end) for span in rule.find_all_spans(tokens)
+                ] == [
+                    (m.start_pos, m.end_pos) for m in rule.match(tokens).pattern_matches
+                ]
@@ -0,0 +1,117 @@
+"""Tests for category- and rule-scoped matching"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import app
+from kotogram import GrammarRule, KotogramAnalyzer, RuleRegistry
+from tests.helpers import literal_rule
+
+
+class TestRuleSubsets:
+    """Test RuleRegistry.subset"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """Set up a registry with rules in two categories"""
+        self.analyzer = KotogramAnalyzer()
+        self.registry = RuleRegistry()
+        self.registry.add_rule(literal_rule("猫", "N3", 1))
+        self.registry.add_rule(literal_rule("が", "N3", 2))
+        self.registry.add_rule(literal_rule("好き", "N2", 1))
+        self.tokens = self.analyzer.parse_text("猫が好き")
+
+    def test_rule_id(self):
+        """Test that rule IDs follow the rule file naming"""
+        assert self.registry.get_rule_ids() == ["n3_001", "n3_002", "n2_001"]
+        assert GrammarRule(name="plain", patterns=[]).rule_id == "plain"
+
+    def test_no_selection_returns_registry(self):
+        """Test that an empty selection matches against all rules"""
+        assert self.registry.subset() is self.registry
+
+    def test_subset_by_category(self):
+        """Test that categories are matched case-insensitively"""
+        subset = self.registry.subset(categories=["n3"])
+        matches = subset.find_all_matches(self.tokens)
+
+        assert [m.rule_name for m in matches] == ["猫_rule", "が_rule"]
+
+    def test_subset_by_rule_id(self):
+        """Test selecting individual rules"""
+        subset = self.registry.subset(rule_ids=["n2_001"])
+
+        assert [r.name for r in subset.rules] == ["好き_rule"]
+
+    def test_subset_by_category_and_rule_id(self):
+        """Test that both selections must hold"""
+        subset = self.registry.subset(categories=["N2"], rule_ids=["n3_001"])
+
+        assert subset.rules == ()
+
+    def test_subset_is_cached(self):
+        """Test that equal selections reuse one sub-registry"""
+        first = self.registry.subset(categories=["N3"], rule_ids=["n3_002", "n3_001"])
+        second = self.registry.subset(categories=["n3"], rule_ids=["n3_001", "n3_002"])
+
+        assert first is second
+        assert first.interner is self.registry.interner
+
+    def test_add_rule_invalidates_cache(self):
+        """Test that new rules appear in subsets built afterwards"""
+        before = self.registry.subset(categories=["N2"])
+        self.registry.add_rule(literal_rule("犬", "N2", 2))
+        after = self.registry.subset(categories=["N2"])
+
+        assert len(before.rules) == 1
+        assert len(after.rules) == 2
+
+    def test_unknown_rule_id(self):
+        """Test that unknown rule IDs are rejected"""
+        with pytest.raises(ValueError, match="n5_999"):
+            self.registry.subset(rule_ids=["n5_999"])
+
+
+class TestRuleSelectionAPI:
+    """Test rule selection on the matching endpoints"""
+
+    text = "赤ちゃんが寝ている間に、洗濯をしました。"
+
+    def setup_method(self):
+        self.client = TestClient(app)
+
+    def test_parse_and_match_by_category(self):
+        """Test that only rules from the selected categories are returned"""
+        response = self.client.post(
+            "/parse-and-match", json={"text": self.text, "categories": ["N3"]}
+        )
+
+        assert response.status_code == 200
+        assert all(
+            match["rule"]["category"] == "N3" for match in response.json()["matches"]
+        )
+
+    def test_match_by_rule_id(self):
+        """Test that only the selected rules are returned"""
+        all_matches = self.client.post(
+            "/parse-and-match", json={"text": self.text}
+        ).json()["matches"]
+        if not all_matches:
+            pytest.skip("No grammar rules loaded")
+        rule = all_matches[0]["rule"]
+        rule_id = f"{rule['category'].lower()}_{rule['index']:03d}"
+
+        response = self.client.post(
+            "/parse-and-match", json={"text": self.text, "rule_ids": [rule_id]}
+        )
+
+        assert response.status_code == 200
+        assert [m["rule"]["name"] for m in response.json()["matches"]] == [rule["name"]]
+
+    def test_unknown_rule_id(self):
+        """Test that unknown rule IDs are a client error"""
+        response = self.client.post(
+            "/parse-and-match", json={"text": self.text, "rule_ids": ["n5_999"]}
+        )
+
+        assert response.status_code == 400
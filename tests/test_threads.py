@@ -0,0 +1,98 @@
+"""Tests for sharing an analyzer and a frozen registry between threads"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app as app_module
+from kotogram import JanomeBackend, KotogramAnalyzer, RuleRegistry
+from tests.helpers import literal_rule
+
+
+class TestThreadSafety:
+    """Test concurrent use of one analyzer and one registry"""
+
+    sentences = [
+        "赤ちゃんが寝ている間に、洗濯をしました。",
+        "猫が好き。",
+        "本を読みます。",
+        "猫と犬。",
+    ] * 10
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """Set up a shared analyzer and frozen registry"""
+        self.analyzer = KotogramAnalyzer()
+        self.registry = RuleRegistry()
+        self.registry.add_rule(literal_rule("猫", "N3", 1))
+        self.registry.add_rule(literal_rule("が", "N3", 2))
+        self.registry.add_rule(literal_rule("本", "N4", 1))
+        self.registry.freeze()
+
+    def test_tokenizer_per_thread(self):
+        """Test that each thread gets its own Janome tokenizer"""
+        backend = JanomeBackend()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            other = executor.submit(lambda: backend.tokenizer).result()
+
+        assert other is not backend.tokenizer
+        assert backend.tokenizer is backend.tokenizer
+
+    def test_concurrent_parse_and_match(self):
+        """Test that threaded results equal serial results"""
+
+        def parse_and_match(text: str) -> list[str]:
+            tokens = self.analyzer.parse_text(text)
+            return [m.rule.name for m in self.registry.find_all_matches(tokens)]
+
+        expected = [parse_and_match(text) for text in self.sentences]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            assert list(executor.map(parse_and_match, self.sentences)) == expected
+
+    def test_concurrent_subsets(self):
+        """Test that threads selecting the same subset share one view"""
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            subsets = list(
+                executor.map(lambda _: self.registry.subset(["n3"]), range(20))
+            )
+
+        assert all(subset is subsets[0] for subset in subsets)
+        assert [rule.name for rule in subsets[0].rules] == ["猫_rule", "が_rule"]
+
+    def test_frozen_registry(self):
+        """Test that a frozen registry and its subsets reject new rules"""
+        assert self.registry.frozen
+        assert isinstance(self.registry.rules, tuple)
+        with pytest.raises(AttributeError):
+            self.registry.rules = []  # type: ignore[misc]
+        with pytest.raises(RuntimeError, match="frozen"):
+            self.registry.add_rule(literal_rule("犬", "N3", 3))
+        with pytest.raises(RuntimeError, match="frozen"):
+            self.registry.subset(["N4"]).add_rule(literal_rule("犬", "N4", 2))
+
+
+class TestServerThreads:
+    """Test that endpoints tokenize off the event loop"""
+
+    @pytest.mark.parametrize("path", ["/parse", "/query", "/parse-and-match"])
+    def test_parse_off_event_loop(self, monkeypatch, path):
+        """Test that tokenization, and so cache access, runs in a worker"""
+        on_event_loop = []
+        parse_text = app_module.analyzer.parse_text
+
+        def record_thread(text):
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                on_event_loop.append(False)
+            else:
+                on_event_loop.append(True)
+            return parse_text(text)
+
+        monkeypatch.setattr(app_module.analyzer, "parse_text", record_thread)
+        response = TestClient(app_module.app).post(path, json={"text": "猫が好き。"})
+
+        assert response.status_code == 200
+        assert on_event_loop == [False]
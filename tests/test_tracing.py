@@ -0,0 +1,153 @@
+"""Tests for pipeline tracing"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+
+import pytest
+
+from kotogram import (
+    GrammarRule,
+    GrammarRulePattern,
+    InMemoryTracer,
+    JsonLinesExporter,
+    KotogramAnalyzer,
+    NullTracer,
+    RuleRegistry,
+    TokenCache,
+    TokenPattern,
+    get_tracer,
+    use_tracer,
+)
+
+
+class TestTracing:
+    """Test spans emitted by parsing and matching"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """Set up analyzer and a registry of two rules"""
+        self.analyzer = KotogramAnalyzer()
+        self.registry = RuleRegistry()
+        for index, value in enumerate(["猫", "犬"], 1):
+            self.registry.add_rule(
+                GrammarRule(
+                    name=f"{value}_rule",
+                    category="N3",
+                    index=index,
+                    patterns=[GrammarRulePattern(patterns=[TokenPattern(value=value)])],
+                )
+            )
+
+    def test_null_tracer_by_default(self):
+        """Test that untraced code sees the no-op tracer"""
+        tracer = get_tracer()
+
+        assert type(tracer) is NullTracer
+        with tracer.span("stage", size=1) as attributes:
+            attributes["ignored"] = True
+        assert "ignored" not in attributes
+
+    def test_parse_stages(self):
+        """Test that parse_text reports tokenize and convert spans"""
+        tracer = InMemoryTracer()
+        with use_tracer(tracer):
+            tokens = self.analyzer.parse_text("猫が好き。")
+
+        assert [span.name for span in tracer.spans] == ["tokenize", "convert"]
+        assert tracer.find("tokenize")[0].attributes == {"backend": "janome"}
+        assert tracer.find("convert")[0].attributes == {"tokens": len(tokens)}
+        assert all(span.duration >= 0 for span in tracer.spans)
+        assert get_tracer() is not tracer
+
+    def test_cache_stages(self, tmp_path):
+        """Test that cache lookups report whether they hit"""
+        analyzer = KotogramAnalyzer(cache=TokenCache(tmp_path / "tokens.db"))
+        tracer = InMemoryTracer()
+        with use_tracer(tracer):
+            analyzer.parse_text("猫が好き。")
+            analyzer.parse_text("猫が好き。")
+        analyzer.cache.close()
+
+        assert [span.name for span in tracer.spans] == [
+            "cache_lookup",
+            "tokenize",
+            "convert",
+            "cache_store",
+            "cache_lookup",
+        ]
+        assert [span.attributes["hit"] for span in tracer.find("cache_lookup")] == [
+            False,
+            True,
+        ]
+
+    def test_rule_spans(self):
+        """Test that rule spans are children of the match span when enabled"""
+        tokens = self.analyzer.parse_text("猫と猫。")
+        tracer = InMemoryTracer(rule_spans=True)
+        with use_tracer(tracer), tracer.span("request"):
+            self.registry.find_all_matches(tokens)
+
+        (request,) = tracer.find("request")
+        (match,) = tracer.children(request)
+        assert match.name == "match"
+        assert match.attributes == {"rules": 2, "tokens": 4, "matched_rules": 1}
+        assert [(span.name, span.attributes) for span in tracer.children(match)] == [
+            ("rule", {"rule_id": "n3_001", "matches": 2}),
+            ("rule", {"rule_id": "n3_002", "matches": 0}),
+        ]
+
+    def test_pattern_spans(self):
+        """Test that pattern spans are children of their rule span"""
+        tokens = self.analyzer.parse_text("猫と猫。")
+        tracer = InMemoryTracer(pattern_spans=True)
+        with use_tracer(tracer):
+            self.registry.find_all_matches(tokens)
+
+        rule = tracer.find("rule")[0]
+        assert [span.attributes for span in tracer.children(rule)] == [
+            {"rule_id": "n3_001", "index": 0}
+        ]
+        assert len(tracer.find("pattern")) == 2
+        assert tracer.slowest("pattern", 1)[0].duration == max(
+            span.duration for span in tracer.find("pattern")
+        )
+
+    def test_rule_spans_disabled(self):
+        """Test that only the match span is emitted by default"""
+        tokens = self.analyzer.parse_text("猫と猫。")
+        tracer = InMemoryTracer()
+        with use_tracer(tracer):
+            self.registry.find_all_spans(tokens)
+
+        assert [span.name for span in tracer.spans] == ["match"]
+
+    def test_tracer_follows_context(self):
+        """Test that a thread running a copied context uses the same tracer"""
+        tracer = InMemoryTracer()
+        with use_tracer(tracer), ThreadPoolExecutor(max_workers=1) as executor:
+            context = copy_context()
+            executor.submit(context.run, self.analyzer.parse_text, "猫。").result()
+            executor.submit(self.analyzer.parse_text, "犬。").result()
+
+        assert len(tracer.find("tokenize")) == 1
+
+    def test_json_lines_export(self, tmp_path):
+        """Test that each export appends one JSON line"""
+        exporter = JsonLinesExporter(tmp_path / "trace.jsonl")
+        for text in ["猫。", "犬。"]:
+            tracer = InMemoryTracer()
+            with use_tracer(tracer), tracer.span("request"):
+                self.analyzer.parse_text(text)
+            exporter.export(tracer, text=text)
+
+        lines = (tmp_path / "trace.jsonl").read_text(encoding="utf-8").splitlines()
+        records = [json.loads(line) for line in lines]
+        assert [record["text"] for record in records] == ["猫。", "犬。"]
+        assert [span["name"] for span in records[0]["spans"]] == [
+            "request",
+            "tokenize",
+            "convert",
+        ]
+        assert [span["parent"] for span in records[0]["spans"]] == [None, 0, 0]
+        assert records[0]["spans"][2]["tokens"] == 2